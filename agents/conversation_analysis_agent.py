@@ -14,7 +14,7 @@ import google.generativeai as genai
 from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
 from langchain_core.tools import Tool
 from langchain.agents import create_react_agent, AgentExecutor
-from langchain import hub
+from agents.prompts import get_react_prompt
 from tools.tools import process_file_for_gemini, extract_text_from_word
 
 
@@ -262,7 +262,7 @@ def analyze_with_agent_for_word(file_path: str, user_identity: dict = None) -> d
         )
     ]
 
-    react_prompt = hub.pull("hwchase17/react")
+    react_prompt = get_react_prompt()
     agent = create_react_agent(llm=llm, prompt=react_prompt, tools=tools_for_agent)
     agent_executor = AgentExecutor(agent=agent, tools=tools_for_agent, verbose=True)
 
@@ -1,5 +1,10 @@
+import asyncio
 import os
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -18,31 +23,70 @@ from langchain.agents import (
     create_react_agent,
     AgentExecutor,
 )
-from langchain import hub
-from tools.tools import get_profile_url_tavily
+from agents.prompts import get_react_prompt
+from tools.lookup_cache import HIT, cache_lookup, cache_lookup_not_found, get_cached_lookup
+from tools.profile_matching import confident_match
+from tools.tools import (
+    aget_profile_url_tavily,
+    asearch_linkedin_candidates,
+    get_profile_url_tavily,
+    normalize_search_query,
+    search_linkedin_candidates,
+)
+from utils.singleflight import AsyncSingleFlight, SingleFlight
 
+# Concurrent lookups of the same (normalized) query share one agent run;
+# lookup_flight.stats() reports how many runs that saved
+lookup_flight = SingleFlight()
+async_lookup_flight = AsyncSingleFlight()
 
-def lookup(query: str) -> str:
-    """
-    Looks up a LinkedIn profile by search query containing name and/or other details.
-    
-    Args:
-        query (str): Search query containing person's name, job title, company, etc.
-                    Examples: "Eric Burton Martin Cognizant", "Matt software engineer Nickel5"
-    """
-    # Debug: Check if API key is loaded (remove this after testing)
-    api_key = os.environ.get("OPENAI_API_KEY")
-    print(f"API Key loaded: {'Yes' if api_key else 'No'}")
-    print(f"First 10 chars: {api_key[:10] if api_key else 'None'}")
-    
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-        openai_api_key=api_key,
-    )
-    
-    # Updated template to handle search queries properly and specify clean output format
-    template = """ 
+# Fast path: run one search directly and return its best candidate when it clearly
+# matches the query; the agent only runs for ambiguous results. LOOKUP_FAST_PATH=0
+# always uses the agent.
+LOOKUP_FAST_PATH = os.getenv("LOOKUP_FAST_PATH", "1").lower() not in ("0", "false", "off")
+
+
+class LookupPathStats:
+    """How many lookups each path (cache / fast path / agent) answered, and how long they took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = {}
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            entry = self._paths.setdefault(path, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            entry['count'] += 1
+            entry['total_seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(entry['count'] for entry in self._paths.values())
+            return {
+                'lookups': total,
+                'paths': {
+                    path: {
+                        'count': entry['count'],
+                        'hit_rate': entry['count'] / total,
+                        'mean_ms': entry['total_seconds'] / entry['count'] * 1000,
+                        'max_ms': entry['max_seconds'] * 1000,
+                    }
+                    for path, entry in self._paths.items()
+                },
+            }
+
+
+# lookup_stats.stats() reports the per-path hit rates and latency
+lookup_stats = LookupPathStats()
+
+# lookup_many defaults: concurrent lookups (each holds an LLM and a search call open)
+# and how long one lookup may run before the batch gives up on it
+LOOKUP_MAX_WORKERS = int(os.getenv("LOOKUP_MAX_WORKERS", 4))
+LOOKUP_TIMEOUT = float(os.getenv("LOOKUP_TIMEOUT", 120))
+
+# Updated template to handle search queries properly and specify clean output format
+LOOKUP_TEMPLATE = """ 
     Given the search query: "{query}"
     
     This search query contains information about a person that may include:
@@ -71,13 +115,10 @@ def lookup(query: str) -> str:
     - Just return: https://www.linkedin.com/in/username
     """
 
-    prompt_template = PromptTemplate(template=template, input_variables=["query"])
+LOOKUP_PROMPT = PromptTemplate(template=LOOKUP_TEMPLATE, input_variables=["query"])
 
-    tools_for_agent = [
-        Tool(
-            name="Search Google for LinkedIn Profile URL",
-            func=get_profile_url_tavily,
-            description="""
+SEARCH_TOOL_NAME = "Search Google for LinkedIn Profile URL"
+SEARCH_TOOL_DESCRIPTION = """
             Searches for LinkedIn profile URLs using the provided search query.
             
             IMPORTANT: Use the search query EXACTLY as provided. Do not modify it.
@@ -87,19 +128,38 @@ def lookup(query: str) -> str:
             - Input: "John Smith Google LinkedIn" → Search for: "John Smith Google LinkedIn"
             
             The search query may contain first name + job title + company information + linkedin in no particular order.
-            """,
+            """
+
+# The executor (with its OpenAI client and connection pool) is built on first use
+# and shared by every lookup and thread: ChatOpenAI's client is thread-safe and
+# AgentExecutor keeps no per-run state on the instance
+_lookup_executor = None
+_lookup_executor_lock = threading.Lock()
+
+
+def _build_lookup_executor() -> AgentExecutor:
+    llm = ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        openai_api_key=os.environ.get("OPENAI_API_KEY"),
+    )
+
+    tools_for_agent = [
+        Tool(
+            name=SEARCH_TOOL_NAME,
+            func=get_profile_url_tavily,
+            coroutine=aget_profile_url_tavily,
+            description=SEARCH_TOOL_DESCRIPTION,
         )
     ]
 
-    react_prompt = hub.pull("hwchase17/react")
-
     agent = create_react_agent(
         llm=llm,
-        prompt=react_prompt,
+        prompt=get_react_prompt(),
         tools=tools_for_agent,
     )
 
-    agent_executor = AgentExecutor(
+    return AgentExecutor(
         agent=agent, 
         tools=tools_for_agent, 
         verbose=True,
@@ -108,83 +168,319 @@ def lookup(query: str) -> str:
         early_stopping_method="generate"  # Stop early when goal is achieved
     )
 
+
+def get_lookup_executor() -> AgentExecutor:
+    """The process-wide lookup agent executor, built the first time it is needed."""
+    global _lookup_executor
+    if _lookup_executor is None:
+        with _lookup_executor_lock:
+            if _lookup_executor is None:
+                _lookup_executor = _build_lookup_executor()
+    return _lookup_executor
+
+
+def reset_lookup_executor():
+    """Drop the shared executor so the next lookup rebuilds it (e.g. after changing API keys)."""
+    global _lookup_executor
+    with _lookup_executor_lock:
+        _lookup_executor = None
+
+
+def lookup(query: str) -> str:
+    """
+    Looks up a LinkedIn profile by search query containing name and/or other details.
+    
+    Concurrent calls with the same query (ignoring case and spacing) wait for a
+    single agent run and share its result. Resolutions, including "not found",
+    are cached on disk (see tools/lookup_cache.py).
+    
+    Args:
+        query (str): Search query containing person's name, job title, company, etc.
+                    Examples: "Eric Burton Martin Cognizant", "Matt software engineer Nickel5"
+    """
+    return lookup_flight.do(normalize_search_query(query), _lookup, query)
+
+
+def lookup_many(queries: List[str], max_workers: int = LOOKUP_MAX_WORKERS,
+                timeout: Optional[float] = LOOKUP_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Look up many queries concurrently.
+    
+    Returns one {'query', 'url', 'error'} dict per input query, in input order; 'url'
+    is what lookup() returned. A lookup that raises, or runs longer than timeout
+    seconds (counted from when it starts, not while it waits for a worker), sets
+    'error' and leaves 'url' None without failing the rest of the batch. A timed-out
+    lookup can't be interrupted; it finishes in the background and is ignored.
+    """
+    results = [{'query': query, 'url': None, 'error': None} for query in queries]
+    if not queries:
+        return results
+    
+    started = {}
+    
+    def run(index):
+        started[index] = time.monotonic()
+        return lookup(queries[index])
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries))),
+                                  thread_name_prefix="linkedin-lookup")
+    futures = {executor.submit(run, index): index for index in range(len(queries))}
+    pending = set(futures)
+    try:
+        while pending:
+            wait_seconds = None
+            if timeout is not None:
+                now = time.monotonic()
+                for future in [future for future in pending if futures[future] in started]:
+                    remaining = started[futures[future]] + timeout - now
+                    if remaining <= 0 and not future.done():
+                        results[futures[future]]['error'] = f"Lookup timed out after {timeout:g}s"
+                        pending.discard(future)
+                    elif wait_seconds is None or remaining < wait_seconds:
+                        wait_seconds = max(0.0, remaining)
+                if not pending:
+                    break
+                if wait_seconds is None:
+                    # Nothing has started yet; check again shortly
+                    wait_seconds = 0.05
+            
+            done, _ = wait(pending, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                result = results[futures[future]]
+                try:
+                    result['url'] = future.result()
+                except Exception as e:
+                    result['error'] = str(e)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _not_found_message(query: str) -> str:
+    return f"Could not find a LinkedIn profile for the query: {query}"
+
+
+def _from_cache(query: str, start: float) -> Optional[str]:
+    """The cached answer for query (a URL or the not-found message), or None on a miss."""
+    kind, cached_url = get_cached_lookup(query)
+    if kind is None:
+        return None
+    lookup_stats.record('cache', time.perf_counter() - start)
+    print(f"💾 Cached lookup for '{query}': {cached_url or 'no profile found'}")
+    return cached_url if kind == HIT else _not_found_message(query)
+
+
+def _finish(query: str, path: str, linkedin_url: Optional[str], completed: bool, start: float) -> str:
+    """Cache and record the outcome of a lookup and return what lookup() returns for it."""
+    # Only remember answers the fast path or agent settled on; after a failure the
+    # URL (if any) is the direct search's unscored first hit, not worth keeping
+    if completed and linkedin_url:
+        cache_lookup(query, linkedin_url)
+    elif completed:
+        cache_lookup_not_found(query)
+    lookup_stats.record(path, time.perf_counter() - start)
+    return linkedin_url or _not_found_message(query)
+
+
+def _lookup(query: str) -> str:
+    start = time.perf_counter()
+    cached = _from_cache(query, start)
+    if cached is not None:
+        return cached
+    
+    if LOOKUP_FAST_PATH:
+        linkedin_url = _fast_path_lookup(query)
+        if linkedin_url:
+            return _finish(query, 'fast_path', linkedin_url, True, start)
+    
+    # Agent latency includes the fast path attempt it follows
+    linkedin_url, completed = _agent_lookup(query)
+    return _finish(query, 'agent', linkedin_url, completed, start)
+
+
+def _fast_path_lookup(query: str) -> Optional[str]:
+    """The best search candidate if it clearly matches the query, else None."""
+    try:
+        candidates = search_linkedin_candidates(query)
+    except Exception as e:
+        print(f"⚠️ Fast path search failed ({e}), falling back to the agent")
+        return None
+    return _fast_path_match(query, candidates)
+
+
+def _fast_path_match(query: str, candidates: List[Dict[str, str]]) -> Optional[str]:
+    match = confident_match(query, candidates)
+    if match is None:
+        print(f"🤔 Fast path: no clear match among {len(candidates)} candidates, falling back to the agent")
+        return None
+    print(f"⚡ Fast path match (score {match['score']:.2f}): {match['url']}")
+    return match['url']
+
+
+def _agent_lookup(query: str) -> Tuple[Optional[str], bool]:
+    """The URL the agent resolved (None if none), and whether the agent ran to completion."""
+    agent_executor = get_lookup_executor()
+
     try:
         result = agent_executor.invoke(
-            input={"input": prompt_template.format_prompt(query=query)}
+            input={"input": LOOKUP_PROMPT.format_prompt(query=query)}
         )
-        
-        # Extract and clean LinkedIn URL from the result
-        output = result["output"].strip()
-        
-        # Debug: Show raw agent output
-        print(f"🔗 Raw agent output: '{output}'")
-        
-        # Handle iteration limit case - check if URL was found in intermediate steps
-        if "Agent stopped due to iteration limit" in output or "time limit" in output:
-            print("⚠️ Agent hit iteration limit, checking intermediate steps...")
-            
-            # Try to extract URL from the agent's intermediate steps
-            if hasattr(result, 'intermediate_steps'):
-                for step in result['intermediate_steps']:
-                    if len(step) > 1 and isinstance(step[1], str):
-                        step_output = step[1]
-                        if 'linkedin.com/in/' in step_output and 'Found LinkedIn URL:' in step_output:
-                            # Extract URL from step output
-                            import re
-                            urls = re.findall(r'https://www\.linkedin\.com/in/[^\s\)\]<>"\']+', step_output)
-                            if urls:
-                                found_url = urls[0].rstrip('.,;)')
-                                print(f"🎯 Recovered URL from intermediate steps: {found_url}")
-                                output = found_url
-                                break
-        
-        # Clean up malformed URLs and markdown formatting
-        linkedin_url = output
-        
-        # Fix markdown-style malformed URLs
-        if '](https://' in linkedin_url:
-            print("🧹 Detected markdown formatting, cleaning...")
-            if linkedin_url.startswith('[') and '](https://www.linkedin.com/in/' in linkedin_url:
-                url_part = linkedin_url.split('](')[1]
-                if url_part.endswith(')'):
-                    url_part = url_part[:-1]
-                linkedin_url = url_part
-            else:
-                if '](https://www.linkedin.com/in/' in linkedin_url:
-                    linkedin_url = linkedin_url.split('](')[1]
-                    if linkedin_url.endswith(')'):
-                        linkedin_url = linkedin_url[:-1]
-        
-        # Remove any leading/trailing brackets or markdown artifacts
-        linkedin_url = linkedin_url.strip('[](){}"\'')
-        
-        # If the above cleaning didn't work, try regex extraction as fallback
-        if "linkedin.com/in/" in linkedin_url:
-            import re
-            urls = re.findall(r'https://www\.linkedin\.com/in/[^\s\)\]<>"\']+', linkedin_url)
-            if urls:
-                linkedin_url = urls[0]
-                # Clean trailing punctuation
-                linkedin_url = linkedin_url.rstrip('.,;)')
-        
-        # Validate the final URL
-        if linkedin_url.startswith("http") and "linkedin.com/in/" in linkedin_url:
-            print(f"🔗 Cleaned LinkedIn URL: {linkedin_url}")
-            return linkedin_url
+        return _extract_linkedin_url(result), True
     
     except Exception as e:
         print(f"❌ Agent execution failed: {e}")
         # Try direct search as fallback
         try:
             print("🔄 Attempting direct search fallback...")
-            direct_result = get_profile_url_tavily(query)
-            if direct_result and "linkedin.com/in/" in direct_result:
-                print(f"🎯 Direct search found: {direct_result}")
-                return direct_result
+            return _direct_search_result(query, get_profile_url_tavily(query)), False
+        except Exception as e2:
+            print(f"❌ Direct search also failed: {e2}")
+        return None, False
+
+
+def _direct_search_result(query: str, direct_result: str) -> Optional[str]:
+    if direct_result and "linkedin.com/in/" in direct_result:
+        print(f"🎯 Direct search found: {direct_result}")
+        return direct_result
+    return None
+
+
+def _extract_linkedin_url(result: Dict[str, Any]) -> Optional[str]:
+    """The LinkedIn URL in an agent run's output, cleaned of markdown and punctuation, if any."""
+    # Extract and clean LinkedIn URL from the result
+    output = result["output"].strip()
+
+    # Debug: Show raw agent output
+    print(f"🔗 Raw agent output: '{output}'")
+
+    # Handle iteration limit case - check if URL was found in intermediate steps
+    if "Agent stopped due to iteration limit" in output or "time limit" in output:
+        print("⚠️ Agent hit iteration limit, checking intermediate steps...")
+
+        # Try to extract URL from the agent's intermediate steps
+        if hasattr(result, 'intermediate_steps'):
+            for step in result['intermediate_steps']:
+                if len(step) > 1 and isinstance(step[1], str):
+                    step_output = step[1]
+                    if 'linkedin.com/in/' in step_output and 'Found LinkedIn URL:' in step_output:
+                        # Extract URL from step output
+                        import re
+                        urls = re.findall(r'https://www\.linkedin\.com/in/[^\s\)\]<>"\']+', step_output)
+                        if urls:
+                            found_url = urls[0].rstrip('.,;)')
+                            print(f"🎯 Recovered URL from intermediate steps: {found_url}")
+                            output = found_url
+                            break
+
+    # Clean up malformed URLs and markdown formatting
+    linkedin_url = output
+
+    # Fix markdown-style malformed URLs
+    if '](https://' in linkedin_url:
+        print("🧹 Detected markdown formatting, cleaning...")
+        if linkedin_url.startswith('[') and '](https://www.linkedin.com/in/' in linkedin_url:
+            url_part = linkedin_url.split('](')[1]
+            if url_part.endswith(')'):
+                url_part = url_part[:-1]
+            linkedin_url = url_part
+        else:
+            if '](https://www.linkedin.com/in/' in linkedin_url:
+                linkedin_url = linkedin_url.split('](')[1]
+                if linkedin_url.endswith(')'):
+                    linkedin_url = linkedin_url[:-1]
+
+    # Remove any leading/trailing brackets or markdown artifacts
+    linkedin_url = linkedin_url.strip('[](){}"\'')
+
+    # If the above cleaning didn't work, try regex extraction as fallback
+    if "linkedin.com/in/" in linkedin_url:
+        import re
+        urls = re.findall(r'https://www\.linkedin\.com/in/[^\s\)\]<>"\']+', linkedin_url)
+        if urls:
+            linkedin_url = urls[0]
+            # Clean trailing punctuation
+            linkedin_url = linkedin_url.rstrip('.,;)')
+
+    # Validate the final URL
+    if linkedin_url.startswith("http") and "linkedin.com/in/" in linkedin_url:
+        print(f"🔗 Cleaned LinkedIn URL: {linkedin_url}")
+        return linkedin_url
+    return None
+
+
+async def alookup(query: str) -> str:
+    """
+    Async lookup(): the same cache, fast path and agent, but the search and the
+    agent (LLM and tool calls) run on the event loop, so one loop can drive many
+    concurrent lookups without a thread each.
+    
+    Concurrent calls for the same query on one event loop share a single run.
+    """
+    return await async_lookup_flight.do(normalize_search_query(query), _alookup, query)
+
+
+async def _alookup(query: str) -> str:
+    start = time.perf_counter()
+    # The caches are local SQLite reads/writes; quick enough to run on the loop
+    cached = _from_cache(query, start)
+    if cached is not None:
+        return cached
+    
+    if LOOKUP_FAST_PATH:
+        try:
+            candidates = await asearch_linkedin_candidates(query)
+        except Exception as e:
+            print(f"⚠️ Fast path search failed ({e}), falling back to the agent")
+            candidates = None
+        linkedin_url = _fast_path_match(query, candidates) if candidates is not None else None
+        if linkedin_url:
+            return _finish(query, 'fast_path', linkedin_url, True, start)
+    
+    linkedin_url, completed = await _aagent_lookup(query)
+    return _finish(query, 'agent', linkedin_url, completed, start)
+
+
+async def _aagent_lookup(query: str) -> Tuple[Optional[str], bool]:
+    """Async _agent_lookup."""
+    agent_executor = get_lookup_executor()
+    
+    try:
+        result = await agent_executor.ainvoke(
+            input={"input": LOOKUP_PROMPT.format_prompt(query=query)}
+        )
+        return _extract_linkedin_url(result), True
+    
+    except Exception as e:
+        print(f"❌ Agent execution failed: {e}")
+        try:
+            print("🔄 Attempting direct search fallback...")
+            return _direct_search_result(query, await aget_profile_url_tavily(query)), False
         except Exception as e2:
             print(f"❌ Direct search also failed: {e2}")
+        return None, False
+
+
+async def alookup_many(queries: List[str], max_concurrency: int = 64,
+                       timeout: Optional[float] = LOOKUP_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Async lookup_many(): same {'query', 'url', 'error'} results in input order, with
+    up to max_concurrency lookups in flight. Unlike threads, a timed-out lookup is
+    cancelled - its search and agent calls stop and nothing is cached - unless
+    another caller on the same loop is still waiting for the same query.
+    """
+    slots = asyncio.Semaphore(max(1, max_concurrency))
     
-    return f"Could not find a LinkedIn profile for the query: {query}"
+    async def run(query):
+        async with slots:
+            try:
+                return {'query': query, 'url': await asyncio.wait_for(alookup(query), timeout), 'error': None}
+            except asyncio.TimeoutError:
+                return {'query': query, 'url': None, 'error': f"Lookup timed out after {timeout:g}s"}
+            except Exception as e:
+                return {'query': query, 'url': None, 'error': str(e)}
+    
+    return list(await asyncio.gather(*(run(query) for query in queries)))
 
 if __name__ == "__main__":
     linkedin_url = lookup("Eric Burton Martin Cognizant")
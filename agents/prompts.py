@@ -0,0 +1,127 @@
+"""
+Prompts used by the agents, loaded once per process.
+
+The ReAct prompt the agents are built on (hwchase17/react on the LangChain hub)
+is bundled here, so building an agent needs no network round trip and works
+offline. Set PROMPT_SOURCE=hub to use the hub's current version instead; hub
+prompts are cached on disk per version, so they are only downloaded once:
+
+    get_prompt("hwchase17/react")            # latest, refreshed after PROMPT_HUB_CACHE_TTL
+    get_prompt("hwchase17/react:d15fe3c4")   # pinned commit, cached for good
+"""
+import json
+import os
+import re
+import threading
+import time
+import warnings
+from typing import Dict, Optional
+
+from langchain_core.load import dumpd, load
+from langchain_core.prompts import BasePromptTemplate, PromptTemplate
+
+REACT_PROMPT_NAME = "hwchase17/react"
+
+# Verbatim copy of hwchase17/react
+REACT_TEMPLATE = """Answer the following questions as best you can. You have access to the following tools:
+
+{tools}
+
+Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of [{tool_names}]
+Action Input: the input to the action
+Observation: the result of the action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+
+Begin!
+
+Question: {input}
+Thought:{agent_scratchpad}"""
+
+BUNDLED_PROMPTS = {
+    REACT_PROMPT_NAME: REACT_TEMPLATE,
+}
+
+# "bundled" (default) never touches the network; "hub" loads from the hub cache,
+# pulling on a miss and falling back to the bundled copy if the pull fails
+PROMPT_SOURCE = os.getenv("PROMPT_SOURCE", "bundled").lower()
+PROMPT_HUB_CACHE_DIR = os.getenv("PROMPT_HUB_CACHE_DIR", os.path.join(".cache", "prompts"))
+# Unpinned hub prompts are re-pulled after this long; pinned commits never change
+PROMPT_HUB_CACHE_TTL = float(os.getenv("PROMPT_HUB_CACHE_TTL", 7 * 24 * 60 * 60))
+
+_prompts: Dict[str, BasePromptTemplate] = {}
+_lock = threading.Lock()
+
+
+def _cache_path(name: str) -> str:
+    return os.path.join(PROMPT_HUB_CACHE_DIR, re.sub(r'[^\w.-]+', '__', name) + '.json')
+
+
+def _load_cached(name: str) -> Optional[BasePromptTemplate]:
+    path = _cache_path(name)
+    if not os.path.exists(path):
+        return None
+    pinned = ':' in name
+    if not pinned and time.time() - os.path.getmtime(path) > PROMPT_HUB_CACHE_TTL:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f, warnings.catch_warnings():
+            # load() flags itself as beta; the cache only holds prompts we serialized
+            warnings.simplefilter("ignore")
+            return load(json.load(f)['prompt'])
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable cached prompt {path}: {e}")
+        return None
+
+
+def _pull_from_hub(name: str) -> BasePromptTemplate:
+    from langchain import hub
+
+    prompt = hub.pull(name)
+    os.makedirs(PROMPT_HUB_CACHE_DIR, exist_ok=True)
+    path = _cache_path(name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'name': name, 'pulled_at': time.time(), 'prompt': dumpd(prompt)}, f)
+    os.replace(tmp_path, path)
+    return prompt
+
+
+def _load_prompt(name: str) -> BasePromptTemplate:
+    bundled = BUNDLED_PROMPTS.get(name.split(':')[0])
+    if PROMPT_SOURCE != "hub":
+        if bundled is None:
+            raise KeyError(f"No bundled prompt named {name!r}; set PROMPT_SOURCE=hub to pull it")
+        return PromptTemplate.from_template(bundled)
+
+    prompt = _load_cached(name)
+    if prompt is not None:
+        return prompt
+    try:
+        return _pull_from_hub(name)
+    except Exception as e:
+        if bundled is None:
+            raise
+        print(f"⚠️ Could not pull {name} from the hub ({e}); using the bundled copy")
+        return PromptTemplate.from_template(bundled)
+
+
+def get_prompt(name: str) -> BasePromptTemplate:
+    """A prompt by hub name, loaded the first time it is asked for and reused afterwards."""
+    prompt = _prompts.get(name)
+    if prompt is None:
+        with _lock:
+            prompt = _prompts.get(name)
+            if prompt is None:
+                prompt = _prompts[name] = _load_prompt(name)
+    return prompt
+
+
+def get_react_prompt() -> BasePromptTemplate:
+    """The ReAct agent prompt (hwchase17/react)."""
+    return get_prompt(REACT_PROMPT_NAME)
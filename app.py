@@ -16,12 +16,16 @@ def analyze():
         data = request.get_json()
         name = data.get('name')
         mock = data.get('mock', False)
+        refresh = data.get('refresh', False)
+        mock_profile = data.get('mock_profile')
         
         if not name:
             return jsonify({'error': 'Name is required'}), 400
         
         # Call your find_linkedin_profile_query function
-        summary, profile_picture_url, banner_url = find_linkedin_profile_query(name, mock=mock)
+        summary, profile_picture_url, banner_url = find_linkedin_profile_query(
+            name, mock=mock, force_refresh=refresh, mock_profile=mock_profile
+        )
         
         return jsonify({
             'summary': summary.to_dict(),
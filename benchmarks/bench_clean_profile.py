@@ -0,0 +1,129 @@
+"""
+Benchmark _recursively_remove_empty_values against the original recursive cleaner.
+
+Fixtures are the real Scrapin profiles saved in output/ plus synthetic profiles
+with long position histories, sprinkled with None/{}/[] values, and one deeply
+nested payload. Every variant's output is checked against the reference first.
+
+Run with:
+    python benchmarks/bench_clean_profile.py
+"""
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from third_parties.linkedin import _recursively_remove_empty_values
+
+ROUNDS = 50
+REPEATS = 5
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
+
+
+def reference_clean(item):
+    """The original recursive implementation, kept here as the semantic reference."""
+    if isinstance(item, dict):
+        cleaned_dict = {}
+        for key, value in item.items():
+            cleaned_value = reference_clean(value)
+            if cleaned_value is not None and cleaned_value != {} and cleaned_value != []:
+                cleaned_dict[key] = cleaned_value
+        return cleaned_dict
+    elif isinstance(item, list):
+        cleaned_list = []
+        for list_item in item:
+            cleaned_list_item = reference_clean(list_item)
+            if cleaned_list_item is not None and cleaned_list_item != {} and cleaned_list_item != []:
+                cleaned_list.append(cleaned_list_item)
+        return cleaned_list
+    return item
+
+
+def load_scrapin_fixtures() -> list[dict]:
+    fixtures = []
+    for filename in sorted(os.listdir(FIXTURE_DIR)):
+        if filename.endswith('.json'):
+            with open(os.path.join(FIXTURE_DIR, filename), 'r', encoding='utf-8') as f:
+                profile_data = json.load(f)['linkedin_profile']['profile_data']
+            if profile_data:
+                fixtures.append(profile_data)
+    return fixtures
+
+
+def synthetic_profile(positions: int) -> dict:
+    return {
+        'success': True,
+        'credits_left': 100,
+        'person': {
+            'firstName': 'Synthetic',
+            'lastName': 'Person',
+            'headline': None,
+            'skills': [],
+            'location': {'city': None, 'country': 'US', 'extra': {}},
+            'positions': {
+                'positionsCount': positions,
+                'positionHistory': [
+                    {
+                        'title': f'Role {i}',
+                        'companyName': f'Company {i}',
+                        'description': 'Did things. ' * 20 if i % 3 else None,
+                        'startEndDate': {'start': {'month': 1, 'year': 2000 + i % 20}, 'end': None},
+                        'companyLogo': None if i % 2 else f'https://example.com/logo/{i}.png',
+                        'tags': [None, {}, [], 'x'] if i % 5 == 0 else [],
+                    }
+                    for i in range(positions)
+                ],
+            },
+        },
+        'company': {},
+    }
+
+
+def deep_payload(depth: int) -> dict:
+    payload = {'leaf': 'value', 'empty': None}
+    for i in range(depth):
+        payload = {'level': i, 'nothing': [], 'list': [{}, None, payload]}
+    return payload
+
+
+def time_per_call(function, fixtures, copy_input: bool = False) -> float:
+    """Best of REPEATS runs, in µs per profile."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        inputs = [copy.deepcopy(fixtures) for _ in range(ROUNDS)] if copy_input else [fixtures] * ROUNDS
+        start = time.perf_counter()
+        for batch in inputs:
+            for fixture in batch:
+                function(fixture)
+        best = min(best, time.perf_counter() - start)
+    return best / (ROUNDS * len(fixtures)) * 1e6
+
+
+if __name__ == "__main__":
+    suites = {
+        'scrapin fixtures': load_scrapin_fixtures(),
+        'synthetic (200 positions)': [synthetic_profile(200) for _ in range(5)],
+        'deep (depth 40)': [deep_payload(40)],
+    }
+
+    print(f"📊 Profile cleaning benchmark (best of {REPEATS} x {ROUNDS} rounds, µs per profile)")
+    print(f"{'suite':<28}{'recursive':>12}{'iterative':>12}{'in place':>12}")
+    for name, fixtures in suites.items():
+        for fixture in fixtures:
+            expected = reference_clean(fixture)
+            assert _recursively_remove_empty_values(fixture) == expected, name
+            assert _recursively_remove_empty_values(copy.deepcopy(fixture), in_place=True) == expected, name
+
+        recursive = time_per_call(reference_clean, fixtures)
+        iterative = time_per_call(_recursively_remove_empty_values, fixtures)
+        # In-place mode mutates its input, so it gets fresh copies (copying is not timed)
+        in_place = time_per_call(lambda item: _recursively_remove_empty_values(item, in_place=True), fixtures, copy_input=True)
+        print(f"{name:<28}{recursive:>12.1f}{iterative:>12.1f}{in_place:>12.1f}")
+
+    try:
+        _recursively_remove_empty_values(deep_payload(500))
+    except ValueError as e:
+        print(f"🛡️ Depth guard: {e}")
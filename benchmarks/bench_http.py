@@ -0,0 +1,87 @@
+"""
+Benchmark per-request latency of cold requests.get calls vs the pooled session.
+
+Serves a saved Scrapin profile from a local HTTP/1.1 stub server, so the numbers
+show connection setup cost only (no DNS or TLS, which make the real saving larger).
+Set STUB_LATENCY_MS to add a fixed server-side delay.
+
+Run with:
+    python benchmarks/bench_http.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from third_parties.http_session import http_get
+
+REQUESTS = 300
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", 0))
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
+
+
+def load_payload() -> bytes:
+    for filename in sorted(os.listdir(FIXTURE_DIR)):
+        if filename.endswith('.json'):
+            with open(os.path.join(FIXTURE_DIR, filename), 'r', encoding='utf-8') as f:
+                return json.dumps(json.load(f)['linkedin_profile']['profile_data']).encode('utf-8')
+    return b'{"success": true}'
+
+
+def start_stub_server(payload: bytes) -> ThreadingHTTPServer:
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        # Headers and body go out in separate writes; with Nagle on, delayed ACKs add ~40ms
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if STUB_LATENCY_MS:
+                time.sleep(STUB_LATENCY_MS / 1000)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(fetch) -> list[float]:
+    timings = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        response = fetch()
+        response.json()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+if __name__ == "__main__":
+    server = start_stub_server(load_payload())
+    url = f"http://127.0.0.1:{server.server_address[1]}/enrichment/profile"
+
+    print(f"📊 HTTP benchmark: {REQUESTS} GETs against {url}")
+    print(f"{'client':<22}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    results = {}
+    for name, fetch in (
+        ("requests.get (cold)", lambda: requests.get(url, timeout=10)),
+        ("pooled session", lambda: http_get(url)),
+    ):
+        timings = measure(fetch)
+        results[name] = sum(timings) / len(timings)
+        print(f"{name:<22}{results[name]:>10.3f}{timings[len(timings) // 2]:>10.3f}{timings[int(len(timings) * 0.95)]:>10.3f}")
+
+    saved = results["requests.get (cold)"] - results["pooled session"]
+    print(f"💡 Pooling saves {saved:.3f} ms per request ({saved / results['requests.get (cold)']:.0%})")
+    server.shutdown()
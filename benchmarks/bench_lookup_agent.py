@@ -0,0 +1,115 @@
+"""
+Benchmark lookup() with the agent executor rebuilt per call (as it used to be) vs shared.
+
+ChatOpenAI is pointed at a local stub of the chat completions endpoint that
+answers straight away with a Final Answer, so the numbers are agent construction,
+client setup and connection reuse only - no model or search latency. Set
+STUB_LATENCY_MS to add a fixed server-side delay.
+
+Run with:
+    python benchmarks/bench_lookup_agent.py
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LOOKUPS = 50
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", 0))
+ANSWER = "Thought: I now know the final answer\nFinal Answer: https://www.linkedin.com/in/benchmark-user"
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if STUB_LATENCY_MS:
+            time.sleep(STUB_LATENCY_MS / 1000)
+        completion = {'id': 'chatcmpl-bench', 'created': int(time.time()), 'model': 'gpt-4o-mini'}
+        if request.get('stream'):
+            # The ReAct agent streams its completions
+            chunks = [
+                {**completion, 'object': 'chat.completion.chunk',
+                 'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': ANSWER}, 'finish_reason': None}]},
+                {**completion, 'object': 'chat.completion.chunk',
+                 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]},
+            ]
+            body = ''.join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+            return self._send(body.encode('utf-8'), "text/event-stream")
+        completion.update({
+            'object': 'chat.completion',
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ANSWER}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+        })
+        self._send(json.dumps(completion).encode('utf-8'), "application/json")
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def time_lookups(agent_module, rebuild: bool) -> list:
+    timings = []
+    for i in range(LOOKUPS):
+        if rebuild:
+            agent_module.reset_lookup_executor()
+        start = time.perf_counter()
+        # Unique queries so SingleFlight never joins calls; the agent's verbose output is discarded
+        with contextlib.redirect_stdout(io.StringIO()):
+            url = agent_module.lookup(f"benchmark person {i}")
+        timings.append(time.perf_counter() - start)
+        assert url.startswith("https://www.linkedin.com/in/"), url
+    return timings
+
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    print(f"{label:<28} mean {mean * 1000:7.2f} ms   p50 {timings[len(timings) // 2] * 1000:7.2f} ms   "
+          f"max {timings[-1] * 1000:7.2f} ms")
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    # Measure the agent path only; the fast path would make a real search
+    os.environ["LOOKUP_FAST_PATH"] = "0"
+    # Every lookup must reach the agent, and the fake URLs must stay out of the real lookup cache
+    os.environ["LOOKUP_CACHE_TTL"] = "0"
+
+    start = time.perf_counter()
+    from agents import linkedin_lookup_agent
+    print(f"Import agents.linkedin_lookup_agent: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    linkedin_lookup_agent.get_lookup_executor()
+    print(f"First executor build (cold):    {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"\n{LOOKUPS} lookups each, stub latency {STUB_LATENCY_MS:.0f} ms")
+    rebuilt = time_lookups(linkedin_lookup_agent, rebuild=True)
+    shared = time_lookups(linkedin_lookup_agent, rebuild=False)
+    report("rebuilt per lookup (before)", rebuilt)
+    report("shared executor (after)", shared)
+    saved = sum(rebuilt) - sum(shared)
+    print(f"\nSaved {saved * 1000:.0f} ms over {LOOKUPS} lookups ({saved / LOOKUPS * 1000:.2f} ms per lookup)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark saved-analysis storage formats: bytes on disk and save/load latency.
+
+Uses the real analyses in output/ as fixtures, saving each one ROUNDS times as a
+distinct person so nothing is overwritten.
+
+Run with:
+    python benchmarks/bench_storage.py
+"""
+import copy
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.analysis_index import INDEX_FILENAME
+from utils.output_manager import ConversationOutputManager
+from utils.storage_backends import BACKENDS
+
+ROUNDS = 25
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
+
+
+def load_fixtures() -> list[dict]:
+    fixtures = []
+    for filename in sorted(os.listdir(FIXTURE_DIR)):
+        if filename.endswith('.json'):
+            with open(os.path.join(FIXTURE_DIR, filename), 'r', encoding='utf-8') as f:
+                fixtures.append(json.load(f))
+    return fixtures
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            if filename != INDEX_FILENAME:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+    return total
+
+
+def run_benchmark(storage_format: str, dedup_blobs: bool, fixtures: list[dict]) -> dict:
+    temp_dir = tempfile.mkdtemp(prefix="bench_storage_")
+    try:
+        manager = ConversationOutputManager(output_dir=temp_dir, dedup_blobs=dedup_blobs, storage_format=storage_format)
+        filenames = []
+        save_time = 0.0
+
+        with redirect_stdout(io.StringIO()):
+            for round_number in range(ROUNDS):
+                for fixture in fixtures:
+                    profile_data = copy.deepcopy(fixture['linkedin_profile']['profile_data'])
+                    profile_data['person']['lastName'] = f"{profile_data['person']['lastName']}{round_number}"
+
+                    start = time.perf_counter()
+                    filenames.append(manager.save_conversation_analysis(
+                        search_query=fixture['metadata']['search_query'],
+                        linkedin_url=fixture['linkedin_profile']['url'],
+                        profile_data=profile_data,
+                        conversation_analysis=fixture['conversation']['analysis'],
+                        original_conversation=fixture['conversation']['original_text'],
+                        conversation_date=fixture['metadata']['conversation_date'],
+                        user_identity=fixture['metadata']['user_identity']
+                    ))
+                    save_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for filename in filenames:
+            manager.load_person_data(filename)
+        load_time = time.perf_counter() - start
+
+        return {
+            'bytes': directory_size(temp_dir),
+            'save_ms': save_time / len(filenames) * 1000,
+            'load_ms': load_time / len(filenames) * 1000,
+        }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    fixtures = load_fixtures()
+    print(f"📊 Storage benchmark: {len(fixtures)} fixtures x {ROUNDS} rounds")
+    print(f"{'format':<10}{'dedup':<8}{'bytes on disk':>15}{'vs json':>10}{'save ms':>10}{'load ms':>10}")
+
+    baseline = None
+    for storage_format in BACKENDS:
+        for dedup_blobs in (False, True):
+            try:
+                result = run_benchmark(storage_format, dedup_blobs, fixtures)
+            except ImportError as e:
+                print(f"{storage_format:<10}skipped: {e}")
+                break
+            if baseline is None:
+                baseline = result['bytes']
+            print(
+                f"{storage_format:<10}{str(dedup_blobs):<8}{result['bytes']:>15,}"
+                f"{result['bytes'] / baseline:>9.0%}{result['save_ms']:>10.2f}{result['load_ms']:>10.2f}"
+            )
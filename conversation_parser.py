@@ -7,7 +7,8 @@ from agents.conversation_analysis_agent import analyze_input_for_linkedin
 from linkedin_parser import find_linkedin_profile_query
 from datetime import datetime, timedelta
 from utils.output_manager import output_manager
-from third_parties.linkedin import scrape_linkedin_profile
+from utils.write_behind import WriteBehindError
+from third_parties.linkedin import scrape_linkedin_profiles
 
 def analyze_conversation_and_find_linkedin_profiles(
     input_data: str, 
@@ -109,53 +110,75 @@ def analyze_conversation_and_find_linkedin_profiles(
     linkedin_profiles = []
     saved_files = []
     
-    for query in filtered_queries:
-        print(f"\n🔍 Searching for: {query}")
-        try:
-            linkedin_url = linkedin_lookup_agent.lookup(query)
-            
-            # Get full profile data if LinkedIn URL found
-            profile_data = None
-            if linkedin_url and "linkedin.com/in/" in linkedin_url and "Could not find" not in linkedin_url:
-                try:
-                    print(f"📊 Scraping full profile data...")
-                    profile_data = scrape_linkedin_profile(linkedin_url, mock=False)
-                except Exception as e:
-                    print(f"⚠️ Could not scrape full profile: {e}")
-            
-            profile_info = {
-                'search_query': query,
-                'linkedin_url': linkedin_url,
-                'profile_data': profile_data
-            }
-            linkedin_profiles.append(profile_info)
-            
-            # Save results if enabled and LinkedIn profile found
-            if save_results and linkedin_url and "linkedin.com/in/" in linkedin_url:
-                try:
-                    filename = output_manager.save_conversation_analysis(
-                        search_query=query,
-                        linkedin_url=linkedin_url,
-                        profile_data=profile_data,
-                        conversation_analysis=detailed_analysis,
-                        original_conversation=original_conversation,
-                        conversation_date=conversation_date,
-                        user_identity=user_identity
-                    )
-                    saved_files.append(filename)
-                except Exception as e:
-                    print(f"⚠️ Failed to save results for {query}: {e}")
-            
-            print(f"✅ Found: {linkedin_url}")
-            
-        except Exception as e:
-            print(f"❌ Failed: {e}")
+    # Resolve everyone concurrently, so the step takes as long as the slowest lookup
+    print(f"\n🔍 Searching for {len(filtered_queries)} people: {', '.join(filtered_queries)}")
+    for lookup_result in linkedin_lookup_agent.lookup_many(filtered_queries):
+        query = lookup_result['query']
+        if lookup_result['error']:
+            print(f"❌ Failed: {query}: {lookup_result['error']}")
             linkedin_profiles.append({
                 'search_query': query,
                 'linkedin_url': None,
                 'profile_data': None,
-                'error': str(e)
+                'profile': None,
+                'error': lookup_result['error']
+            })
+        else:
+            linkedin_profiles.append({
+                'search_query': query,
+                'linkedin_url': lookup_result['url'],
+                'profile_data': None,
+                'profile': None
             })
+            print(f"✅ Found: {query}: {lookup_result['url']}")
+    
+    # Scrape every found profile in one concurrent batch instead of one round trip per person
+    scrapable = [
+        profile_info for profile_info in linkedin_profiles
+        if profile_info['linkedin_url'] and "linkedin.com/in/" in profile_info['linkedin_url']
+        and "Could not find" not in profile_info['linkedin_url']
+    ]
+    if scrapable:
+        print(f"\n📊 Scraping full profile data for {len(scrapable)} profiles...")
+        scrape_results = scrape_linkedin_profiles([profile_info['linkedin_url'] for profile_info in scrapable])
+        for profile_info, scrape_result in zip(scrapable, scrape_results):
+            if scrape_result['error']:
+                print(f"⚠️ Could not scrape full profile for {profile_info['search_query']}: {scrape_result['error']}")
+            profile_info['profile_data'] = scrape_result['data']
+            profile_info['profile'] = scrape_result['profile']
+    
+    # Write saves in the background so one slow disk write doesn't hold up the rest
+    if save_results:
+        output_manager.enable_write_behind()
+    
+    for profile_info in linkedin_profiles:
+        query = profile_info['search_query']
+        linkedin_url = profile_info['linkedin_url']
+        
+        # Save results if enabled and LinkedIn profile found
+        if save_results and linkedin_url and "linkedin.com/in/" in linkedin_url:
+            try:
+                filename = output_manager.save_conversation_analysis(
+                    search_query=query,
+                    linkedin_url=linkedin_url,
+                    profile_data=profile_info['profile_data'],
+                    profile=profile_info['profile'],
+                    conversation_analysis=detailed_analysis,
+                    original_conversation=original_conversation,
+                    conversation_date=conversation_date,
+                    user_identity=user_identity
+                )
+                saved_files.append(filename)
+            except Exception as e:
+                print(f"⚠️ Failed to save results for {query}: {e}")
+    
+    # Saves are written in the background; make sure they are on disk before reporting them
+    try:
+        output_manager.flush()
+    except WriteBehindError as e:
+        failed = {item[0] for item in e.failed_items}
+        print(f"⚠️ Failed to save results for {len(failed)} profiles: {e}")
+        saved_files = [filename for filename in saved_files if filename not in failed]
     
     result = {
         'detailed_analysis': detailed_analysis,
@@ -335,13 +358,10 @@ def view_saved_analyses():
     print("📋 SAVED CONVERSATION ANALYSES")
     print("=" * 50)
     
-    analyses = output_manager.list_saved_analyses()
-    
-    if not analyses:
-        print("No saved analyses found.")
-        return
-    
-    for i, analysis in enumerate(analyses, 1):
+    # Stream from the index so very large output folders print in constant memory
+    found = False
+    for i, analysis in enumerate(output_manager.iter_saved_analyses(), 1):
+        found = True
         print(f"\n{i}. {analysis.get('person_name', 'Unknown')}")
         print(f"   🔍 Search: {analysis.get('search_used', 'N/A')}")
         print(f"   🏢 Company: {analysis.get('company', 'Not specified')}")
@@ -349,6 +369,9 @@ def view_saved_analyses():
         print(f"   🔗 LinkedIn: {'✅' if analysis.get('linkedin_found') else '❌'}")
         print(f"   📅 Date: {analysis.get('file_date', '')[:10]}")
         print(f"   📁 File: {analysis.get('filename', '')}")
+    
+    if not found:
+        print("No saved analyses found.")
 
 def search_saved_analyses(search_term: str):
     """Search saved analyses by name, company, or job title."""
@@ -373,6 +396,9 @@ if __name__ == "__main__":
     print("\nAdditional commands:")
     print("  python conversation_parser.py --view         # View saved analyses")
     print("  python conversation_parser.py --search <term> # Search saved analyses")
+    print("  python conversation_parser.py --rebuild-index # Rebuild the saved analyses index")
+    print("  python conversation_parser.py --migrate-storage <json|gzip|zstd|msgpack> # Convert saved analyses")
+    print("  python conversation_parser.py --migrate-layout <flat|date|hash|date_hash> # Reorganize saved analyses")
     print("\nRun tests with:")
     print("  python tests/run_all_tests.py")
     print("  python tests/test_conversation_parser.py 3")
@@ -384,3 +410,11 @@ if __name__ == "__main__":
         elif sys.argv[1] == '--search' and len(sys.argv) > 2:
             search_term = ' '.join(sys.argv[2:])
             search_saved_analyses(search_term)
+        elif sys.argv[1] == '--rebuild-index':
+            output_manager.rebuild_index()
+        elif sys.argv[1] == '--migrate-storage' and len(sys.argv) > 2:
+            from utils.output_manager import ConversationOutputManager
+            ConversationOutputManager(output_dir=output_manager.output_dir, storage_format=sys.argv[2]).migrate_storage()
+        elif sys.argv[1] == '--migrate-layout' and len(sys.argv) > 2:
+            from utils.output_manager import ConversationOutputManager
+            ConversationOutputManager(output_dir=output_manager.output_dir, layout=sys.argv[2]).migrate_layout()
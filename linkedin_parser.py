@@ -4,12 +4,18 @@ from dotenv import load_dotenv
 import os
 
 from third_parties.linkedin import scrape_linkedin_profile
+from third_parties.profile_model import Profile
+from third_parties.profile_projection import project_profile, projection_enabled, projection_report
 from agents import linkedin_lookup_agent
 from output_parsers import summary_parser, Summary
 
-def find_linkedin_profile_query(query: str, mock=True) -> tuple [Summary, str, str]:
+def find_linkedin_profile_query(query: str, mock=True, force_refresh=False, mock_profile=None) -> tuple [Summary, str, str]:
     """
     Looks up a LinkedIn profile based on a search query and returns a summary.
+
+    Scraped profiles are served from the on-disk cache when available;
+    force_refresh=True always fetches a fresh copy. In mock mode, mock_profile
+    picks one of the bundled fixture profiles.
     """
     if mock:
         # Skip lookup when using mock data
@@ -17,18 +23,18 @@ def find_linkedin_profile_query(query: str, mock=True) -> tuple [Summary, str, s
     else:
         linkedin_url = linkedin_lookup_agent.lookup(query=query)
     
-    linkedin_data = scrape_linkedin_profile(linkedin_profile_url=linkedin_url, mock=mock)
+    linkedin_data = scrape_linkedin_profile(
+        linkedin_profile_url=linkedin_url, mock=mock, force_refresh=force_refresh, mock_profile=mock_profile
+    )
     
     # Debug: Print available keys to understand the data structure
     print("=== DEBUG: LinkedIn Data Keys ===")
     print(f"Available keys: {list(linkedin_data.keys()) if isinstance(linkedin_data, dict) else 'Not a dict'}")
     
-    # Extract the person data from the API response
-    person_data = linkedin_data.get('person', {}) if isinstance(linkedin_data, dict) else {}
-    
-    # Extract image URLs from the person data using the correct field names
-    profile_picture_url = person_data.get('photoUrl')
-    banner_url = person_data.get('backgroundUrl')
+    # Parse the fields we read once, whichever provider answered
+    profile_model = Profile.from_response(linkedin_data)
+    profile_picture_url = profile_model.photo_url
+    banner_url = profile_model.background_url
     
     # Add the extracted URLs to the main data
     if profile_picture_url:
@@ -68,9 +74,19 @@ def find_linkedin_profile_query(query: str, mock=True) -> tuple [Summary, str, s
 
     chain = summary_prompt_template | llm | summary_parser
 
+    # Only pass the fields the summary uses, as compact text, instead of the whole response
+    profile = linkedin_data
+    if projection_enabled():
+        profile = project_profile(linkedin_data)
+        report = projection_report(linkedin_data, profile)
+        print(
+            f"📉 Profile prompt: {report['before_tokens']} → {report['after_tokens']} tokens "
+            f"({report['saved_ratio']:.0%} smaller, {report['tokenizer']})"
+        )
+
     res:Summary = chain.invoke(
         input={
-            "profile": linkedin_data
+            "profile": profile
         }
     )
     print(res)
@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 from dotenv import load_dotenv
 
 # Add the parent directory to the Python path
@@ -217,6 +218,317 @@ def test_linkedin_lookup_query_parsing():
     
     return results
 
+def test_fast_path_matching():
+    """Test fast-path scoring of search candidates (no API calls)"""
+    from tools.profile_matching import confident_match
+    
+    print("🧪 TESTING LINKEDIN LOOKUP - FAST PATH MATCHING")
+    print("=" * 60)
+    
+    candidates = [
+        {
+            "url": "https://www.linkedin.com/in/matt-young-csu",
+            "title": "Matthew Young - Software Engineer - Nickel5, Inc. | LinkedIn",
+            "content": "Full Stack Software Developer at Nickel5"
+        },
+        {
+            "url": "https://www.linkedin.com/in/matthew-young-99",
+            "title": "Matthew Young - Teacher | LinkedIn",
+            "content": "High school teacher in Ohio"
+        },
+        {
+            "url": "https://www.linkedin.com/in/matt-jones-12",
+            "title": "Matt Jones - Sales Manager - Acme | LinkedIn",
+            "content": "Sales"
+        }
+    ]
+    
+    matching_tests = [
+        {
+            "query": "Matt software engineer Nickel5",
+            "expected": "https://www.linkedin.com/in/matt-young-csu",
+            "description": "Company and title pick one Matt"
+        },
+        {
+            "query": "Matt Young",
+            "expected": None,
+            "description": "Two equally good Matt Youngs go to the agent"
+        },
+        {
+            "query": "Eric Burton Martin Cognizant",
+            "expected": None,
+            "description": "No candidate with the right name goes to the agent"
+        }
+    ]
+    
+    # A lone candidate with the right name but none of the query's context must not be accepted
+    matching_tests.extend([
+        {
+            "query": "Matt Young Nickel5",
+            "candidates": [{
+                "url": "https://www.linkedin.com/in/matt-young-teacher",
+                "title": "Matt Young - Teacher | LinkedIn",
+                "content": "High school teacher in Ohio"
+            }],
+            "expected": None,
+            "description": "Right name, wrong company (single candidate) goes to the agent"
+        },
+        {
+            "query": "John Smith Google",
+            "candidates": [{
+                "url": "https://www.linkedin.com/in/john-smith-4821",
+                "title": "John Smith - Accountant - Microsoft | LinkedIn",
+                "content": "Senior accountant at Microsoft"
+            }],
+            "expected": None,
+            "description": "Right name, different employer (single candidate) goes to the agent"
+        },
+        {
+            "query": "John Smith Google",
+            "candidates": [{
+                "url": "https://www.linkedin.com/in/john-smith-google",
+                "title": "John Smith - Staff Engineer - Google | LinkedIn",
+                "content": "Staff engineer at Google"
+            }],
+            "expected": "https://www.linkedin.com/in/john-smith-google",
+            "description": "Right name and company (single candidate) is accepted"
+        }
+    ])
+
+    results = []
+    for i, test in enumerate(matching_tests, 1):
+        match = confident_match(test['query'], test.get('candidates', candidates))
+        url = match['url'] if match else None
+        success = url == test['expected']
+        print(f"   {'✅' if success else '❌'} Test {i}: {test['description']} -> {url}")
+        results.append(success)
+    
+    return results
+
+def test_alookup_many():
+    """Test alookup_many ordering, timeouts, errors and cancellation with a stubbed lookup (no API calls)"""
+    import asyncio
+    from utils.singleflight import AsyncSingleFlight
+
+    print("🧪 TESTING LINKEDIN LOOKUP - ALOOKUP_MANY")
+    print("=" * 60)
+
+    calls = {'started': 0, 'finished': 0, 'cancelled': 0}
+
+    async def fake_alookup(query):
+        calls['started'] += 1
+        try:
+            if query.startswith("slow"):
+                await asyncio.sleep(0.5)
+            elif query.startswith("broken"):
+                raise RuntimeError("search exploded")
+            else:
+                # Finish in reverse order so results have to be put back in input order
+                await asyncio.sleep(0.01 * (5 - int(query.split()[-1])))
+        except asyncio.CancelledError:
+            calls['cancelled'] += 1
+            raise
+        calls['finished'] += 1
+        return f"https://www.linkedin.com/in/{query.replace(' ', '-')}"
+
+    original = linkedin_lookup_agent._alookup
+    linkedin_lookup_agent._alookup = fake_alookup
+    results = []
+    try:
+        queries = [f"person {i}" for i in range(5)] + ["broken person", "slow person 1", "slow person 2"]
+
+        async def run_batch():
+            output = await linkedin_lookup_agent.alookup_many(queries, max_concurrency=3, timeout=0.1)
+            # Look before asyncio.run() tears the loop down, which cancels any leftover task anyway
+            await asyncio.sleep(0.05)
+            return output, dict(calls)
+
+        output, counts = asyncio.run(run_batch())
+
+        in_order = [item['query'] for item in output] == queries
+        print(f"   {'✅' if in_order else '❌'} Results come back in input order")
+        results.append(in_order)
+
+        urls_ok = all(item['url'] == f"https://www.linkedin.com/in/person-{i}" and item['error'] is None
+                      for i, item in enumerate(output[:5]))
+        print(f"   {'✅' if urls_ok else '❌'} Successful lookups carry their URL")
+        results.append(urls_ok)
+
+        error_ok = output[5]['url'] is None and output[5]['error'] == "search exploded"
+        print(f"   {'✅' if error_ok else '❌'} A failing lookup reports its error without failing the batch")
+        results.append(error_ok)
+
+        timeouts_ok = all(item['url'] is None and 'timed out' in item['error'] for item in output[6:])
+        print(f"   {'✅' if timeouts_ok else '❌'} Slow lookups time out")
+        results.append(timeouts_ok)
+
+        # Timed-out lookups must stop, not keep running (and spending API calls) in the background
+        cancelled_ok = counts['cancelled'] == 2 and counts['finished'] == 5
+        print(f"   {'✅' if cancelled_ok else '❌'} Timed-out lookups are cancelled "
+              f"({counts['cancelled']} cancelled, {counts['finished']} finished)")
+        results.append(cancelled_ok)
+    finally:
+        linkedin_lookup_agent._alookup = original
+
+    # A shared call keeps running while any caller still waits for it
+    async def shared_call():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.2)
+            return "done"
+
+        impatient = asyncio.ensure_future(flight.do("key", work))
+        patient = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.05)
+        impatient.cancel()
+        return await patient, flight.stats()
+
+    value, stats = asyncio.run(shared_call())
+    shared_ok = value == "done" and stats['upstream_calls'] == 1 and stats['in_flight'] == 0
+    print(f"   {'✅' if shared_ok else '❌'} Cancelling one of two waiters leaves the shared call running")
+    results.append(shared_ok)
+
+    return results
+
+def test_bundled_prompt():
+    """Test the bundled ReAct prompt and the on-disk hub prompt cache (no network calls)"""
+    import shutil
+    import tempfile
+    import time
+    from langchain import hub
+    from langchain_core.prompts import PromptTemplate
+    from agents import prompts
+
+    print("🧪 TESTING LINKEDIN LOOKUP - BUNDLED PROMPT")
+    print("=" * 60)
+
+    results = []
+    pulls = []
+    hub_answer = {'fail': False}
+
+    def fake_pull(name):
+        pulls.append(name)
+        if hub_answer['fail']:
+            raise ConnectionError("hub unreachable")
+        return PromptTemplate.from_template("Hub version {input} {tools} {tool_names} {agent_scratchpad}")
+
+    temp_dir = tempfile.mkdtemp(prefix="test_prompts_")
+    original = (prompts.PROMPT_SOURCE, prompts.PROMPT_HUB_CACHE_DIR, dict(prompts._prompts), hub.pull)
+    try:
+        hub.pull = fake_pull
+        prompts._prompts.clear()
+
+        # Bundled (default): the verbatim ReAct prompt, built once, no hub access
+        prompts.PROMPT_SOURCE = "bundled"
+        prompt = prompts.get_react_prompt()
+        bundled_ok = (set(prompt.input_variables) == {'tools', 'tool_names', 'input', 'agent_scratchpad'}
+                      and prompt.template == prompts.REACT_TEMPLATE
+                      and prompts.get_react_prompt() is prompt and not pulls)
+        print(f"   {'✅' if bundled_ok else '❌'} Bundled ReAct prompt is loaded once without the hub")
+        results.append(bundled_ok)
+
+        # Hub mode: pulled once, then served from the disk cache by later processes
+        prompts.PROMPT_SOURCE = "hub"
+        prompts.PROMPT_HUB_CACHE_DIR = temp_dir
+        prompts._prompts.clear()
+        first = prompts.get_prompt("hwchase17/react")
+        prompts._prompts.clear()  # as if in a new process
+        second = prompts.get_prompt("hwchase17/react")
+        cached_ok = (pulls == ["hwchase17/react"] and first.template.startswith("Hub version")
+                     and second.template == first.template and os.path.exists(prompts._cache_path("hwchase17/react")))
+        print(f"   {'✅' if cached_ok else '❌'} Hub prompt pulled once, then read from the disk cache")
+        results.append(cached_ok)
+
+        # Stale unpinned entries are re-pulled; pinned commits are kept for good
+        prompts.get_prompt("hwchase17/react:d15fe3c4")
+        long_ago = time.time() - prompts.PROMPT_HUB_CACHE_TTL - 60
+        for name in ("hwchase17/react", "hwchase17/react:d15fe3c4"):
+            os.utime(prompts._cache_path(name), (long_ago, long_ago))
+        prompts._prompts.clear()
+        prompts.get_prompt("hwchase17/react")
+        prompts.get_prompt("hwchase17/react:d15fe3c4")
+        ttl_ok = pulls == ["hwchase17/react", "hwchase17/react:d15fe3c4", "hwchase17/react"]
+        print(f"   {'✅' if ttl_ok else '❌'} Expired unpinned prompts are re-pulled, pinned ones are not")
+        results.append(ttl_ok)
+
+        # With the hub unreachable and nothing cached, the bundled copy is used
+        hub_answer['fail'] = True
+        shutil.rmtree(temp_dir)
+        prompts._prompts.clear()
+        fallback_ok = prompts.get_react_prompt().template == prompts.REACT_TEMPLATE
+        print(f"   {'✅' if fallback_ok else '❌'} Falls back to the bundled prompt when the hub is unreachable")
+        results.append(fallback_ok)
+    except Exception as e:
+        print(f"   ❌ Bundled prompt test failed: {e}")
+        results.append(False)
+    finally:
+        prompts.PROMPT_SOURCE, prompts.PROMPT_HUB_CACHE_DIR, saved_prompts, hub.pull = original
+        prompts._prompts.clear()
+        prompts._prompts.update(saved_prompts)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return results
+
+def test_lookup_many():
+    """Test lookup_many ordering, timeouts and per-item errors with a stubbed lookup (no API calls)"""
+    print("🧪 TESTING LINKEDIN LOOKUP - LOOKUP_MANY")
+    print("=" * 60)
+
+    def fake_lookup(query):
+        if query.startswith("slow"):
+            time.sleep(0.5)
+        elif query.startswith("broken"):
+            raise RuntimeError("search exploded")
+        else:
+            # Finish in reverse order so results have to be put back in input order
+            time.sleep(0.02 * (5 - int(query.split()[-1])))
+        return f"https://www.linkedin.com/in/{query.replace(' ', '-')}"
+
+    original = linkedin_lookup_agent.lookup
+    linkedin_lookup_agent.lookup = fake_lookup
+    results = []
+    try:
+        queries = [f"person {i}" for i in range(5)] + ["broken person", "slow person 1"]
+        output = linkedin_lookup_agent.lookup_many(queries, max_workers=4, timeout=0.2)
+
+        in_order = [item['query'] for item in output] == queries
+        print(f"   {'✅' if in_order else '❌'} Results come back in input order")
+        results.append(in_order)
+
+        urls_ok = all(item['url'] == f"https://www.linkedin.com/in/person-{i}" and item['error'] is None
+                      for i, item in enumerate(output[:5]))
+        print(f"   {'✅' if urls_ok else '❌'} Successful lookups carry their URL")
+        results.append(urls_ok)
+
+        error_ok = output[5]['url'] is None and output[5]['error'] == "search exploded"
+        print(f"   {'✅' if error_ok else '❌'} A failing lookup reports its error without failing the batch")
+        results.append(error_ok)
+
+        timeout_ok = output[6]['url'] is None and 'timed out' in (output[6]['error'] or '')
+        print(f"   {'✅' if timeout_ok else '❌'} A slow lookup times out")
+        results.append(timeout_ok)
+
+        # The timeout runs from when a lookup starts, not while it waits for a free worker
+        queued = [f"person {i % 5}" for i in range(8)]
+        start = time.perf_counter()
+        output = linkedin_lookup_agent.lookup_many(queued, max_workers=1, timeout=0.15)
+        elapsed = time.perf_counter() - start
+        queued_ok = elapsed > 0.15 and all(item['error'] is None and item['url'] for item in output)
+        print(f"   {'✅' if queued_ok else '❌'} Queued lookups aren't timed out while waiting ({elapsed:.2f}s batch)")
+        results.append(queued_ok)
+
+        empty_ok = linkedin_lookup_agent.lookup_many([]) == []
+        print(f"   {'✅' if empty_ok else '❌'} An empty batch returns no results")
+        results.append(empty_ok)
+    except Exception as e:
+        print(f"   ❌ lookup_many test failed: {e}")
+        results.append(False)
+    finally:
+        linkedin_lookup_agent.lookup = original
+
+    return results
+
 def run_linkedin_lookup_tests(skip_api_tests: bool = False):
     """Run all LinkedIn lookup agent tests"""
     print("🚀 RUNNING LINKEDIN LOOKUP AGENT TEST SUITE")
@@ -230,30 +542,50 @@ def run_linkedin_lookup_tests(skip_api_tests: bool = False):
     config_results = test_linkedin_lookup_api_requirements()
     all_results.extend(config_results)
     
-    # Test 2: Query Parsing (always run)
-    print("\n2️⃣ QUERY PARSING TEST")
+    # Test 2: Fast path matching (always run, offline)
+    print("\n2️⃣ FAST PATH MATCHING TEST")
+    print("-" * 30)
+    all_results.extend(test_fast_path_matching())
+    
+    # Test 3: Concurrent async lookups (always run, offline)
+    print("\n3️⃣ ALOOKUP_MANY TEST")
+    print("-" * 30)
+    all_results.extend(test_alookup_many())
+    
+    # Test 4: Bundled prompt and hub prompt cache (always run, offline)
+    print("\n4️⃣ BUNDLED PROMPT TEST")
+    print("-" * 30)
+    all_results.extend(test_bundled_prompt())
+    
+    # Test 5: Concurrent lookups (always run, offline)
+    print("\n5️⃣ LOOKUP_MANY TEST")
+    print("-" * 30)
+    all_results.extend(test_lookup_many())
+    
+    # Test 6: Query Parsing (always run)
+    print("\n6️⃣ QUERY PARSING TEST")
     print("-" * 30)
     parsing_results = test_linkedin_lookup_query_parsing()
     all_results.extend(parsing_results)
     
-    # Test 3: Basic Functionality (optional - requires API calls)
+    # Test 7: Basic Functionality (optional - requires API calls)
     if not skip_api_tests and all(config_results[:2]):  # Only if API keys are present
-        print("\n3️⃣ BASIC FUNCTIONALITY TEST")
+        print("\n7️⃣ BASIC FUNCTIONALITY TEST")
         print("-" * 30)
         basic_results = test_linkedin_lookup_basic()
         all_results.extend(basic_results)
         
-        print("\n4️⃣ ERROR HANDLING TEST")
+        print("\n8️⃣ ERROR HANDLING TEST")
         print("-" * 30)
         error_results = test_linkedin_lookup_error_handling()
         all_results.extend(error_results)
     else:
         if skip_api_tests:
-            print("\n3️⃣ BASIC FUNCTIONALITY TEST - SKIPPED")
+            print("\n7️⃣ BASIC FUNCTIONALITY TEST - SKIPPED")
             print("-" * 30)
             print("   Use --api flag to include API tests")
         else:
-            print("\n3️⃣ BASIC FUNCTIONALITY TEST - SKIPPED")
+            print("\n7️⃣ BASIC FUNCTIONALITY TEST - SKIPPED")
             print("-" * 30)
             print("   Missing required API keys")
     
@@ -3,7 +3,7 @@ import os
 import json
 import tempfile
 import shutil
-from datetime import datetime
+from datetime import date, datetime
 from dotenv import load_dotenv
 
 # Add the parent directory to the Python path
@@ -70,6 +70,61 @@ def test_output_manager():
         print("-" * 30)
         test_results.append(test_loading_and_searching(output_manager))
         
+        # Test 8: Rebuilding the analysis index from saved files
+        print("\n8️⃣ TESTING INDEX REBUILD")
+        print("-" * 30)
+        test_results.append(test_index_rebuild(output_manager))
+        
+        # Test 9: Shared blobs for repeated profile/conversation data
+        print("\n9️⃣ TESTING BLOB DEDUPLICATION")
+        print("-" * 30)
+        test_results.append(test_blob_deduplication(output_manager))
+        
+        # Test 10: Failed background writes are reported, not lost silently
+        print("\n🔟 TESTING WRITE-BEHIND ERRORS")
+        print("-" * 30)
+        test_results.append(test_write_behind_errors(temp_dir))
+        
+        # Test 11: Lazy records as used by the results viewer
+        print("\n1️⃣1️⃣ TESTING LAZY RECORDS IN THE RESULTS VIEWER")
+        print("-" * 30)
+        test_results.append(test_lazy_results_viewer(temp_dir))
+        
+        # Test 12: Loaded-record cache isolation and memory accounting
+        print("\n1️⃣2️⃣ TESTING LOADED-RECORD CACHE")
+        print("-" * 30)
+        test_results.append(test_record_cache(temp_dir))
+        
+        # Test 13: Storage format detection and migration
+        print("\n1️⃣3️⃣ TESTING STORAGE FORMATS AND MIGRATION")
+        print("-" * 30)
+        test_results.append(test_storage_migration(temp_dir))
+        
+        # Test 14: Directory layouts and migration
+        print("\n1️⃣4️⃣ TESTING DIRECTORY LAYOUTS AND MIGRATION")
+        print("-" * 30)
+        test_results.append(test_layout_migration(temp_dir))
+        
+        # Test 15: A scrape's parsed Profile is reused when saving
+        print("\n1️⃣5️⃣ TESTING PARSED PROFILE REUSE")
+        print("-" * 30)
+        test_results.append(test_parsed_profile_reuse(temp_dir))
+        
+        # Test 16: Ranked full-text search
+        print("\n1️⃣6️⃣ TESTING SEARCH RANKING")
+        print("-" * 30)
+        test_results.append(test_search_ranking(temp_dir))
+        
+        # Test 17: Keyset pagination and filters
+        print("\n1️⃣7️⃣ TESTING PAGINATION AND FILTERS")
+        print("-" * 30)
+        test_results.append(test_pagination(temp_dir))
+        
+        # Test 18: Managers open storage on first use and only write behind when asked
+        print("\n1️⃣8️⃣ TESTING LAZY OPENING AND OPT-IN WRITE-BEHIND")
+        print("-" * 30)
+        test_results.append(test_lazy_open_and_write_behind_opt_in(temp_dir))
+        
         # Summary
         passed = sum(test_results)
         total = len(test_results)
@@ -88,7 +143,18 @@ def test_output_manager():
                 "Name Extraction",
                 "Filename Sanitization",
                 "Conversation Saving",
-                "Loading and Searching"
+                "Loading and Searching",
+                "Index Rebuild",
+                "Blob Deduplication",
+                "Write-Behind Errors",
+                "Lazy Results Viewer",
+                "Loaded-Record Cache",
+                "Storage Migration",
+                "Layout Migration",
+                "Parsed Profile Reuse",
+                "Search Ranking",
+                "Pagination and Filters",
+                "Lazy Open and Opt-In Write-Behind"
             ]
             print(f"   {i}. {test_names[i-1]}: {status}")
         
@@ -364,6 +430,662 @@ def test_loading_and_searching(output_manager):
         print(f"❌ Loading and searching test failed: {e}")
         return False
 
+def test_index_rebuild(output_manager):
+    """Test that the analysis index can be rebuilt from the saved files"""
+    try:
+        indexed = output_manager.list_saved_analyses()
+        
+        # Wipe the index and rebuild it from disk
+        output_manager.index.replace_all([])
+        if output_manager.list_saved_analyses():
+            print("❌ Index still returned analyses after being cleared")
+            return False
+        
+        count = output_manager.rebuild_index()
+        rebuilt = output_manager.list_saved_analyses()
+        
+        if count != len(indexed) or [a['filename'] for a in rebuilt] != [a['filename'] for a in indexed]:
+            print(f"❌ Rebuilt index differs: {count} entries vs {len(indexed)} before")
+            return False
+        
+        print(f"✅ Index rebuild test passed - {count} analyses indexed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Index rebuild test failed: {e}")
+        return False
+
+def test_blob_deduplication(output_manager):
+    """Test that repeated conversation text is stored once and loaded back transparently"""
+    try:
+        conversation = "Person A: Great keynote on DeFi scalability!\nPerson B: Agreed. " * 20
+        
+        filenames = []
+        for first_name in ['Alice', 'Bob']:
+            filenames.append(output_manager.save_conversation_analysis(
+                search_query=f"{first_name} Blockchain Developer",
+                linkedin_url=f"https://www.linkedin.com/in/{first_name.lower()}-dev",
+                profile_data={'person': {'firstName': first_name, 'lastName': 'Dev'}, 'credits_left': 42},
+                conversation_analysis={'analysis': f'{first_name} builds DeFi tools'},
+                original_conversation=conversation
+            ))
+        
+        # Both person files should point at the same conversation blob
+        references = []
+        for filename in filenames:
+            with open(os.path.join(output_manager.output_dir, filename), 'r', encoding='utf-8') as f:
+                references.append(json.load(f)['conversation']['original_text'])
+        
+        if not all(isinstance(ref, dict) and '$blob' in ref for ref in references) or references[0] != references[1]:
+            print(f"❌ Conversation text was not deduplicated: {references}")
+            return False
+        
+        # Loading should return the original text, not the reference
+        for filename in filenames:
+            data = output_manager.load_person_data(filename)
+            if data['conversation']['original_text'] != conversation:
+                print(f"❌ Conversation text not restored for {filename}")
+                return False
+            if data['linkedin_profile']['profile_data'].get('credits_left') != 42:
+                print(f"❌ Profile data not restored for {filename}")
+                return False
+        
+        print("✅ Blob deduplication test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Blob deduplication test failed: {e}")
+        return False
+
+def test_write_behind_errors(temp_dir):
+    """Test that a failed background save is raised from flush() and close() instead of being dropped"""
+    from utils.write_behind import WriteBehindError
+    
+    try:
+        manager = ConversationOutputManager(output_dir=os.path.join(temp_dir, 'write_behind'), write_behind=True)
+        
+        def save(first_name):
+            return manager.save_conversation_analysis(
+                search_query=f"{first_name} Engineer",
+                linkedin_url=f"https://www.linkedin.com/in/{first_name.lower()}-engineer",
+                profile_data={'person': {'firstName': first_name, 'lastName': 'Engineer'}},
+                conversation_analysis={'analysis': f'{first_name} ships features'},
+                original_conversation=f"Met {first_name} at the meetup"
+            )
+        
+        # Make serialization fail for one save only
+        original_dumps = manager.backend.dumps
+        def failing_dumps(document):
+            if document['metadata']['actual_name'] == 'Broken Engineer':
+                raise OSError("disk full")
+            return original_dumps(document)
+        manager.backend.dumps = failing_dumps
+        
+        broken = save('Broken')
+        try:
+            manager.flush()
+            print("❌ flush() did not report the failed write")
+            return False
+        except WriteBehindError as e:
+            if [item[0] for item in e.failed_items] != [broken] or not isinstance(e.__cause__, OSError):
+                print(f"❌ Wrong failure details: {e.failed_items}, cause {e.__cause__!r}")
+                return False
+        print("   ✅ flush() raised WriteBehindError naming the unsaved file")
+        
+        # The failure is reported once; later saves are unaffected
+        healthy = save('Healthy')
+        manager.flush()
+        if not manager.load_person_data(healthy) or manager.load_person_data(broken):
+            print("❌ Healthy save missing or broken save unexpectedly present")
+            return False
+        print("   ✅ Later saves still succeed and the error is not re-raised")
+        
+        # close() reports failures that flush() hasn't
+        save('Broken')
+        try:
+            manager.close()
+            print("❌ close() did not report the failed write")
+            return False
+        except WriteBehindError:
+            pass
+        print("   ✅ close() raised WriteBehindError for a failure still queued")
+        
+        print("✅ Write-behind error test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Write-behind error test failed: {e}")
+        return False
+
+def test_lazy_results_viewer(temp_dir):
+    """Test that the results viewer only loads blobs it shows, and that lazy records serialize"""
+    import io
+    from contextlib import redirect_stdout
+    from utils import results_viewer
+    from utils.lazy_record import LazyAnalysisRecord, json_default
+    
+    try:
+        manager = ConversationOutputManager(output_dir=os.path.join(temp_dir, 'lazy'))
+        filename = manager.save_conversation_analysis(
+            search_query="Dana Data Scientist",
+            linkedin_url="https://www.linkedin.com/in/dana-scientist",
+            profile_data={'person': {'firstName': 'Dana', 'lastName': 'Scientist', 'headline': 'Data Scientist at Acme',
+                                     'summary': 'Builds churn and retention models. ' * 20}},
+            conversation_analysis={'analysis': 'Dana models churn', 'action_items': ['Send the paper']},
+            original_conversation="Dana: churn models are my thing. " * 20
+        )
+        # Large enough to be stored as blobs, which is what lazy loading defers
+        with open(os.path.join(manager.output_dir, filename), 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if '$blob' not in stored['linkedin_profile']['profile_data'] or '$blob' not in stored['conversation']['original_text']:
+            print("❌ Test data was not stored as blobs")
+            return False
+        
+        blob_loads = []
+        original_load = manager.blob_store.load
+        def counting_load(digest):
+            blob_loads.append(digest)
+            return original_load(digest)
+        manager.blob_store.load = counting_load
+        
+        original_manager = results_viewer.output_manager
+        results_viewer.output_manager = manager
+        try:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                results_viewer.view_person_details(filename, show_profile=False, show_original=False)
+            if blob_loads or 'Dana models churn' not in output.getvalue():
+                print(f"❌ Summary view loaded {len(blob_loads)} blobs or missed the analysis")
+                return False
+            print("   ✅ Viewing without profile/conversation loads no blobs")
+            
+            output = io.StringIO()
+            with redirect_stdout(output):
+                results_viewer.view_person_details(filename)
+            shown = output.getvalue()
+            if len(blob_loads) != 2 or 'Data Scientist at Acme' not in shown or 'churn models are my thing' not in shown:
+                print(f"❌ Full view loaded {len(blob_loads)} blobs or missed profile/conversation")
+                return False
+            print("   ✅ Full view loads the profile and conversation blobs")
+        finally:
+            results_viewer.output_manager = original_manager
+        
+        # Lazy records serialize to the same JSON as the eager load
+        record = manager.load_person_data(filename, lazy=True)
+        if not isinstance(record, LazyAnalysisRecord):
+            print(f"❌ Expected a LazyAnalysisRecord, got {type(record)}")
+            return False
+        eager = manager.load_person_data(filename)
+        if json.loads(json.dumps(record, default=json_default)) != json.loads(json.dumps(eager)):
+            print("❌ Lazy record serialized differently from the eager load")
+            return False
+        if manager.backend.loads(manager.backend.dumps(record)) != eager:
+            print("❌ Storage backend could not serialize the lazy record")
+            return False
+        print("   ✅ Lazy records serialize like the eager load")
+        
+        print("✅ Lazy results viewer test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Lazy results viewer test failed: {e}")
+        return False
+
+def test_record_cache(temp_dir):
+    """Test that cached loads hand out independent copies and are charged their decoded size"""
+    from utils.record_cache import estimate_size
+    
+    try:
+        manager = ConversationOutputManager(output_dir=os.path.join(temp_dir, 'record_cache'),
+                                            storage_format='gzip', dedup_blobs=False)
+        filename = manager.save_conversation_analysis(
+            search_query="Eve Platform Engineer",
+            linkedin_url="https://www.linkedin.com/in/eve-platform",
+            profile_data={'person': {'firstName': 'Eve', 'lastName': 'Platform', 'skills': ['Go', 'Kubernetes']}},
+            conversation_analysis={'analysis': 'Eve runs the platform team', 'action_items': ['Share the runbook']},
+            original_conversation="Eve: we migrated everything to Kubernetes. " * 50
+        )
+        
+        # Mutating nested data of one load must not leak into the next
+        first = manager.load_person_data(filename)
+        first['conversation']['analysis']['action_items'].append('Injected')
+        first['linkedin_profile']['profile_data']['person']['skills'].clear()
+        second = manager.load_person_data(filename)
+        if second['conversation']['analysis']['action_items'] != ['Share the runbook']:
+            print(f"❌ Cached action items were mutated: {second['conversation']['analysis']['action_items']}")
+            return False
+        if second['linkedin_profile']['profile_data']['person']['skills'] != ['Go', 'Kubernetes']:
+            print("❌ Cached profile data was mutated")
+            return False
+        if manager.cache_stats()['hits'] < 1:
+            print("❌ Second load was not served from the cache")
+            return False
+        print("   ✅ Loads from the cache are independent copies")
+        
+        # The budget is charged the decoded size, not the (much smaller) compressed file
+        on_disk = os.path.getsize(os.path.join(manager.output_dir, filename))
+        charged = manager.cache_stats()['bytes']
+        if charged != estimate_size(manager._read_analysis_document(filename)) or charged <= on_disk:
+            print(f"❌ Cache charged {charged} bytes for a {on_disk}-byte file")
+            return False
+        print(f"   ✅ Cache charged {charged} bytes for a {on_disk}-byte gzip file")
+        
+        print("✅ Loaded-record cache test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Loaded-record cache test failed: {e}")
+        return False
+
+def test_storage_migration(temp_dir):
+    """Test format detection, migrate_storage round-trips and that the migrated format is kept"""
+    from utils.storage_backends import BACKENDS, detect_backend, get_backend
+    
+    try:
+        # Every installed backend's output is recognized and decodes to the same data
+        sample = {'metadata': {'actual_name': 'Zoë Format'}, 'items': [1, 2.5, None, True]}
+        for name in BACKENDS:
+            try:
+                backend = get_backend(name)
+            except ImportError:
+                print(f"   ⚠️ {name} backend not installed - skipped")
+                continue
+            payload = backend.dumps(sample)
+            if detect_backend(payload).name != name or backend.loads(payload) != sample:
+                print(f"❌ {name} payload not detected or not round-tripped")
+                return False
+        print("   ✅ Each storage format is detected from its bytes")
+        
+        output_dir = os.path.join(temp_dir, 'storage_migration')
+        manager = ConversationOutputManager(output_dir=output_dir)
+        filename = manager.save_conversation_analysis(
+            search_query="Fay Format Engineer",
+            linkedin_url="https://www.linkedin.com/in/fay-format",
+            profile_data={'person': {'firstName': 'Fay', 'lastName': 'Format', 'summary': 'Compression nerd. ' * 40}},
+            conversation_analysis={'analysis': 'Fay knows codecs'},
+            original_conversation="Fay: gzip or zstd? " * 40
+        )
+        original = manager.load_person_data(filename)
+        stem = filename[:-len('.json')]
+        
+        # json -> gzip: files are renamed, the index follows and the data is unchanged
+        if ConversationOutputManager(output_dir=output_dir, storage_format='gzip').migrate_storage() != 1:
+            print("❌ Expected one file converted to gzip")
+            return False
+        reopened = ConversationOutputManager(output_dir=output_dir)
+        if reopened.backend.name != 'gzip':
+            print(f"❌ Migrated format not kept: new managers use {reopened.backend.name}")
+            return False
+        if reopened.load_person_data(f"{stem}.json.gz") != original:
+            print("❌ Data changed in the gzip round trip")
+            return False
+        if [entry['filename'] for entry in reopened.list_saved_analyses()] != [f"{stem}.json.gz"]:
+            print("❌ Index does not list the renamed file")
+            return False
+        print("   ✅ Migrated to gzip and new managers default to gzip")
+        
+        # ...and back again
+        ConversationOutputManager(output_dir=output_dir, storage_format='json').migrate_storage()
+        reopened = ConversationOutputManager(output_dir=output_dir)
+        if reopened.backend.name != 'json' or reopened.load_person_data(filename) != original:
+            print("❌ Round trip back to json failed")
+            return False
+        if ConversationOutputManager(output_dir=output_dir, storage_format='json').migrate_storage() != 0:
+            print("❌ Migrating to the current format should convert nothing")
+            return False
+        print("   ✅ Migrated back to json with identical data")
+        
+        # Hashed layouts bucket by the name without its extension, so converted files stay loadable
+        from utils.output_layout import relative_path_for
+        for layout in ('hash', 'date_hash'):
+            layout_dir = os.path.join(temp_dir, f'storage_migration_{layout}')
+            manager = ConversationOutputManager(output_dir=layout_dir, layout=layout)
+            filename = manager.save_conversation_analysis(
+                search_query="Fay Format Engineer",
+                linkedin_url="https://www.linkedin.com/in/fay-format",
+                profile_data={'person': {'firstName': 'Fay', 'lastName': 'Format'}},
+                conversation_analysis={'analysis': 'Fay knows codecs'},
+                original_conversation="Fay: gzip or zstd?"
+            )
+            original = manager.load_person_data(filename)
+            ConversationOutputManager(output_dir=layout_dir, storage_format='gzip', layout=layout).migrate_storage()
+            gz_filename = f"{filename[:-len('.json')]}.json.gz"
+            gz_path = os.path.join(layout_dir, relative_path_for(gz_filename, layout))
+            if os.path.dirname(gz_path) != os.path.dirname(os.path.join(layout_dir, relative_path_for(filename, layout))):
+                print(f"❌ Converting to gzip changed the {layout} bucket")
+                return False
+            reopened = ConversationOutputManager(output_dir=layout_dir, layout=layout)
+            if not os.path.exists(gz_path) or reopened.load_person_data(gz_filename) != original:
+                print(f"❌ Migrated file not found under the {layout} layout")
+                return False
+        print("   ✅ Files converted under the hash layouts stay in their bucket and load")
+        
+        print("✅ Storage migration test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Storage migration test failed: {e}")
+        return False
+
+def test_layout_migration(temp_dir):
+    """Test layout path resolution, migrate_layout and that the migrated layout is kept"""
+    from utils.blob_store import BLOBS_DIRNAME
+    from utils.output_layout import LAYOUTS, candidate_paths, relative_path_for
+    
+    try:
+        name = "Gus_Layout_20250618_171245.json"
+        expected = {
+            'flat': name,
+            'date': os.path.join('2025', '06', '18', name),
+        }
+        for layout, path in expected.items():
+            if relative_path_for(name, layout) != path:
+                print(f"❌ {layout} layout put {name} at {relative_path_for(name, layout)}")
+                return False
+        bucket = relative_path_for(name, 'hash').split(os.sep)[0]
+        if relative_path_for(name, 'date_hash') != os.path.join('2025', '06', bucket, name) or len(bucket) != 2:
+            print(f"❌ Unexpected hash buckets: {relative_path_for(name, 'hash')}, {relative_path_for(name, 'date_hash')}")
+            return False
+        if relative_path_for("untimestamped.json", 'date') != "untimestamped.json":
+            print("❌ Files without a timestamp should stay flat in the date layout")
+            return False
+        candidates = list(candidate_paths('out', name, 'date'))
+        if candidates[0] != os.path.join('out', expected['date']) or len(candidates) != len(LAYOUTS):
+            print(f"❌ Candidate paths should start with the current layout: {candidates}")
+            return False
+        print("   ✅ Each layout resolves to the expected path")
+        
+        output_dir = os.path.join(temp_dir, 'layout_migration')
+        manager = ConversationOutputManager(output_dir=output_dir)
+        filename = manager.save_conversation_analysis(
+            search_query="Gus Layout Engineer",
+            linkedin_url="https://www.linkedin.com/in/gus-layout",
+            profile_data={'person': {'firstName': 'Gus', 'lastName': 'Layout'}},
+            conversation_analysis={'analysis': 'Gus sorts directories'},
+            original_conversation="Gus: flat directories don't scale"
+        )
+        original = manager.load_person_data(filename)
+        
+        if ConversationOutputManager(output_dir=output_dir, layout='date_hash').migrate_layout() != 1:
+            print("❌ Expected one file moved to the date_hash layout")
+            return False
+        reopened = ConversationOutputManager(output_dir=output_dir)
+        moved_path = os.path.join(output_dir, relative_path_for(filename, 'date_hash'))
+        if reopened.layout != 'date_hash' or not os.path.exists(moved_path):
+            print(f"❌ Migrated layout not kept (new managers use {reopened.layout}) or file not moved")
+            return False
+        if reopened.load_person_data(filename) != original:
+            print("❌ Moved file could not be loaded")
+            return False
+        print("   ✅ Moved to date_hash and new managers default to it")
+        
+        # A manager still on the old layout finds the moved file, and moving back cleans up
+        if ConversationOutputManager(output_dir=output_dir, layout='flat').load_person_data(filename) != original:
+            print("❌ A flat-layout manager could not find the moved file")
+            return False
+        ConversationOutputManager(output_dir=output_dir, layout='flat').migrate_layout()
+        leftovers = [entry for entry in os.listdir(output_dir) if os.path.isdir(os.path.join(output_dir, entry))
+                     and entry != BLOBS_DIRNAME]
+        if not os.path.exists(os.path.join(output_dir, filename)) or leftovers:
+            print(f"❌ Moving back to flat left {leftovers}")
+            return False
+        if ConversationOutputManager(output_dir=output_dir).layout != 'flat':
+            print("❌ Layout setting not updated after moving back")
+            return False
+        print("   ✅ Moved back to flat and removed the empty bucket directories")
+        
+        print("✅ Layout migration test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Layout migration test failed: {e}")
+        return False
+
+def test_parsed_profile_reuse(temp_dir):
+    """Test that a batch scrape parses each profile once and saving reuses that Profile"""
+    from third_parties import profile_model
+    from third_parties.linkedin import scrape_linkedin_profiles
+    
+    original_from_response = profile_model.Profile.from_response.__func__
+    parses = []
+    def counting_from_response(cls, data):
+        parses.append(data)
+        return original_from_response(cls, data)
+    
+    profile_model.Profile.from_response = classmethod(counting_from_response)
+    try:
+        scraped = scrape_linkedin_profiles(["https://www.linkedin.com/in/dummy"], mock=True)[0]
+        if len(parses) != 1 or not isinstance(scraped['profile'], profile_model.Profile):
+            print(f"❌ Batch scrape parsed the profile {len(parses)} times")
+            return False
+        print("   ✅ The batch scrape returns the Profile it parsed once")
+        
+        for write_behind in (False, True):
+            parses.clear()
+            manager = ConversationOutputManager(output_dir=os.path.join(temp_dir, f'profile_reuse_{write_behind}'),
+                                                write_behind=write_behind)
+            filename = manager.save_conversation_analysis(
+                search_query="Mock Person",
+                linkedin_url=scraped['url'],
+                profile_data=scraped['data'],
+                profile=scraped['profile'],
+                conversation_analysis={'analysis': 'Met at the mock meetup'},
+                original_conversation="Hello from the fixture"
+            )
+            manager.close()
+            if parses:
+                print(f"❌ Saving re-parsed the profile {len(parses)} times (write_behind={write_behind})")
+                return False
+            if manager.search_saved_analyses(scraped['profile'].first_name or 'Mock')[0]['filename'] != filename:
+                print("❌ Saved analysis not searchable by the profile's name")
+                return False
+        print("   ✅ Saving (direct and write-behind) uses the given Profile without re-parsing")
+        
+        print("✅ Parsed profile reuse test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Parsed profile reuse test failed: {e}")
+        return False
+    finally:
+        profile_model.Profile.from_response = classmethod(original_from_response)
+
+def _index_entry(filename, person_name, company='', job_title='', analysis='', file_date='2025-01-01T12:00:00'):
+    """An (filename, summary, file_date, search_document) entry for AnalysisIndex tests."""
+    summary = {'person_name': person_name, 'company': company, 'job_title': job_title,
+               'linkedin_found': bool(company)}
+    return (filename, summary, file_date, {**summary, 'analysis': analysis})
+
+def test_search_ranking(temp_dir):
+    """Test BM25 field weighting, prefix matching and the AND -> OR fallback of index search"""
+    from utils.analysis_index import AnalysisIndex, index_path_for
+    
+    try:
+        index_dir = os.path.join(temp_dir, 'search_ranking')
+        os.makedirs(index_dir)
+        index = AnalysisIndex(index_path_for(index_dir))
+        index.replace_all([
+            _index_entry("Alice_Smith_20250101_120000.json", "Alice Smith", company="Acme", job_title="Engineering Manager"),
+            _index_entry("Bob_Jones_20250102_120000.json", "Bob Jones", company="Globex", job_title="Designer",
+                         analysis="Bob used to contract for Acme"),
+            _index_entry("Carol_White_20250103_120000.json", "Carol White", company="Initech", job_title="Engineer"),
+            # Unrelated analyses, so 'acme' is rare enough for BM25 to give it a positive weight
+            *(_index_entry(f"Filler_{i}_20250104_12000{i}.json", f"Filler Person{i}", company="Umbrella")
+              for i in range(4)),
+        ])
+        
+        def names(results):
+            return [result['person_name'] for result in results]
+        
+        # A company-field match outranks a mention in the analysis text
+        results = index.search("acme")
+        if names(results) != ["Alice Smith", "Bob Jones"]:
+            print(f"❌ Expected the company match first, got {names(results)}")
+            return False
+        if not results[0]['search_score'] > results[1]['search_score'] > 0:
+            print(f"❌ Scores not descending: {[result['search_score'] for result in results]}")
+            return False
+        print("   ✅ BM25 ranks a company match above an analysis mention")
+        
+        # Words match as prefixes, in any case
+        if sorted(names(index.search("ENG"))) != ["Alice Smith", "Carol White"]:
+            print(f"❌ Prefix 'ENG' matched {names(index.search('ENG'))}")
+            return False
+        print("   ✅ Query words match as case-insensitive prefixes")
+        
+        # All words must match when possible; otherwise any word does
+        if names(index.search("alice acme")) != ["Alice Smith"]:
+            print(f"❌ AND query matched {names(index.search('alice acme'))}")
+            return False
+        fallback = names(index.search("alice globex"))
+        if sorted(fallback) != ["Alice Smith", "Bob Jones"]:
+            print(f"❌ OR fallback matched {fallback}")
+            return False
+        if index.search("zebra") or index.search("   ") or len(index.search("acme", limit=1)) != 1:
+            print("❌ Unmatched/empty queries should return nothing and limit should cap results")
+            return False
+        print("   ✅ Falls back from all words to any word, and honours limit")
+        
+        print("✅ Search ranking test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Search ranking test failed: {e}")
+        return False
+
+def test_pagination(temp_dir):
+    """Test keyset pagination, cursors and filters of the index-backed listing"""
+    try:
+        manager = ConversationOutputManager(output_dir=os.path.join(temp_dir, 'pagination'))
+        entries = []
+        for day in range(1, 8):
+            company = "Acme Corp" if day % 2 else "Globex"
+            entries.append(_index_entry(
+                f"Person_{day}_202501{day:02d}_120000.json", f"Person {day}", company=company if day != 7 else '',
+                job_title="Engineer" if day <= 3 else "Designer", file_date=f"2025-01-{day:02d}T12:00:00"
+            ))
+        # Two analyses saved at the same moment are still ordered, and neither is skipped
+        entries.append(_index_entry("Twin_B_20250105_120000.json", "Twin B", company="Globex", file_date="2025-01-05T12:00:00"))
+        manager.index.replace_all(entries)
+        everything = [entry[0] for entry in sorted(entries, key=lambda entry: (entry[2], entry[0]), reverse=True)]
+        
+        # Pages of 3 cover everything once, newest first, ending with a None cursor
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = manager.list_saved_analyses_page(page_size=3, cursor=cursor)
+            seen.extend(summary['filename'] for summary in page)
+            pages += 1
+            if cursor is None:
+                break
+        if seen != everything or pages != 3:
+            print(f"❌ Pagination returned {seen} in {pages} pages")
+            return False
+        if [summary['filename'] for summary in manager.iter_saved_analyses(page_size=2, limit=5)] != everything[:5]:
+            print("❌ iter_saved_analyses did not honour limit across pages")
+            return False
+        print("   ✅ Keyset pages cover every analysis once, newest first")
+        
+        def filtered(**filters):
+            return [summary['person_name'] for summary in manager.iter_saved_analyses(page_size=2, **filters)]
+        
+        if filtered(company="acme") != ["Person 5", "Person 3", "Person 1"]:
+            print(f"❌ Company filter returned {filtered(company='acme')}")
+            return False
+        if filtered(job_title="ENGINEER") != ["Person 3", "Person 2", "Person 1"]:
+            print(f"❌ Job title filter returned {filtered(job_title='ENGINEER')}")
+            return False
+        if filtered(linkedin_found=False) != ["Person 7"]:
+            print(f"❌ linkedin_found filter returned {filtered(linkedin_found=False)}")
+            return False
+        if filtered(start_date="2025-01-05", end_date="2025-01-06") != ["Person 6", "Twin B", "Person 5"]:
+            print(f"❌ Date range returned {filtered(start_date='2025-01-05', end_date='2025-01-06')}")
+            return False
+        if filtered(company="globex", start_date=date(2025, 1, 5)) != ["Person 6", "Twin B"]:
+            print("❌ Combined filters returned the wrong analyses")
+            return False
+        print("   ✅ Company, job title, LinkedIn and date filters combine with paging")
+        
+        # Filter text is matched literally - % and _ are not wildcards
+        manager.index.replace_all([
+            _index_entry("Literal_20250101_120000.json", "Literal", company="100%_Pure\\Labs", job_title="R_D"),
+            _index_entry("Plain_20250102_120000.json", "Plain", company="100 Pure Labs", job_title="RnD"),
+        ])
+        for filters in ({'company': "%"}, {'company': "_"}, {'company': "\\"}, {'company': "100%_pure"}, {'job_title': "r_d"}):
+            if filtered(**filters) != ["Literal"]:
+                print(f"❌ Filter {filters} returned {filtered(**filters)}")
+                return False
+        print("   ✅ % and _ in filters match literally")
+        
+        try:
+            manager.list_saved_analyses_page(cursor="not-a-cursor")
+            print("❌ An invalid cursor was accepted")
+            return False
+        except ValueError:
+            pass
+        print("   ✅ Invalid cursors raise ValueError")
+        
+        print("✅ Pagination test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Pagination test failed: {e}")
+        return False
+
+def test_lazy_open_and_write_behind_opt_in(temp_dir):
+    """Test that creating a manager touches no index or blobs, and write-behind is opt-in with one exit hook"""
+    from utils import write_behind
+    from utils.analysis_index import index_path_for
+    from utils.blob_store import BLOBS_DIRNAME
+    from utils.output_manager import output_manager as default_manager
+    
+    original_register = write_behind.atexit.register
+    try:
+        output_dir = os.path.join(temp_dir, 'lazy_open')
+        manager = ConversationOutputManager(output_dir=output_dir)
+        if os.path.exists(index_path_for(output_dir)) or os.path.exists(os.path.join(output_dir, BLOBS_DIRNAME)):
+            print("❌ Creating a manager opened the index or blob store")
+            return False
+        manager.list_saved_analyses()
+        if not os.path.exists(index_path_for(output_dir)):
+            print("❌ Index not created on first use")
+            return False
+        print("   ✅ The index and blob store are opened on first use")
+        
+        if default_manager._writer is not None:
+            print("❌ The shared manager writes behind without being asked to")
+            return False
+        
+        registered = []
+        write_behind.atexit.register = registered.append
+        manager.enable_write_behind()
+        manager.enable_write_behind()
+        for first_name in ('Una', 'Vic'):
+            filename = manager.save_conversation_analysis(
+                search_query=f"{first_name} Queue Engineer",
+                linkedin_url=f"https://www.linkedin.com/in/{first_name.lower()}-queue",
+                profile_data={'person': {'firstName': first_name, 'lastName': 'Queue'}},
+                conversation_analysis={'analysis': f'{first_name} drains queues'},
+                original_conversation=f"Met {first_name} by the message queue"
+            )
+            # close() stops the writer thread; the next save starts a new one
+            manager.close()
+            if not os.path.exists(os.path.join(output_dir, filename)):
+                print(f"❌ {filename} not written by the background writer")
+                return False
+        if len(registered) != 1:
+            print(f"❌ Expected one exit hook for a restarted writer, got {len(registered)}")
+            return False
+        print("   ✅ Write-behind is opt-in and a restarted writer registers one exit hook")
+        
+        print("✅ Lazy open and write-behind opt-in test passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Lazy open and write-behind opt-in test failed: {e}")
+        return False
+    finally:
+        write_behind.atexit.register = original_register
+
 if __name__ == "__main__":
     print("Starting Output Manager Comprehensive Testing...")
     success = test_output_manager()
@@ -0,0 +1,110 @@
+import os
+import threading
+from typing import Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds for every third-party API call
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 10))
+
+# Retries for connection errors and throttled/failing responses; Retry-After is honoured
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Connections kept open per host, shared by every thread
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))
+
+_session = None
+_session_lock = threading.Lock()
+# URL prefix -> rate limiter whose budget that host's retries also spend
+_rate_limited_prefixes = {}
+
+
+class RateLimitedRetry(Retry):
+    """
+    Retry that takes a token from the host's rate limiter before every retry, so
+    retries count against the same budget as first attempts. A throttled response's
+    headers (Retry-After, X-RateLimit-*) are reported to the limiter as well.
+    """
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def new(self, **kwargs) -> "RateLimitedRetry":
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response=None):
+        if self.rate_limiter is not None and response is not None:
+            self.rate_limiter.update(response.headers)
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+def default_timeout() -> Tuple[float, float]:
+    return (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+
+def _build_adapter(rate_limiter=None) -> HTTPAdapter:
+    retry = RateLimitedRetry(
+        rate_limiter=rate_limiter,
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        # Hand the final response back instead of raising, so callers can report the API's error body
+        raise_on_status=False,
+    )
+    return HTTPAdapter(pool_connections=10, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+
+def _build_session() -> requests.Session:
+    adapter = _build_adapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for prefix, rate_limiter in _rate_limited_prefixes.items():
+        session.mount(prefix, _build_adapter(rate_limiter))
+    return session
+
+
+def rate_limit_retries(url_prefix: str, rate_limiter):
+    """
+    Make retries of requests to url_prefix (e.g. "https://api.scrapin.io") wait for
+    rate_limiter, like the first attempt does.
+    """
+    with _session_lock:
+        _rate_limited_prefixes[url_prefix] = rate_limiter
+        if _session is not None:
+            _session.mount(url_prefix, _build_adapter(rate_limiter))
+
+
+def get_session() -> requests.Session:
+    """
+    The process-wide pooled session.
+
+    One session (and so one set of per-host urllib3 connection pools, which are
+    thread-safe) is shared by every thread, so keep-alive connections are reused
+    across calls and threads without new DNS/TCP/TLS setup. It only sends stateless
+    GETs with per-request headers; nothing per-caller is kept on it.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET through the pooled session, with the default timeouts unless overridden."""
+    kwargs.setdefault("timeout", default_timeout())
+    return get_session().get(url, **kwargs)
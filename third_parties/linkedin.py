@@ -1,83 +1,431 @@
+import copy
 import os
-import requests
+import re
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
 from dotenv import load_dotenv
 
+from third_parties.http_session import http_get, rate_limit_retries
+from third_parties.mock_profiles import find_mock_profile, load_mock_profile
+from third_parties.profile_model import Profile
+from third_parties.profile_shapes import normalize_profile_response
+from third_parties.provider_router import ProviderRouter
+from third_parties.rate_limiter import QuotaAwareRateLimiter
+from utils.disk_cache import DiskTTLCache, HIT, NOT_FOUND
+from utils.singleflight import SingleFlight
+
 load_dotenv()
 
+# Scraped profiles are cached on disk so repeat lookups don't spend API credits.
+# A TTL of 0 disables the cache.
+PROFILE_CACHE_PATH = os.getenv("LINKEDIN_CACHE_PATH", os.path.join(".cache", "linkedin_profiles.sqlite3"))
+PROFILE_CACHE_TTL = float(os.getenv("LINKEDIN_CACHE_TTL", 7 * 24 * 3600))
+PROFILE_CACHE_NOT_FOUND_TTL = float(os.getenv("LINKEDIN_CACHE_NOT_FOUND_TTL", 24 * 3600))
+PROFILE_CACHE_MAX_BYTES = int(float(os.getenv("LINKEDIN_CACHE_MAX_MB", 256)) * 1024 * 1024)
+
+_profile_cache = None
+
+# Concurrent scrapes of the same profile share one upstream request; scrape_flight.stats()
+# reports how many requests that saved
+scrape_flight = SingleFlight(copy_shared=copy.deepcopy)
+
+# Provider endpoints; point these at a replay server (third_parties/replay_server.py) for load tests
+SCRAPIN_BASE_URL = os.getenv("SCRAPIN_BASE_URL", "https://api.scrapin.io").rstrip('/')
+PROXYCURL_BASE_URL = os.getenv("PROXYCURL_BASE_URL", "https://nubela.co/proxycurl").rstrip('/')
+
+# Upper bound on simultaneous upstream requests per provider, shared by every caller
+PROVIDER_MAX_CONCURRENCY = {
+    "scrapin": int(os.getenv("SCRAPIN_MAX_CONCURRENCY", 5)),
+    "proxycurl": int(os.getenv("PROXYCURL_MAX_CONCURRENCY", 5)),
+}
+_provider_slots = {
+    provider: threading.BoundedSemaphore(limit) for provider, limit in PROVIDER_MAX_CONCURRENCY.items()
+}
+
+# api="auto": providers tried in this order, hedging on slow responses and failing over on errors
+PROVIDER_ORDER = [provider.strip() for provider in os.getenv("SCRAPE_PROVIDER_ORDER", "scrapin,proxycurl").split(",") if provider.strip()]
+provider_router = ProviderRouter()
+
+# Request rate per provider; each limiter slows itself down as the reported quota runs low
+rate_limiters = {
+    "scrapin": QuotaAwareRateLimiter(
+        rate_per_second=float(os.getenv("SCRAPIN_RATE_PER_SECOND", 5)),
+        burst=int(os.getenv("SCRAPIN_RATE_BURST", 5)),
+    ),
+    "proxycurl": QuotaAwareRateLimiter(
+        rate_per_second=float(os.getenv("PROXYCURL_RATE_PER_SECOND", 5)),
+        burst=int(os.getenv("PROXYCURL_RATE_BURST", 5)),
+    ),
+}
+
+# Retries made by the HTTP layer spend the same budget as first attempts
+rate_limit_retries(SCRAPIN_BASE_URL, rate_limiters["scrapin"])
+rate_limit_retries(PROXYCURL_BASE_URL, rate_limiters["proxycurl"])
+
+LINKEDIN_PROFILE_PATH = re.compile(r'^/(in|pub)/([^/]+)')
+
+
+class ProfileNotFoundError(Exception):
+    """The provider reported that the LinkedIn profile does not exist."""
+
+
+def canonicalize_linkedin_url(linkedin_profile_url: str) -> str:
+    """
+    Normalize a LinkedIn profile URL so different spellings of the same profile match.
+
+    Scheme, country subdomains (uk.linkedin.com), query strings, fragments, trailing
+    slashes and letter case are all dropped: https://www.linkedin.com/in/<slug>
+    """
+    url = linkedin_profile_url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().split(':')[0]
+    match = LINKEDIN_PROFILE_PATH.match(parsed.path)
+    if not host.endswith("linkedin.com") or not match:
+        # Not a recognizable profile URL - only normalize what is safe to
+        return url.rstrip('/')
+    return f"https://www.linkedin.com/{match.group(1)}/{unquote(match.group(2)).lower()}"
+
+
+def get_profile_cache() -> Optional[DiskTTLCache]:
+    """The shared scrape cache, opened on first use; None when caching is disabled."""
+    global _profile_cache
+    if PROFILE_CACHE_TTL <= 0:
+        return None
+    if _profile_cache is None:
+        _profile_cache = DiskTTLCache(
+            PROFILE_CACHE_PATH,
+            ttl_seconds=PROFILE_CACHE_TTL,
+            not_found_ttl_seconds=PROFILE_CACHE_NOT_FOUND_TTL,
+            max_bytes=PROFILE_CACHE_MAX_BYTES,
+        )
+    return _profile_cache
+
+
+# Deeper payloads than this are rejected rather than cleaned; real profiles nest ~5 levels
+MAX_CLEAN_DEPTH = 100
+
+_CONTAINERS = (dict, list)
+
 
-def _recursively_remove_empty_values(item):
+def _recursively_remove_empty_values(item, in_place: bool = False, max_depth: int = MAX_CLEAN_DEPTH):
     """
     Recursively remove keys from dictionaries if their values are None,
     an empty dictionary, or an empty list.
     Cleans dictionaries within lists as well.
+
+    Walks the data with an explicit stack instead of recursion, so deep payloads
+    can't hit the recursion limit; nesting beyond max_depth raises ValueError.
+    With in_place=True the input's own dicts and lists are pruned instead of copied.
     """
-    if isinstance(item, dict):
-        cleaned_dict = {}
-        for key, value in item.items():
-            cleaned_value = _recursively_remove_empty_values(value)
-            # Add key only if cleaned_value is not one of the "empty" markers
-            if (
-                cleaned_value is not None
-                and cleaned_value != {}
-                and cleaned_value != []
-            ):
-                cleaned_dict[key] = cleaned_value
-        return cleaned_dict
-    elif isinstance(item, list):
-        cleaned_list = []
-        for list_item in item:
-            cleaned_list_item = _recursively_remove_empty_values(list_item)
-            # Add item to list only if it's not one of the "empty" markers
-            # This will also filter out None/[]/{} from within lists if they were standalone
-            if (
-                cleaned_list_item is not None
-                and cleaned_list_item != {}
-                and cleaned_list_item != []
-            ):
-                cleaned_list.append(cleaned_list_item)
-        return cleaned_list
-    else:
+    if not isinstance(item, _CONTAINERS):
         return item
+    if in_place:
+        return _remove_empty_values_in_place(item, max_depth)
+
+    is_dict = isinstance(item, dict)
+    source = iter(item.items()) if is_dict else iter(item)
+    cleaned = {} if is_dict else []
+    # (source iterator, cleaned container, is_dict, key of the child being cleaned) per open ancestor
+    parents = []
+
+    while True:
+        child = None
+        if is_dict:
+            for key, value in source:
+                if value is None:
+                    continue
+                if isinstance(value, _CONTAINERS):
+                    child = value
+                    break
+                cleaned[key] = value
+        else:
+            append = cleaned.append
+            for value in source:
+                if value is None:
+                    continue
+                if isinstance(value, _CONTAINERS):
+                    child = value
+                    key = None
+                    break
+                append(value)
+
+        if child is not None:
+            if len(parents) >= max_depth:
+                raise ValueError(f"Profile data is nested deeper than {max_depth} levels")
+            parents.append((source, cleaned, is_dict, key))
+            is_dict = isinstance(child, dict)
+            source = iter(child.items()) if is_dict else iter(child)
+            cleaned = {} if is_dict else []
+            continue
+
+        # Current container is done; resume its parent, keeping the result only if non-empty
+        if not parents:
+            return cleaned
+        finished = cleaned
+        source, cleaned, is_dict, key = parents.pop()
+        if finished:
+            if is_dict:
+                cleaned[key] = finished
+            else:
+                cleaned.append(finished)
+
+
+def _remove_empty_values_in_place(item, max_depth: int):
+    """In-place variant: lists are compacted, dict keys deleted once their dict is done."""
+    is_dict = isinstance(item, dict)
+    container = item
+    source = iter(item.items()) if is_dict else iter(item)
+    position = 0  # next write slot when compacting a list
+    dropped = None  # keys to delete from a dict (deferred - a dict can't shrink while iterated)
+    parents = []
+
+    while True:
+        child = None
+        if is_dict:
+            for key, value in source:
+                if value is None:
+                    if dropped is None:
+                        dropped = [key]
+                    else:
+                        dropped.append(key)
+                elif isinstance(value, _CONTAINERS):
+                    child = value
+                    break
+        else:
+            for value in source:
+                if value is None:
+                    continue
+                if isinstance(value, _CONTAINERS):
+                    child = value
+                    key = None
+                    break
+                container[position] = value
+                position += 1
+
+        if child is not None:
+            if len(parents) >= max_depth:
+                raise ValueError(f"Profile data is nested deeper than {max_depth} levels")
+            parents.append((source, container, is_dict, key, position, dropped))
+            is_dict = isinstance(child, dict)
+            container = child
+            source = iter(child.items()) if is_dict else iter(child)
+            position = 0
+            dropped = None
+            continue
+
+        if is_dict:
+            if dropped:
+                for key in dropped:
+                    del container[key]
+        else:
+            del container[position:]
+        if not parents:
+            return container
+
+        finished = container
+        source, container, is_dict, key, position, dropped = parents.pop()
+        if is_dict:
+            if not finished:
+                if dropped is None:
+                    dropped = [key]
+                else:
+                    dropped.append(key)
+        elif finished:
+            container[position] = finished
+            position += 1
 
 
 def scrape_linkedin_profile(
-    linkedin_profile_url: str, mock: bool = False, api: str = "scrapin"
+    linkedin_profile_url: str, mock: bool = False, api: str = "scrapin", force_refresh: bool = False,
+    mock_profile: Optional[str] = None
 ):
-    """Scrape LinkedIn profile information."""
+    """
+    Scrape LinkedIn profile information.
+
+    Results are cached on disk per (api, canonical profile URL), including "not found"
+    answers, so repeat scrapes cost no API credits. Pass force_refresh=True to skip the
+    cached copy and fetch (and re-cache) a fresh one.
+
+    Concurrent scrapes of the same profile are coalesced into one upstream request.
+
+    api="auto" routes between providers (PROVIDER_ORDER): if the primary is slower than
+    its usual latency a hedged request goes to the next one, errors fail over, and the
+    response comes back in Scrapin's shape whichever provider answered.
 
+    With mock=True nothing goes over the network: the bundled fixture named by
+    mock_profile is returned, else the one matching the URL, else the default one.
+    """
     if mock:
-        linkedin_profile_url = "https://gist.githubusercontent.com/emarco177/859ec7d786b45d8e3e3f688c6c9139d8/raw/5eaf8e46dc29a98612c8fe0c774123a7a2ac4575/eden-marco-scrapin.json"
-        response = requests.get(linkedin_profile_url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
+        if mock_profile:
+            data = load_mock_profile(mock_profile)
         else:
-            raise Exception(f"Failed to fetch mock data: {response.status_code}")
-    elif api == "scrapin":
+            data = find_mock_profile(linkedin_profile_url) or load_mock_profile()
+        return _recursively_remove_empty_values(data, in_place=True)
+
+    if api == "auto":
+        return _scrape_routed(linkedin_profile_url, force_refresh)
+
+    cache = get_profile_cache()
+    cache_key = f"{api}:{canonicalize_linkedin_url(linkedin_profile_url)}"
+    if cache is not None and not force_refresh:
+        kind, cached_data = cache.get(cache_key)
+        if kind == HIT:
+            print(f"💾 Using cached profile for {linkedin_profile_url}")
+            return cached_data
+        if kind == NOT_FOUND:
+            raise ProfileNotFoundError(f"LinkedIn profile not found (cached): {linkedin_profile_url}")
+
+    return scrape_flight.do(
+        (cache_key, force_refresh), _fetch_and_cache, linkedin_profile_url, api, cache, cache_key
+    )
+
+
+def _scrape_routed(linkedin_profile_url: str, force_refresh: bool):
+    attempts = [
+        (provider, partial(scrape_linkedin_profile, linkedin_profile_url, api=provider, force_refresh=force_refresh))
+        for provider in PROVIDER_ORDER
+    ]
+    provider, data = provider_router.call(attempts)
+    print(f"🔀 Profile served by {provider}")
+    return _recursively_remove_empty_values(normalize_profile_response(data))
+
+
+def _fetch_and_cache(linkedin_profile_url: str, api: str, cache: Optional[DiskTTLCache], cache_key: str):
+    try:
+        data = _fetch_linkedin_profile(linkedin_profile_url, api=api)
+    except ProfileNotFoundError:
+        if cache is not None:
+            cache.set_not_found(cache_key)
+        raise
+    if cache is not None:
+        cache.set(cache_key, data)
+    return data
+
+
+def get_scrape_budget(api: str = "scrapin") -> dict:
+    """Current rate and remaining quota, as last reported by the provider."""
+    return rate_limiters[api].budget()
+
+
+# Long-lived pool for scrape_linkedin_profiles, so batches reuse warm threads (and the
+# shared session's keep-alive connections) instead of starting a new pool per call
+SCRAPE_MAX_WORKERS = int(os.getenv("SCRAPE_MAX_WORKERS", 16))
+_scrape_executor = None
+_scrape_executor_lock = threading.Lock()
+
+
+def _get_scrape_executor() -> ThreadPoolExecutor:
+    global _scrape_executor
+    if _scrape_executor is None:
+        with _scrape_executor_lock:
+            if _scrape_executor is None:
+                _scrape_executor = ThreadPoolExecutor(max_workers=SCRAPE_MAX_WORKERS, thread_name_prefix="scrape")
+    return _scrape_executor
+
+
+def scrape_linkedin_profiles(
+    linkedin_profile_urls: List[str], max_concurrency: int = 8, mock: bool = False,
+    api: str = "scrapin", force_refresh: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Scrape many LinkedIn profiles concurrently.
+
+    Returns one {'url', 'data', 'profile', 'error'} dict per input URL, in input order:
+    'data' is the raw response and 'profile' the Profile parsed from it, once per
+    profile, for callers to pass along instead of re-parsing. A failed scrape sets
+    'error' (and leaves 'data' and 'profile' None) without failing the rest of the batch.
+    The same profile requested twice is only scraped once. Upstream calls also stay
+    within the provider's concurrency limit (PROVIDER_MAX_CONCURRENCY).
+
+    Scrapes run on a shared pool of SCRAPE_MAX_WORKERS threads; max_concurrency
+    caps how many of them one batch uses at a time.
+    """
+    unique_urls = {}
+    for url in linkedin_profile_urls:
+        unique_urls.setdefault(canonicalize_linkedin_url(url), url)
+
+    def scrape(url):
+        try:
+            data = scrape_linkedin_profile(url, mock=mock, api=api, force_refresh=force_refresh)
+        except Exception as e:
+            return None, None, str(e)
+        return data, Profile.from_response(data), None
+
+    outcomes = {}
+    executor = _get_scrape_executor()
+    queued = iter(unique_urls.items())
+    running = {}
+
+    def submit_next():
+        for canonical_url, url in queued:
+            running[executor.submit(scrape, url)] = canonical_url
+            return
+
+    # Keep at most max_concurrency of this batch's scrapes on the shared pool
+    for _ in range(max(1, max_concurrency)):
+        submit_next()
+    while running:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            outcomes[running.pop(future)] = future.result()
+            submit_next()
+
+    results = []
+    for url in linkedin_profile_urls:
+        data, profile, error = outcomes[canonicalize_linkedin_url(url)]
+        results.append({'url': url, 'data': data, 'profile': profile, 'error': error})
+    return results
+
+
+def _fetch_linkedin_profile(linkedin_profile_url: str, api: str):
+    """Fetch a profile from the provider and strip empty values."""
+    slots = _provider_slots.get(api)
+    if slots is None:
+        return _request_linkedin_profile(linkedin_profile_url, api)
+    with slots:
+        start = time.perf_counter()
+        data = _request_linkedin_profile(linkedin_profile_url, api)
+        # Successful upstream latencies set the hedge threshold for api="auto"
+        provider_router.latency.record(api, time.perf_counter() - start)
+        return data
+
+
+def _request_linkedin_profile(linkedin_profile_url: str, api: str):
+    if api == "scrapin":
         # Debug: Check if API key is loaded
         scrapin_key = os.getenv("SCRAPIN_API_KEY")
         print(f"Scrapin API Key loaded: {'Yes' if scrapin_key else 'No'}")
         
         # Use Scrapin.io API with correct authentication and parameter names
-        api_endpoint = "https://api.scrapin.io/enrichment/profile"
+        api_endpoint = f"{SCRAPIN_BASE_URL}/enrichment/profile"
         
         # Use X-API-Key header and linkedInUrl parameter (based on test results)
         headers = {"X-API-Key": scrapin_key}
         params = {"linkedInUrl": linkedin_profile_url}
         
-        response = requests.get(api_endpoint, params=params, headers=headers, timeout=10)
+        rate_limiters[api].acquire()
+        response = http_get(api_endpoint, params=params, headers=headers)
         data = response.json()
+        rate_limiters[api].update(response.headers, data)
 
     elif api == "proxycurl":
-        api_endpoint = "https://nubela.co/proxycurl/api/v2/linkedin"
+        api_endpoint = f"{PROXYCURL_BASE_URL}/api/v2/linkedin"
         header_dic = {"Authorization": f"Bearer {os.environ.get('PROXYCURL_API_KEY')}"}
-        response = requests.get(
+        rate_limiters[api].acquire()
+        response = http_get(
             api_endpoint,
             headers=header_dic,
             params={"url": linkedin_profile_url},
-            timeout=10,
         )
         data = response.json()
+        rate_limiters[api].update(response.headers, data)
 
     if response.status_code != 200:
         error_data = {}
@@ -85,6 +433,10 @@ def scrape_linkedin_profile(
             error_data = response.json()
         except json.JSONDecodeError:
             pass
+        if response.status_code in (404, 410):
+            raise ProfileNotFoundError(
+                f"LinkedIn profile not found (status {response.status_code}): {error_data.get('error', response.text)}"
+            )
         raise Exception(
             f"Failed to fetch LinkedIn profile (status {response.status_code}): {error_data.get('error', response.text)}"
         )
@@ -106,8 +458,8 @@ def scrape_linkedin_profile(
         if 'backgroundUrl' in person_data:
             print(f"backgroundUrl: {person_data['backgroundUrl']}")
 
-    # Recursively remove empty values
-    cleaned_data = _recursively_remove_empty_values(data)
+    # Recursively remove empty values (the parsed response is ours, so prune it in place)
+    cleaned_data = _recursively_remove_empty_values(data, in_place=True)
     return cleaned_data
 
 
@@ -0,0 +1,43 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+# Real Scrapin responses bundled with the repo, one file per profile, named by the
+# profile's public identifier (the /in/<name> part of its URL). Add a profile by
+# dropping its raw Scrapin JSON response into this directory.
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "profiles")
+
+# Profile served by mock mode when none is requested
+DEFAULT_MOCK_PROFILE = os.getenv("MOCK_PROFILE", "matt-young-csu")
+
+
+def list_mock_profiles() -> List[str]:
+    """Names of the bundled fixture profiles."""
+    if not os.path.isdir(FIXTURE_DIR):
+        return []
+    return sorted(filename[:-len('.json')] for filename in os.listdir(FIXTURE_DIR) if filename.endswith('.json'))
+
+
+def load_mock_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load a bundled profile as a fresh copy (callers may modify it).
+
+    name may be a fixture name or a LinkedIn profile URL whose identifier matches one.
+    """
+    name = name or DEFAULT_MOCK_PROFILE
+    if "linkedin.com/" in name:
+        name = name.split('?')[0].split('#')[0].rstrip('/').rsplit('/', 1)[-1].lower()
+
+    path = os.path.join(FIXTURE_DIR, f"{os.path.basename(name)}.json")
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown mock profile '{name}'. Available: {', '.join(list_mock_profiles())}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def find_mock_profile(linkedin_profile_url: str) -> Optional[Dict[str, Any]]:
+    """The bundled profile for a LinkedIn URL, or None if it isn't bundled."""
+    try:
+        return load_mock_profile(linkedin_profile_url)
+    except ValueError:
+        return None
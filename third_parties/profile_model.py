@@ -0,0 +1,160 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from third_parties.profile_shapes import normalize_profile_response
+
+# The fields of a scraped profile the app actually reads, parsed once per scrape
+# from either provider's response instead of walking person.positions.positionHistory
+# style .get() chains in every consumer. The raw response is still what gets cached
+# and saved; to_dict() is for the edges that need plain JSON.
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+def _location(value: Any) -> Optional[str]:
+    # Scrapin sends a string; older saved profiles have a {city, state, country} dict
+    if isinstance(value, dict):
+        value = ', '.join(filter(None, (_text(value.get(key)) for key in ('city', 'state', 'country'))))
+    return _text(value)
+
+
+def _records(container: Any, key: str) -> List[Dict[str, Any]]:
+    records = container.get(key) if isinstance(container, dict) else None
+    return [record for record in records or [] if isinstance(record, dict)]
+
+
+def _dates(record: Dict[str, Any]) -> Dict[str, Any]:
+    dates = record.get('startEndDate')
+    return dates if isinstance(dates, dict) else {}
+
+
+@dataclass(slots=True)
+class Position:
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    start: Optional[Dict[str, int]] = None
+    end: Optional[Dict[str, int]] = None
+    company_logo: Optional[str] = None
+
+    @classmethod
+    def from_scrapin(cls, record: Dict[str, Any]) -> "Position":
+        dates = _dates(record)
+        return cls(
+            title=_text(record.get('title')),
+            company=_text(record.get('companyName')),
+            location=_text(record.get('companyLocation')),
+            description=_text(record.get('description')),
+            start=dates.get('start'),
+            end=dates.get('end'),
+            company_logo=_text(record.get('companyLogo')),
+        )
+
+
+@dataclass(slots=True)
+class School:
+    name: Optional[str] = None
+    degree: Optional[str] = None
+    field_of_study: Optional[str] = None
+    start: Optional[Dict[str, int]] = None
+    end: Optional[Dict[str, int]] = None
+    logo: Optional[str] = None
+
+    @classmethod
+    def from_scrapin(cls, record: Dict[str, Any]) -> "School":
+        dates = _dates(record)
+        return cls(
+            name=_text(record.get('schoolName')),
+            degree=_text(record.get('degreeName')),
+            field_of_study=_text(record.get('fieldOfStudy')),
+            start=dates.get('start'),
+            end=dates.get('end'),
+            logo=_text(record.get('schoolLogo')),
+        )
+
+
+@dataclass(slots=True)
+class Profile:
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    headline: Optional[str] = None
+    location: Optional[str] = None
+    summary: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    photo_url: Optional[str] = None
+    background_url: Optional[str] = None
+    follower_count: Optional[int] = None
+    positions: List[Position] = field(default_factory=list)
+    schools: List[School] = field(default_factory=list)
+    skills: List[str] = field(default_factory=list)
+    company_name: Optional[str] = None
+    company_logo_url: Optional[str] = None
+    company_banner_url: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, data: Optional[Dict[str, Any]]) -> "Profile":
+        """Build a profile from a Scrapin or Proxycurl response (empty if there is none)."""
+        if hasattr(data, 'to_dict') and not isinstance(data, dict):
+            # Lazily loaded section of a saved analysis
+            data = data.to_dict()
+        if not isinstance(data, dict) or not data:
+            return cls()
+        data = normalize_profile_response(data)
+        person = data.get('person') if isinstance(data.get('person'), dict) else {}
+        company = data.get('company') if isinstance(data.get('company'), dict) else {}
+        return cls(
+            first_name=_text(person.get('firstName')),
+            last_name=_text(person.get('lastName')),
+            headline=_text(person.get('headline')),
+            location=_location(person.get('location')),
+            summary=_text(person.get('summary')),
+            linkedin_url=_text(person.get('linkedInUrl')),
+            photo_url=_text(person.get('photoUrl')),
+            background_url=_text(person.get('backgroundUrl')),
+            follower_count=person.get('followerCount') if isinstance(person.get('followerCount'), int) else None,
+            positions=[Position.from_scrapin(record) for record in _records(person.get('positions'), 'positionHistory')],
+            schools=[School.from_scrapin(record) for record in _records(person.get('schools'), 'educationHistory')],
+            skills=[skill for skill in person.get('skills') or [] if isinstance(skill, str)],
+            company_name=_text(company.get('name')),
+            company_logo_url=_text(company.get('logo')),
+            company_banner_url=_text(company.get('backgroundUrl')),
+        )
+
+    @classmethod
+    def coerce(cls, data: Union["Profile", Dict[str, Any], None]) -> "Profile":
+        """Pass a Profile through unchanged; parse anything else as a response."""
+        return data if isinstance(data, cls) else cls.from_response(data)
+
+    @property
+    def full_name(self) -> Optional[str]:
+        return ' '.join(filter(None, [self.first_name, self.last_name])) or None
+
+    @property
+    def current_position(self) -> Optional[Position]:
+        return self.positions[0] if self.positions else None
+
+    def image_urls(self) -> Dict[str, Any]:
+        """
+        Every image URL on the profile. The company's banner stands in for a missing
+        personal banner, and its logo for a current position without one.
+        """
+        company_logos = list(dict.fromkeys(position.company_logo for position in self.positions if position.company_logo))
+        current = self.current_position
+        primary_company_logo = current.company_logo if current else None
+        return {
+            'profile_picture_url': self.photo_url,
+            'banner_url': self.background_url or self.company_banner_url,
+            'company_logo_url': primary_company_logo or self.company_logo_url,
+            'company_banner_url': self.company_banner_url,
+            'school_logo_url': self.schools[0].logo if self.schools else None,
+            'all_company_logos': company_logos,
+            'primary_company_logo': primary_company_logo,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
@@ -0,0 +1,179 @@
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from third_parties.profile_shapes import detect_provider
+
+# Declarative projection rules per provider: which fields of a scraped profile reach
+# the summarization prompt, and how much of each. Each rule renders one line (or one
+# block for lists of records):
+#   label      - line label in the compact text
+#   path       - dotted path into the response; "paths" joins several values with
+#                "separator" (default a space)
+#   item       - for lists of records, the fields shown per record; a nested list of
+#                paths renders as a range (e.g. start-end dates)
+#   limit      - max list entries kept
+#   max_chars  - max characters per value (long descriptions are cut)
+PROJECTIONS = {
+    "scrapin": [
+        {"label": "Name", "paths": ["person.firstName", "person.lastName"]},
+        {"label": "Headline", "path": "person.headline"},
+        {"label": "Location", "path": "person.location"},
+        {"label": "LinkedIn", "path": "person.linkedInUrl"},
+        {"label": "Picture URL", "path": "person.photoUrl"},
+        {"label": "Banner URL", "path": "person.backgroundUrl"},
+        {"label": "About", "path": "person.summary", "max_chars": 600},
+        {"label": "Experience", "path": "person.positions.positionHistory", "limit": 6, "max_chars": 200,
+         "item": ["title", "companyName", "companyLocation", "startEndDate", "description"]},
+        {"label": "Education", "path": "person.schools.educationHistory", "limit": 4,
+         "item": ["degreeName", "fieldOfStudy", "schoolName", "startEndDate"]},
+        {"label": "Certifications", "path": "person.certifications.certificationHistory", "limit": 5,
+         "item": ["name", "organizationName", "issuedDate"]},
+        {"label": "Skills", "path": "person.skills", "limit": 30},
+        {"label": "Current company", "path": "company.name"},
+        {"label": "Company industry", "path": "company.industry"},
+        {"label": "Company website", "path": "company.websiteUrl"},
+    ],
+    "proxycurl": [
+        {"label": "Name", "path": "full_name"},
+        {"label": "Headline", "path": "headline"},
+        {"label": "Location", "paths": ["city", "state", "country_full_name"], "separator": ", "},
+        {"label": "LinkedIn id", "path": "public_identifier"},
+        {"label": "Picture URL", "path": "profile_pic_url"},
+        {"label": "Banner URL", "path": "background_cover_image_url"},
+        {"label": "About", "path": "summary", "max_chars": 600},
+        {"label": "Experience", "path": "experiences", "limit": 6, "max_chars": 200,
+         "item": ["title", "company", "location", ["starts_at", "ends_at"], "description"]},
+        {"label": "Education", "path": "education", "limit": 4,
+         "item": ["degree_name", "field_of_study", "school", ["starts_at", "ends_at"]]},
+        {"label": "Certifications", "path": "certifications", "limit": 5,
+         "item": ["name", "authority"]},
+        {"label": "Skills", "path": "skills", "limit": 30},
+        {"label": "Personal emails", "path": "personal_emails"},
+        {"label": "Phone numbers", "path": "personal_numbers"},
+    ],
+}
+
+_WHITESPACE = re.compile(r'\s+')
+_encoding = None
+
+
+def _lookup(data: Any, path: str) -> Any:
+    for part in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _format_date(value: Dict[str, Any]) -> str:
+    year, month = value.get('year'), value.get('month')
+    if not year:
+        return ''
+    return f"{year}-{month:02d}" if isinstance(month, int) else str(year)
+
+
+def _format_value(value: Any, max_chars: Optional[int] = None) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        if 'year' in value:
+            return _format_date(value)
+        if 'start' in value or 'end' in value:
+            start = _format_date(value.get('start') or {})
+            return f"{start}–{_format_date(value['end']) if value.get('end') else 'present'}" if start else ''
+        return ''
+    if isinstance(value, list):
+        return ', '.join(filter(None, (_format_value(item) for item in value)))
+
+    text = _WHITESPACE.sub(' ', str(value)).strip()
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars].rstrip() + '…'
+    return text
+
+
+def _format_item(record: Dict[str, Any], fields: List[Any], max_chars: Optional[int]) -> str:
+    parts = []
+    for field in fields:
+        if isinstance(field, list):
+            # Range of two paths, e.g. starts_at/ends_at
+            start, end = (_format_value(_lookup(record, path)) for path in field)
+            part = f"{start}–{end or 'present'}" if start else ''
+        else:
+            part = _format_value(_lookup(record, field), max_chars)
+        if part:
+            parts.append(part)
+    return ' | '.join(parts)
+
+
+def project_profile(data: Dict[str, Any], provider: Optional[str] = None,
+                    rules: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Render a scraped profile as compact text holding only the fields the summary uses.
+
+    Uses PROJECTIONS for the provider (detected from the response shape if not given)
+    unless explicit rules are passed.
+    """
+    rules = rules if rules is not None else PROJECTIONS[provider or detect_provider(data)]
+    lines = []
+    for rule in rules:
+        max_chars = rule.get('max_chars')
+        if 'paths' in rule:
+            values = (_format_value(_lookup(data, path), max_chars) for path in rule['paths'])
+            value = rule.get('separator', ' ').join(filter(None, values))
+            if value:
+                lines.append(f"{rule['label']}: {value}")
+            continue
+
+        value = _lookup(data, rule['path'])
+        if isinstance(value, list):
+            value = value[:rule['limit']] if 'limit' in rule else value
+            if 'item' in rule:
+                items = [_format_item(record, rule['item'], max_chars) for record in value if isinstance(record, dict)]
+                items = [item for item in items if item]
+                if items:
+                    lines.append(f"{rule['label']}:")
+                    lines.extend(f"- {item}" for item in items)
+                continue
+
+        text = _format_value(value, max_chars)
+        if text:
+            lines.append(f"{rule['label']}: {text}")
+    return '\n'.join(lines)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of text: tiktoken's cl100k_base if available, else ~4 characters per token.
+
+    Either way it is an estimate for Gemini, which tokenizes differently, but it is
+    consistent enough to compare prompt sizes.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # Not installed, or its encoding file can't be downloaded (e.g. offline)
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def projection_report(data: Dict[str, Any], projected: str) -> Dict[str, Any]:
+    """Prompt tokens for the raw profile (as it used to be interpolated) vs its projection."""
+    before = count_tokens(str(data))
+    after = count_tokens(projected)
+    return {
+        'before_tokens': before,
+        'after_tokens': after,
+        'saved_ratio': 1 - after / before if before else 0.0,
+        'tokenizer': 'tiktoken' if _encoding else 'chars/4',
+    }
+
+
+def projection_enabled() -> bool:
+    """Projection can be switched off (PROFILE_PROJECTION=0) to send the raw profile."""
+    return os.getenv("PROFILE_PROJECTION", "1").lower() not in ("0", "false", "off")
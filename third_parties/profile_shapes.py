@@ -0,0 +1,147 @@
+from typing import Any, Dict, Optional
+
+# Scrapin's response shape is the one the rest of the app reads (person.firstName,
+# person.photoUrl, person.positions.positionHistory, ...). Proxycurl responses are
+# converted to it so either provider can serve any caller.
+
+
+def detect_provider(data: Dict[str, Any]) -> str:
+    """Which provider's response shape a scraped profile has."""
+    if isinstance(data, dict) and 'person' in data:
+        return "scrapin"
+    return "proxycurl"
+
+
+def _scrapin_date(date: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not date or not date.get('year'):
+        return None
+    return {key: date[key] for key in ('month', 'year') if date.get(key)}
+
+
+def _proxycurl_date(date: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not date:
+        return None
+    return {'day': 1, 'month': date.get('month', 1), 'year': date.get('year')}
+
+
+def _start_end(record: Dict[str, Any]) -> Dict[str, Any]:
+    start_end = {}
+    if _scrapin_date(record.get('starts_at')):
+        start_end['start'] = _scrapin_date(record.get('starts_at'))
+    if _scrapin_date(record.get('ends_at')):
+        start_end['end'] = _scrapin_date(record.get('ends_at'))
+    return start_end
+
+
+def proxycurl_to_scrapin(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape a Proxycurl profile response into Scrapin's shape."""
+    public_identifier = data.get('public_identifier')
+    location = ', '.join(filter(None, [data.get('city'), data.get('state'), data.get('country_full_name')]))
+    experiences = data.get('experiences') or []
+    education = data.get('education') or []
+    certifications = data.get('certifications') or []
+
+    person = {
+        'publicIdentifier': public_identifier,
+        'linkedInUrl': f"https://www.linkedin.com/in/{public_identifier}" if public_identifier else None,
+        'firstName': data.get('first_name'),
+        'lastName': data.get('last_name'),
+        'headline': data.get('headline'),
+        'location': location or None,
+        'summary': data.get('summary'),
+        'photoUrl': data.get('profile_pic_url'),
+        'backgroundUrl': data.get('background_cover_image_url'),
+        'followerCount': data.get('follower_count'),
+        'positions': {
+            'positionsCount': len(experiences),
+            'positionHistory': [
+                {
+                    'title': experience.get('title'),
+                    'companyName': experience.get('company'),
+                    'companyLocation': experience.get('location'),
+                    'description': experience.get('description'),
+                    'startEndDate': _start_end(experience),
+                    'companyLogo': experience.get('logo_url'),
+                    'linkedInUrl': experience.get('company_linkedin_profile_url'),
+                }
+                for experience in experiences
+            ],
+        },
+        'schools': {
+            'educationsCount': len(education),
+            'educationHistory': [
+                {
+                    'schoolName': school.get('school'),
+                    'degreeName': school.get('degree_name'),
+                    'fieldOfStudy': school.get('field_of_study'),
+                    'startEndDate': _start_end(school),
+                    'schoolLogo': school.get('logo_url'),
+                    'linkedInUrl': school.get('school_linkedin_profile_url'),
+                }
+                for school in education
+            ],
+        },
+        'certifications': {
+            'certificationsCount': len(certifications),
+            'certificationHistory': [
+                {'name': certification.get('name'), 'organizationName': certification.get('authority')}
+                for certification in certifications
+            ],
+        },
+        'skills': data.get('skills') or [],
+    }
+    result = {'success': True, 'person': person}
+    if experiences and experiences[0].get('company'):
+        result['company'] = {'name': experiences[0].get('company'), 'logo': experiences[0].get('logo_url')}
+    return result
+
+
+def scrapin_to_proxycurl(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape a Scrapin response into the fields Proxycurl returns for the same profile."""
+    person = data.get('person', {})
+    location = person.get('location') or ''
+    location_parts = [part.strip() for part in location.split(',')] if isinstance(location, str) else []
+    return {
+        'public_identifier': person.get('publicIdentifier'),
+        'profile_pic_url': person.get('photoUrl'),
+        'background_cover_image_url': person.get('backgroundUrl'),
+        'follower_count': person.get('followerCount'),
+        'first_name': person.get('firstName'),
+        'last_name': person.get('lastName'),
+        'full_name': ' '.join(filter(None, [person.get('firstName'), person.get('lastName')])),
+        'headline': person.get('headline'),
+        'summary': person.get('summary'),
+        'city': location_parts[0] if location_parts else None,
+        'country_full_name': location_parts[-1] if len(location_parts) > 1 else None,
+        'experiences': [
+            {
+                'title': position.get('title'),
+                'company': position.get('companyName'),
+                'location': position.get('companyLocation'),
+                'description': position.get('description'),
+                'logo_url': position.get('companyLogo'),
+                'starts_at': _proxycurl_date(position.get('startEndDate', {}).get('start')),
+                'ends_at': _proxycurl_date(position.get('startEndDate', {}).get('end')),
+            }
+            for position in person.get('positions', {}).get('positionHistory', [])
+        ],
+        'education': [
+            {
+                'school': school.get('schoolName'),
+                'degree_name': school.get('degreeName'),
+                'field_of_study': school.get('fieldOfStudy'),
+                'logo_url': school.get('schoolLogo'),
+                'starts_at': _proxycurl_date(school.get('startEndDate', {}).get('start')),
+                'ends_at': _proxycurl_date(school.get('startEndDate', {}).get('end')),
+            }
+            for school in person.get('schools', {}).get('educationHistory', [])
+        ],
+        'skills': person.get('skills', []),
+    }
+
+
+def normalize_profile_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Any provider's response in Scrapin's shape."""
+    if detect_provider(data) == "proxycurl":
+        return proxycurl_to_scrapin(data)
+    return data
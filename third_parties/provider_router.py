@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Hedge once the primary has been slower than this percentile of its recent latencies
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 95))
+# Hedge delay used until a provider has enough latency samples
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", 2.0))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", 0.05))
+HEDGE_MIN_SAMPLES = 5
+
+
+class LatencyTracker:
+    """Sliding window of recent successful request latencies per provider."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, deque] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(provider, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, provider: str, percentile: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            providers = list(self._samples)
+        return {
+            provider: {
+                'samples': len(self._samples[provider]),
+                'p50_ms': (self.percentile(provider, 50) or 0) * 1000,
+                'p95_ms': (self.percentile(provider, 95) or 0) * 1000,
+            }
+            for provider in providers
+        }
+
+
+class ProviderRouter:
+    """
+    Runs a request against a primary provider, hedging and failing over to the others.
+
+    - hedge: if the primary hasn't answered within its latency percentile, the next
+      provider is tried too and whichever succeeds first wins
+    - failover: if every running attempt has failed, the next provider is tried
+    Losing attempts are cancelled if they haven't started; ones already in flight
+    can't be interrupted, so they finish in the background and are ignored.
+    """
+
+    def __init__(self, percentile: float = HEDGE_PERCENTILE, max_workers: int = 32):
+        self.percentile = percentile
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider-router")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.failovers = 0
+        self.wins = {}
+
+    def hedge_delay(self, provider: str) -> float:
+        delay = self.latency.percentile(provider, self.percentile)
+        return HEDGE_DEFAULT_DELAY if delay is None else max(HEDGE_MIN_DELAY, delay)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def call(self, attempts: List[Tuple[str, Callable[[], Any]]]) -> Tuple[str, Any]:
+        """
+        Run (provider, function) attempts in priority order; return (provider, result)
+        of the first to succeed, or raise the primary's error if all of them fail
+        (chained to the other providers' errors, in priority order).
+        """
+        self._count('requests')
+        pending = {}
+        errors = {}
+        remaining = list(attempts)
+
+        def launch():
+            provider, function = remaining.pop(0)
+            pending[self._executor.submit(function)] = provider
+            return provider
+
+        newest = launch()
+        while pending:
+            timeout = self.hedge_delay(newest) if remaining else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                self._count('hedges')
+                newest = launch()
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    with self._lock:
+                        self.wins[provider] = self.wins.get(provider, 0) + 1
+                    return provider, future.result()
+                errors[provider] = future.exception()
+
+            if not pending and remaining:
+                self._count('failovers')
+                newest = launch()
+
+        # Errors arrive in completion order; report them in priority order
+        failures = [errors[provider] for provider, _ in attempts if provider in errors]
+        for error, next_error in zip(failures, failures[1:]):
+            if error.__cause__ is None:
+                error.__cause__ = next_error
+        raise failures[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges': self.hedges,
+                'failovers': self.failovers,
+                'wins': dict(self.wins),
+                'latency': self.latency.stats(),
+            }
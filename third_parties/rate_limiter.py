@@ -0,0 +1,152 @@
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+
+class QuotaExhaustedError(Exception):
+    """The provider reports no credits left, and a recheck confirmed it."""
+
+
+def _to_number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaAwareRateLimiter:
+    """
+    Token bucket shared by every caller of one API, adapted to the quota the API reports.
+
+    acquire() blocks until a request may be sent, so bursts queue up instead of
+    tripping 429s. After each response, update() reads the remaining quota from the
+    body (rate_limit_left / credits_left) and headers (X-RateLimit-*, Retry-After):
+    - below low_water remaining requests the rate is scaled down towards min_rate
+    - with a known reset time, the remaining requests are spread over the window
+    - Retry-After pauses everyone until it has passed
+    - zero credits left queues callers; every exhausted_recheck seconds one request
+      goes through as a probe, and if credits were topped up everyone resumes. Callers
+      only get QuotaExhaustedError once a report made after they queued still says zero.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1, low_water: int = 20, min_rate: float = 0.05,
+                 exhausted_recheck: float = 60.0):
+        self.base_rate = rate_per_second
+        self.burst = max(1, burst)
+        self.low_water = low_water
+        self.min_rate = min_rate
+        self.exhausted_recheck = exhausted_recheck
+        self._rate = rate_per_second
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._rate_limit_left = None
+        self._credits_left = None
+        # When the next probe may go out while credits are exhausted, and how many
+        # zero-credit reports have come in (so queued callers can tell a fresh one)
+        self._recheck_at = 0.0
+        self._exhausted_reports = 0
+        self._waiting = 0
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a request may be sent. Returns False if timeout passes first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._waiting += 1
+            reports_seen = self._exhausted_reports
+            probe = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    if not probe and self._credits_left is not None and self._credits_left <= 0:
+                        if self._exhausted_reports > reports_seen:
+                            raise QuotaExhaustedError("API credits exhausted (credits_left = 0)")
+                        if now >= self._recheck_at:
+                            # Send one request to see whether credits were topped up; the rest
+                            # wait for its report (or the next recheck, if it never reports)
+                            self._recheck_at = now + self.exhausted_recheck
+                            probe = True
+                        else:
+                            wait = self._recheck_at - now
+                            if deadline is not None:
+                                if now >= deadline:
+                                    return False
+                                wait = min(wait, deadline - now)
+                            self._condition.wait(wait)
+                            continue
+
+                    self._refill(now)
+                    if now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+
+                    wait = max(self._paused_until - now, (1 - self._tokens) / self._rate)
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                self._waiting -= 1
+
+    def update(self, headers: Optional[Mapping[str, str]] = None, body: Any = None):
+        """Adapt to the quota reported by a response's headers and JSON body."""
+        headers = headers or {}
+        body = body if isinstance(body, dict) else {}
+
+        remaining = _to_number(body.get('rate_limit_left'))
+        if remaining is None:
+            remaining = _to_number(headers.get('X-RateLimit-Remaining'))
+        credits_left = _to_number(body.get('credits_left'))
+        reset_seconds = _to_number(headers.get('X-RateLimit-Reset'))
+        retry_after = _to_number(headers.get('Retry-After'))
+
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            if credits_left is not None:
+                self._credits_left = credits_left
+                if credits_left <= 0:
+                    self._exhausted_reports += 1
+                    self._recheck_at = now + self.exhausted_recheck
+            if remaining is not None:
+                self._rate_limit_left = remaining
+
+            rate = self.base_rate
+            if self._rate_limit_left is not None:
+                if self._rate_limit_left < self.low_water:
+                    rate *= self._rate_limit_left / self.low_water
+                if reset_seconds and reset_seconds > 0:
+                    # Reset is either seconds-until-reset or an epoch timestamp
+                    if reset_seconds > 10 ** 9:
+                        reset_seconds = max(1.0, reset_seconds - time.time())
+                    rate = min(rate, self._rate_limit_left / reset_seconds)
+            self._rate = max(self.min_rate, rate)
+
+            if retry_after is not None and retry_after > 0:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._condition.notify_all()
+
+    def budget(self) -> Dict[str, Any]:
+        """The limiter's current view of the quota."""
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'rate_per_second': self._rate,
+                'base_rate_per_second': self.base_rate,
+                'tokens': self._tokens,
+                'rate_limit_left': self._rate_limit_left,
+                'credits_left': self._credits_left,
+                'recheck_in_seconds': (
+                    max(0.0, self._recheck_at - now)
+                    if self._credits_left is not None and self._credits_left <= 0 else None
+                ),
+                'paused_for_seconds': max(0.0, self._paused_until - now),
+                'waiting': self._waiting,
+            }
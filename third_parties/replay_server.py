@@ -0,0 +1,126 @@
+"""
+Local HTTP server that replays the bundled fixture profiles as Scrapin and Proxycurl.
+
+Point the scraper at it for offline development and load testing:
+
+    python -m third_parties.replay_server --port 8765 --latency-ms 300 --jitter-ms 100
+    SCRAPIN_BASE_URL=http://127.0.0.1:8765 PROXYCURL_BASE_URL=http://127.0.0.1:8765 python conversation_parser.py
+
+Endpoints:
+    GET /enrichment/profile?linkedInUrl=...   Scrapin response shape
+    GET /api/v2/linkedin?url=...              Proxycurl response shape
+
+Profiles are matched by the identifier in the requested URL; unknown profiles get
+a 404 (or the default fixture with --fallback-default).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from third_parties.mock_profiles import find_mock_profile, list_mock_profiles, load_mock_profile
+from third_parties.profile_shapes import scrapin_to_proxycurl
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms: float = 0, jitter_ms: float = 0,
+                 fallback_default: bool = False, credits: int = 10000,
+                 provider_latency_ms: Optional[Dict[str, float]] = None):
+        super().__init__(address, ReplayHandler)
+        self.latency_ms = latency_ms
+        # Per-provider overrides of latency_ms, e.g. {'scrapin': 800} to exercise hedging
+        self.provider_latency_ms = provider_latency_ms or {}
+        self.jitter_ms = jitter_ms
+        self.fallback_default = fallback_default
+        self.credits_left = credits
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def spend_credit(self) -> int:
+        with self._lock:
+            self.requests_served += 1
+            self.credits_left = max(0, self.credits_left - 1)
+            return self.credits_left
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path == '/enrichment/profile':
+            profile_url, shape = query.get('linkedInUrl', [''])[0], 'scrapin'
+        elif parsed.path.endswith('/api/v2/linkedin'):
+            profile_url, shape = query.get('url', [''])[0], 'proxycurl'
+        elif parsed.path == '/health':
+            return self._send_json(200, {'status': 'ok', 'profiles': list_mock_profiles()})
+        else:
+            return self._send_json(404, {'error': f'Unknown endpoint {parsed.path}'})
+
+        latency_ms = server.provider_latency_ms.get(shape, server.latency_ms)
+        delay = latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        data = find_mock_profile(profile_url) if profile_url else None
+        if data is None and server.fallback_default:
+            data = load_mock_profile()
+        if data is None:
+            return self._send_json(404, {'success': False, 'error': 'Profile not found'})
+
+        credits_left = server.spend_credit()
+        if shape == 'proxycurl':
+            return self._send_json(200, scrapin_to_proxycurl(data))
+        data['credits_left'] = credits_left
+        return self._send_json(200, data)
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_replay_server(host: str = "127.0.0.1", port: int = 0, **options) -> ReplayServer:
+    """Start a replay server on a background thread (port 0 picks a free port)."""
+    server = ReplayServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay bundled LinkedIn profiles as Scrapin/Proxycurl")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- variation on the delay")
+    parser.add_argument("--fallback-default", action="store_true", help="Serve the default profile for unknown URLs")
+    args = parser.parse_args()
+
+    server = ReplayServer((args.host, args.port), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          fallback_default=args.fallback_default)
+    print(f"🎭 Replaying {len(list_mock_profiles())} profiles at {server.base_url}")
+    print(f"   SCRAPIN_BASE_URL={server.base_url} PROXYCURL_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Replay server stopped")
@@ -0,0 +1,157 @@
+"""
+Persistent cache of resolved LinkedIn lookups: search query -> profile URL.
+
+Written by linkedin_lookup_agent.lookup once it has settled on an answer, and
+read by it and the get_profile_url_tavily tool, so a person mentioned across many
+conversations is only resolved once per TTL. Queries that resolved to nothing are
+remembered too, for a shorter TTL.
+
+Inspect and evict entries with:
+
+    python -m tools.lookup_cache list [--all] [--limit N]
+    python -m tools.lookup_cache show "Matt software engineer Nickel5"
+    python -m tools.lookup_cache evict "Matt software engineer Nickel5" [...]
+    python -m tools.lookup_cache evict --not-found
+    python -m tools.lookup_cache purge-expired
+    python -m tools.lookup_cache clear
+    python -m tools.lookup_cache stats
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import Optional, Tuple
+
+from utils.disk_cache import DiskTTLCache, HIT, NOT_FOUND
+
+LOOKUP_CACHE_PATH = os.getenv("LOOKUP_CACHE_PATH", os.path.join(".cache", "linkedin_lookups.sqlite3"))
+# LOOKUP_CACHE_TTL=0 disables the cache
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", 30 * 24 * 3600))
+LOOKUP_CACHE_NOT_FOUND_TTL = float(os.getenv("LOOKUP_CACHE_NOT_FOUND_TTL", 24 * 3600))
+LOOKUP_CACHE_MAX_BYTES = int(float(os.getenv("LOOKUP_CACHE_MAX_MB", 16)) * 1024 * 1024)
+
+# Words that don't change who a query resolves to
+_IGNORED_WORDS = {'linkedin'}
+
+_lookup_cache = None
+
+
+def lookup_cache_key(query: str) -> str:
+    """
+    Cache key for a query: case, whitespace and word order folded and "linkedin"
+    dropped, so "Matt Nickel5 LinkedIn" and "nickel5  matt" share an entry.
+    """
+    return ' '.join(sorted(word for word in query.lower().split() if word not in _IGNORED_WORDS))
+
+
+def get_lookup_cache() -> Optional[DiskTTLCache]:
+    """The shared lookup cache, opened on first use; None when caching is disabled."""
+    global _lookup_cache
+    if LOOKUP_CACHE_TTL <= 0:
+        return None
+    if _lookup_cache is None:
+        _lookup_cache = DiskTTLCache(
+            LOOKUP_CACHE_PATH,
+            ttl_seconds=LOOKUP_CACHE_TTL,
+            not_found_ttl_seconds=LOOKUP_CACHE_NOT_FOUND_TTL,
+            max_bytes=LOOKUP_CACHE_MAX_BYTES,
+        )
+    return _lookup_cache
+
+
+def get_cached_lookup(query: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Cached resolution of a query.
+
+    Returns (HIT, url), (NOT_FOUND, None) when the query recently resolved to
+    nothing, or (None, None) on a miss.
+    """
+    cache = get_lookup_cache()
+    if cache is None:
+        return None, None
+    kind, value = cache.get(lookup_cache_key(query))
+    if kind == HIT:
+        return HIT, value['url']
+    return kind, None
+
+
+def cache_lookup(query: str, url: str):
+    """Remember that query resolved to url."""
+    cache = get_lookup_cache()
+    if cache is not None:
+        cache.set(lookup_cache_key(query), {'url': url, 'query': query})
+
+
+def cache_lookup_not_found(query: str):
+    """Remember that query resolved to no profile."""
+    cache = get_lookup_cache()
+    if cache is not None:
+        cache.set_not_found(lookup_cache_key(query))
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def _print_entry(entry: dict):
+    status = 'expired' if entry['expired'] else ('not found' if entry['kind'] == NOT_FOUND else 'hit')
+    url = entry['value']['url'] if entry['value'] else '-'
+    print(f"{entry['key']!r:<45} {status:<9} {url}")
+    print(f"{'':<45} stored {_format_time(entry['stored_at'])}, expires {_format_time(entry['expires_at'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and evict cached LinkedIn lookups")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="List cached lookups, newest first")
+    list_parser.add_argument("--all", action="store_true", help="Include expired entries")
+    list_parser.add_argument("--limit", type=int, default=50)
+    show_parser = commands.add_parser("show", help="Show what a query resolves to from the cache")
+    show_parser.add_argument("query")
+    evict_parser = commands.add_parser("evict", help="Evict cached lookups")
+    evict_parser.add_argument("queries", nargs="*", help="Queries to evict (any case/word order)")
+    evict_parser.add_argument("--not-found", action="store_true", help="Evict every negative entry")
+    commands.add_parser("purge-expired", help="Delete expired entries")
+    commands.add_parser("clear", help="Delete every entry")
+    commands.add_parser("stats", help="Entry counts and size")
+    args = parser.parse_args(argv)
+
+    cache = get_lookup_cache()
+    if cache is None:
+        print("⚠️ Lookup cache is disabled (LOOKUP_CACHE_TTL <= 0)")
+        return 1
+
+    if args.command == "list":
+        entries = cache.entries(include_expired=args.all, limit=args.limit)
+        for entry in entries:
+            _print_entry(entry)
+        print(f"📋 {len(entries)} entries in {LOOKUP_CACHE_PATH}")
+    elif args.command == "show":
+        key = lookup_cache_key(args.query)
+        matches = [entry for entry in cache.entries(include_expired=True) if entry['key'] == key]
+        if not matches:
+            print(f"❌ {key!r} is not cached")
+            return 1
+        _print_entry(matches[0])
+    elif args.command == "evict":
+        if not args.queries and not args.not_found:
+            parser.error("evict needs queries or --not-found")
+        evicted = sum(cache.delete(lookup_cache_key(query)) for query in args.queries)
+        if args.not_found:
+            for entry in cache.entries(include_expired=True):
+                if entry['kind'] == NOT_FOUND:
+                    evicted += cache.delete(entry['key'])
+        print(f"🗑️ Evicted {evicted} entries")
+    elif args.command == "purge-expired":
+        print(f"🗑️ Purged {cache.purge_expired()} expired entries")
+    elif args.command == "clear":
+        cache.clear()
+        print("🗑️ Cleared the lookup cache")
+    elif args.command == "stats":
+        for name, value in cache.stats().items():
+            print(f"{name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import unquote, urlparse
+
+# Scores LinkedIn search candidates against a lookup query, so a clear match can be
+# returned without asking the agent. Queries look like "Matt software engineer
+# Nickel5": a name followed by job/company context, in no fixed order after the name.
+
+# Accept the best candidate at or above this score...
+FAST_PATH_THRESHOLD = float(os.getenv("LOOKUP_FAST_PATH_THRESHOLD", 0.75))
+# ...and only if it beats the runner-up by at least this much
+FAST_PATH_MARGIN = float(os.getenv("LOOKUP_FAST_PATH_MARGIN", 0.15))
+
+COVERAGE_WEIGHT = 0.7
+NAME_WEIGHT = 0.3
+
+# Query words that say nothing about who the person is
+STOPWORDS = {'a', 'an', 'and', 'at', 'for', 'from', 'in', 'linkedin', 'of', 'on', 'profile', 'the', 'with'}
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+# Title is usually "First Last - Job Title - Company | LinkedIn"
+_TITLE_NAME_END = re.compile(r'\s+[-–—|]\s+|,')
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _matches(token: str, words: Set[str]) -> bool:
+    # Prefix matching lets "matt" match "matthew" (and the reverse)
+    if token in words:
+        return True
+    return len(token) >= 3 and any(
+        len(word) >= 3 and (word.startswith(token) or token.startswith(word)) for word in words
+    )
+
+
+def _slug_tokens(url: str) -> List[str]:
+    slug = unquote(urlparse(url).path.split('/in/', 1)[-1].strip('/'))
+    # Drop LinkedIn's disambiguation suffixes such as "-2aab578" or "-123"
+    return [token for token in tokenize(slug.replace('-', ' ')) if token.isalpha()]
+
+
+def _candidate_name_tokens(candidate: Dict[str, str]) -> List[str]:
+    title = candidate.get('title') or ''
+    name_tokens = tokenize(_TITLE_NAME_END.split(title, 1)[0]) if title else []
+    return name_tokens or _slug_tokens(candidate['url'])
+
+
+def _name_words(candidate: Dict[str, str], name_tokens: List[str]) -> Set[str]:
+    return set(name_tokens) | set(_slug_tokens(candidate['url']))
+
+
+def _text_words(candidate: Dict[str, str]) -> Set[str]:
+    return set(tokenize(f"{candidate.get('title', '')} {candidate.get('content', '')}"))
+
+
+def score_candidate(query: str, candidate: Dict[str, str]) -> float:
+    """
+    How well a search candidate ({'url', 'title', 'content'}) matches the query, 0-1.
+
+    Mostly the share of query words (name, job, company, school...) found in the
+    candidate's name, URL, title or snippet, plus the share of the candidate's name
+    found in the query. A candidate whose name doesn't include the query's first
+    word scores 0.
+    """
+    query_tokens = tokenize(query)
+    name_tokens = _candidate_name_tokens(candidate)
+    if not query_tokens or not name_tokens:
+        return 0.0
+
+    name_words = _name_words(candidate, name_tokens)
+    if not _matches(query_tokens[0], name_words):
+        return 0.0
+
+    candidate_words = name_words | _text_words(candidate)
+    coverage = sum(_matches(token, candidate_words) for token in query_tokens) / len(query_tokens)
+
+    query_words = set(query_tokens)
+    name_score = sum(_matches(token, query_words) for token in name_tokens) / len(name_tokens)
+
+    return COVERAGE_WEIGHT * coverage + NAME_WEIGHT * name_score
+
+
+def context_matches(query: str, candidate: Dict[str, str]) -> bool:
+    """
+    Whether a query word other than the candidate's name - a company, title,
+    school... - appears in the candidate's title or snippet. Name-only queries
+    have nothing to check against, so never match.
+    """
+    # The title's name only: URL slugs sometimes carry the company ("john-smith-google")
+    name_words = set(_candidate_name_tokens(candidate))
+    context_tokens = [token for token in tokenize(query) if not _matches(token, name_words)]
+    text_words = _text_words(candidate) - name_words
+    return any(_matches(token, text_words) for token in context_tokens)
+
+
+def rank_candidates(query: str, candidates: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Candidates best first, one per URL (its best score), each with its 'score'."""
+    best = {}
+    for candidate in candidates:
+        score = score_candidate(query, candidate)
+        key = candidate['url'].split('?')[0].rstrip('/').lower()
+        if key not in best or score > best[key]['score']:
+            best[key] = {**candidate, 'score': score}
+    return sorted(best.values(), key=lambda candidate: candidate['score'], reverse=True)
+
+
+def confident_match(query: str, candidates: List[Dict[str, str]],
+                    threshold: float = None, margin: float = None) -> Optional[Dict[str, Any]]:
+    """
+    The best candidate if it clears the threshold and the runner-up by the margin,
+    and some of the query's context (not just the name) shows up in it, else None.
+    """
+    threshold = FAST_PATH_THRESHOLD if threshold is None else threshold
+    margin = FAST_PATH_MARGIN if margin is None else margin
+    ranked = rank_candidates(query, candidates)
+    if not ranked or ranked[0]['score'] < threshold:
+        return None
+    if len(ranked) > 1 and ranked[0]['score'] - ranked[1]['score'] < margin:
+        return None
+    # The right name alone is not enough: "John Smith Google" must not settle on
+    # "John Smith - Accountant - Microsoft" just because no other John Smith came back
+    if not context_matches(query, ranked[0]):
+        return None
+    return ranked[0]
@@ -1,7 +1,109 @@
 from langchain_tavily import TavilySearch
 import os
+import re
+from typing import Any, Dict, List, Optional
 import docx
 
+from tools.lookup_cache import HIT, get_cached_lookup
+
+def normalize_search_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query, for use as a dedup/cache key."""
+    return ' '.join(query.lower().split())
+
+# LinkedIn profile URLs, up to the first character that can't be part of one
+LINKEDIN_PROFILE_URL_PATTERN = re.compile(r'https?://(?:www\.)?linkedin\.com/in/[^\s\)\]<>"\']+')
+
+def _tavily_query(name: str) -> str:
+    # Use the search query exactly as provided - don't modify it
+    print(f"🔍 Tavily searching for: '{name}'")
+    
+    # Add "linkedin" to the search query if not already present
+    if "linkedin" not in name.lower():
+        return f"{name} linkedin"
+    return name
+
+def _tavily_search(name: str) -> Any:
+    search = TavilySearch(api_key=os.environ.get("TAVILY_API_KEY"))
+    return search.run(_tavily_query(name))
+
+async def _atavily_search(name: str) -> Any:
+    search = TavilySearch(api_key=os.environ.get("TAVILY_API_KEY"))
+    return await search.arun(_tavily_query(name))
+
+def extract_linkedin_candidates(results: Any) -> List[Dict[str, str]]:
+    """
+    LinkedIn profile URLs in Tavily search results, in result order, each with the
+    title and content of the result it came from.
+    
+    Result URLs are preferred; URLs mentioned in result text are only used when no
+    result links to a profile directly.
+    """
+    # Handle different result formats from Tavily: a dict with 'results', a list of results or a string
+    if isinstance(results, dict) and 'results' in results:
+        results_list = results['results']
+    elif isinstance(results, list):
+        results_list = results
+    elif isinstance(results, str):
+        return [
+            {'url': url.rstrip('.,;)'), 'title': '', 'content': ''}
+            for url in LINKEDIN_PROFILE_URL_PATTERN.findall(results)
+        ]
+    else:
+        return []
+    
+    results_list = [result for result in results_list if isinstance(result, dict)]
+    candidates = [
+        {'url': result['url'].rstrip('.,;)'), 'title': result.get('title', ''), 'content': result.get('content', '')}
+        for result in results_list if 'linkedin.com/in/' in result.get('url', '')
+    ]
+    if candidates:
+        return candidates
+    
+    for result in results_list:
+        text = result.get('content', '') + ' ' + result.get('title', '')
+        for url in LINKEDIN_PROFILE_URL_PATTERN.findall(text):
+            candidates.append({'url': url.rstrip('.,;)'), 'title': result.get('title', ''), 'content': result.get('content', '')})
+    return candidates
+
+def search_linkedin_candidates(name: str) -> List[Dict[str, str]]:
+    """Run one Tavily search and return its LinkedIn profile candidates (see extract_linkedin_candidates)."""
+    results = _tavily_search(name)
+    return extract_linkedin_candidates(results) if results else []
+
+async def asearch_linkedin_candidates(name: str) -> List[Dict[str, str]]:
+    """Async search_linkedin_candidates."""
+    results = await _atavily_search(name)
+    return extract_linkedin_candidates(results) if results else []
+
+def _cached_profile_url(name: str) -> Optional[str]:
+    # Read-only here: only linkedin_lookup_agent.lookup writes the cache, once it has
+    # settled on an answer. This tool's first unscored hit is just one candidate.
+    kind, cached_url = get_cached_lookup(name)
+    if kind == HIT:
+        print(f"💾 Cached LinkedIn URL for '{name}': {cached_url}")
+        return cached_url
+    return None
+
+def _profile_url_from_results(name: str, results: Any) -> str:
+    if not results:
+        return f"No search results found for '{name}'"
+    
+    # Return the first LinkedIn URL found
+    candidates = extract_linkedin_candidates(results)
+    if candidates:
+        clean_url = candidates[0]['url']
+        print(f"✅ Found LinkedIn URL: {clean_url}")
+        return clean_url
+    
+    # If no LinkedIn URLs found, return the raw results for the agent to process
+    print(f"❌ No LinkedIn URLs found anywhere in results")
+    return str(results)
+
+def _search_error(name: str, e: Exception) -> str:
+    error_msg = f"Error searching for '{name}': {str(e)}"
+    print(f"❌ Search failed: {error_msg}")
+    return error_msg
+
 def get_profile_url_tavily(name: str) -> str:
     """
     Looks up a LinkedIn profile by name using Tavily Search.
@@ -12,78 +114,23 @@ def get_profile_url_tavily(name: str) -> str:
     Returns:
         LinkedIn profile URL or descriptive error message
     """
+    cached_url = _cached_profile_url(name)
+    if cached_url:
+        return cached_url
+    try:
+        return _profile_url_from_results(name, _tavily_search(name))
+    except Exception as e:
+        return _search_error(name, e)
+
+async def aget_profile_url_tavily(name: str) -> str:
+    """Async get_profile_url_tavily, for agents run with ainvoke."""
+    cached_url = _cached_profile_url(name)
+    if cached_url:
+        return cached_url
     try:
-        search = TavilySearch(api_key=os.environ.get("TAVILY_API_KEY"))
-        
-        # Use the search query exactly as provided - don't modify it
-        print(f"🔍 Tavily searching for: '{name}'")
-        
-        # Add "linkedin" to the search query if not already present
-        if "linkedin" not in name.lower():
-            enhanced_query = f"{name} linkedin"
-        else:
-            enhanced_query = name
-        
-        results = search.run(f"{enhanced_query}")
-        
-        if not results:
-            return f"No search results found for '{name}'"
-        
-        # Handle different result formats from Tavily
-        linkedin_urls = []
-        
-        # Case 1: Results is a dictionary with 'results' key
-        if isinstance(results, dict) and 'results' in results:
-            results_list = results['results']
-            for result in results_list:
-                if isinstance(result, dict):
-                    url = result.get('url', '')
-                    if 'linkedin.com/in/' in url:
-                        linkedin_urls.append(url)
-        
-        # Case 2: Results is a list of dictionaries
-        elif isinstance(results, list):
-            for result in results:
-                if isinstance(result, dict):
-                    url = result.get('url', '')
-                    if 'linkedin.com/in/' in url:
-                        linkedin_urls.append(url)
-        
-        # Case 3: Results is a string containing URLs
-        elif isinstance(results, str):
-            import re
-            # Extract LinkedIn URLs from the string
-            urls = re.findall(r'https?://(?:www\.)?linkedin\.com/in/[^\s\)\]<>"\']+', results)
-            linkedin_urls.extend(urls)
-        
-        # Return the first LinkedIn URL found
-        if linkedin_urls:
-            clean_url = linkedin_urls[0].rstrip('.,;)')  # Clean trailing punctuation
-            print(f"✅ Found LinkedIn URL: {clean_url}")
-            return clean_url
-        
-        # If no LinkedIn URLs found, return the raw results for the agent to process
-        print(f"⚠️ No LinkedIn URLs found in structured results, checking raw content...")
-        
-        # Try to extract from content/title fields in the new format
-        if isinstance(results, dict) and 'results' in results:
-            for result in results['results']:
-                content = result.get('content', '') + ' ' + result.get('title', '')
-                if 'linkedin.com/in/' in content:
-                    import re
-                    urls = re.findall(r'https?://(?:www\.)?linkedin\.com/in/[^\s\)\]<>"\']+', content)
-                    if urls:
-                        clean_url = urls[0].rstrip('.,;)')
-                        print(f"✅ Found LinkedIn URL in content: {clean_url}")
-                        return clean_url
-        
-        print(f"❌ No LinkedIn URLs found anywhere in results")
-        return str(results)
-        
+        return _profile_url_from_results(name, await _atavily_search(name))
     except Exception as e:
-        error_msg = f"Error searching for '{name}': {str(e)}"
-        print(f"❌ Search failed: {error_msg}")
-        return error_msg
+        return _search_error(name, e)
 
 def extract_text_from_word(file_path: str) -> str:
     """
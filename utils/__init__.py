@@ -3,6 +3,15 @@ Utils package for Langchain Agentic Playground
 
 This package contains utility modules for:
 - Output management and file saving (output_manager.py)
+- Saved analysis manifest index (analysis_index.py)
+- Content-addressed storage for shared profile/conversation data (blob_store.py)
+- Pluggable on-disk formats for saved analyses (storage_backends.py)
+- Lazily loaded saved analysis records (lazy_record.py)
+- Flat/date/hash-sharded output directory layouts (output_layout.py)
+- Background write-behind persistence (write_behind.py)
+- LRU cache for loaded analyses and blobs (record_cache.py)
+- Persistent SQLite TTL cache, e.g. for scraped profiles (disk_cache.py)
+- Coalescing of concurrent duplicate calls (singleflight.py)
 - Results viewing and analysis (results_viewer.py)
 """
 
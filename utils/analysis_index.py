@@ -0,0 +1,273 @@
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from utils.output_layout import filename_timestamp
+
+INDEX_FILENAME = ".analysis_index.sqlite3"
+
+# Bump whenever the schema or indexed content changes; older indexes are rebuilt on first use
+SCHEMA_VERSION = 3
+
+# Full-text searchable fields and their BM25 weights (higher = more important)
+SEARCH_FIELDS = {
+    'person_name': 10.0,
+    'company': 5.0,
+    'job_title': 5.0,
+    'search_used': 3.0,
+    'headline': 3.0,
+    'positions': 2.0,
+    'schools': 2.0,
+    'skills': 2.0,
+    'analysis': 1.0,
+}
+
+# (filename, summary, file_date, search_document) - everything the index stores per analysis
+IndexEntry = Tuple[str, Dict[str, Any], str, Optional[Dict[str, str]]]
+
+
+class AnalysisIndex:
+    """SQLite manifest of saved analyses so listing never has to open person files."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'schema_version'").fetchone()
+            if row is None or row[0] != str(SCHEMA_VERSION):
+                # Older schema - start over; the index is backfilled from disk on first use
+                conn.execute("DROP TABLE IF EXISTS analyses")
+                conn.execute("DROP TABLE IF EXISTS analyses_fts")
+                conn.execute("DELETE FROM index_meta WHERE key = 'built'")
+                conn.execute(
+                    "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),)
+                )
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    filename TEXT PRIMARY KEY,
+                    file_date TEXT NOT NULL DEFAULT '',
+                    file_stamp TEXT,
+                    person_name TEXT,
+                    company TEXT,
+                    job_title TEXT,
+                    search_used TEXT,
+                    linkedin_found INTEGER NOT NULL DEFAULT 0,
+                    summary TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_file_date ON analyses (file_date, filename)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_file_stamp ON analyses (file_stamp)")
+            # Inverted index sharing rowids with the analyses table; prefix indexes keep
+            # short prefix queries ("eng*") from scanning the whole term list
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts USING fts5(
+                    {', '.join(SEARCH_FIELDS)},
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3 4'
+                )
+            """)
+
+    @contextmanager
+    def _connection(self):
+        """Open a short-lived connection, committing on success."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_values(filename: str, summary: Dict[str, Any], file_date: str) -> tuple:
+        timestamp = filename_timestamp(filename)
+        return (
+            filename,
+            file_date or '',
+            timestamp.strftime('%Y%m%d%H%M%S') if timestamp else None,
+            summary.get('person_name'),
+            summary.get('company'),
+            summary.get('job_title'),
+            summary.get('search_used'),
+            1 if summary.get('linkedin_found') else 0,
+            json.dumps(summary, ensure_ascii=False),
+        )
+
+    def _write_entries(self, conn: sqlite3.Connection, entries: Iterable[IndexEntry]):
+        for filename, summary, file_date, search_document in entries:
+            existing = conn.execute("SELECT rowid FROM analyses WHERE filename = ?", (filename,)).fetchone()
+            if existing:
+                conn.execute("DELETE FROM analyses_fts WHERE rowid = ?", (existing[0],))
+                conn.execute("DELETE FROM analyses WHERE rowid = ?", (existing[0],))
+            
+            cursor = conn.execute(
+                "INSERT INTO analyses "
+                "(filename, file_date, file_stamp, person_name, company, job_title, search_used, linkedin_found, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row_values(filename, summary, file_date),
+            )
+            
+            document = search_document or {}
+            conn.execute(
+                f"INSERT INTO analyses_fts (rowid, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' for _ in SEARCH_FIELDS)})",
+                (cursor.lastrowid, *(document.get(field) or summary.get(field) or '' for field in SEARCH_FIELDS)),
+            )
+    
+    def is_built(self) -> bool:
+        """Whether the index has been populated from the output directory at least once."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'built'").fetchone()
+        return row is not None
+
+    def upsert(self, filename: str, summary: Dict[str, Any], file_date: str,
+               search_document: Dict[str, str] = None):
+        """Add or update the entry for a single saved analysis."""
+        with self._connection() as conn:
+            self._write_entries(conn, [(filename, summary, file_date, search_document)])
+
+    def upsert_many(self, entries: Iterable[IndexEntry]):
+        """Add or update several entries in a single transaction."""
+        with self._connection() as conn:
+            self._write_entries(conn, entries)
+
+    def remove(self, filename: str):
+        with self._connection() as conn:
+            row = conn.execute("SELECT rowid FROM analyses WHERE filename = ?", (filename,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM analyses_fts WHERE rowid = ?", (row[0],))
+                conn.execute("DELETE FROM analyses WHERE rowid = ?", (row[0],))
+
+    def rename(self, old_filename: str, new_filename: str):
+        """Point an existing entry at a new filename, keeping its search document."""
+        timestamp = filename_timestamp(new_filename)
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE analyses SET filename = ?, file_stamp = ? WHERE filename = ?",
+                (new_filename, timestamp.strftime('%Y%m%d%H%M%S') if timestamp else None, old_filename)
+            )
+
+    def replace_all(self, entries: Iterable[IndexEntry]):
+        """Atomically replace the whole index with the given entries."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM analyses")
+            conn.execute("DELETE FROM analyses_fts")
+            self._write_entries(conn, entries)
+            conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('built', '1')")
+
+    def count(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def list_summaries(self) -> list[Dict[str, Any]]:
+        """Return every indexed summary, newest first, in the shape list_saved_analyses uses."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT filename, file_date, summary FROM analyses ORDER BY file_date DESC, filename DESC"
+            ).fetchall()
+        return [self._row_to_summary(row) for row in rows]
+
+    def query_page(self, after: Tuple[str, str] = None, limit: int = 100, start_stamp: str = None,
+                   end_stamp: str = None, company: str = None, job_title: str = None,
+                   linkedin_found: bool = None) -> list[Dict[str, Any]]:
+        """
+        Return one page of summaries, newest first, using keyset pagination.
+        
+        Args:
+            after: (file_date, filename) of the last row of the previous page
+            limit: Maximum rows to return
+            start_stamp / end_stamp: Inclusive YYYYMMDDHHMMSS bounds on the filename timestamp
+            company / job_title: Case-insensitive substring filters
+            linkedin_found: Only analyses with (True) or without (False) a LinkedIn profile
+        """
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append("(file_date < ? OR (file_date = ? AND filename < ?))")
+            params.extend([after[0], after[0], after[1]])
+        if start_stamp is not None:
+            conditions.append("file_stamp >= ?")
+            params.append(start_stamp)
+        if end_stamp is not None:
+            conditions.append("file_stamp <= ?")
+            params.append(end_stamp)
+        if company:
+            conditions.append("company LIKE ? ESCAPE '\\'")
+            params.append(_contains_pattern(company))
+        if job_title:
+            conditions.append("job_title LIKE ? ESCAPE '\\'")
+            params.append(_contains_pattern(job_title))
+        if linkedin_found is not None:
+            conditions.append("linkedin_found = ?")
+            params.append(1 if linkedin_found else 0)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT filename, file_date, summary FROM analyses {where} "
+                f"ORDER BY file_date DESC, filename DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [self._row_to_summary(row) for row in rows]
+
+    def search(self, search_term: str, limit: int = None) -> list[Dict[str, Any]]:
+        """
+        Ranked full-text search over the indexed analyses.
+        
+        Every word in the search term is matched as a prefix; analyses matching all
+        words are returned first, best BM25 score first. If no analysis matches all
+        words, analyses matching any of them are returned instead.
+        """
+        terms = _tokenize(search_term)
+        if not terms:
+            return []
+        
+        for operator in (' AND ', ' OR '):
+            match_query = operator.join(f'"{term}"*' for term in terms)
+            with self._connection() as conn:
+                rows = conn.execute(
+                    f"SELECT a.filename, a.file_date, a.summary, "
+                    f"bm25(analyses_fts, {', '.join(str(weight) for weight in SEARCH_FIELDS.values())}) AS rank "
+                    f"FROM analyses_fts JOIN analyses a ON a.rowid = analyses_fts.rowid "
+                    f"WHERE analyses_fts MATCH ? ORDER BY rank, a.file_date DESC LIMIT ?",
+                    (match_query, -1 if limit is None else limit),
+                ).fetchall()
+            if rows or len(terms) == 1:
+                break
+        
+        results = []
+        for row in rows:
+            summary = self._row_to_summary(row)
+            summary['search_score'] = round(-row['rank'], 4)
+            results.append(summary)
+        return results
+
+    @staticmethod
+    def _row_to_summary(row: sqlite3.Row) -> Dict[str, Any]:
+        summary = json.loads(row['summary'])
+        summary['filename'] = row['filename']
+        summary['file_date'] = row['file_date']
+        return summary
+
+
+def _tokenize(text: str) -> list[str]:
+    """Split free text into lowercase word tokens, matching the FTS tokenizer closely enough for queries."""
+    return re.findall(r'\w+', (text or '').lower())
+
+
+def _contains_pattern(text: str) -> str:
+    """A LIKE pattern (with ESCAPE '\\') matching text literally anywhere, so % and _ in it aren't wildcards."""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def index_path_for(output_dir: str) -> str:
+    return os.path.join(output_dir, INDEX_FILENAME)
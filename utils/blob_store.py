@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+from typing import Any
+
+from utils.storage_backends import (
+    StorageBackend, JsonBackend, ANALYSIS_EXTENSIONS, loads_any, strip_analysis_extension, write_atomic
+)
+
+BLOBS_DIRNAME = "blobs"
+
+
+def canonical_json_bytes(value: Any) -> bytes:
+    """Serialize a JSON value so that equal values always produce identical bytes."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class BlobStore:
+    """Content-addressed store for large, frequently repeated parts of saved analyses."""
+
+    def __init__(self, root_dir: str, backend: StorageBackend = None):
+        self.root_dir = root_dir
+        self.backend = backend or JsonBackend()
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _blob_path(self, digest: str, extension: str = None) -> str:
+        # Two-character fan-out keeps any single directory small
+        return os.path.join(self.root_dir, digest[:2], f"{digest}{extension or self.backend.extension}")
+
+    def _find_blob_path(self, digest: str) -> str:
+        """Locate a blob in whichever format it was written, preferring the current backend."""
+        preferred = self._blob_path(digest)
+        if os.path.exists(preferred):
+            return preferred
+        for extension in ANALYSIS_EXTENSIONS:
+            path = self._blob_path(digest, extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def put(self, value: Any) -> str:
+        """
+        Store a JSON value and return its SHA-256 digest.
+
+        Values that are already stored (in any format) are not written again.
+        """
+        digest = hashlib.sha256(canonical_json_bytes(value)).hexdigest()
+        if self._find_blob_path(digest):
+            return digest
+
+        path = self._blob_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, self.backend.dumps(value, compact=True))
+        return digest
+
+    def load(self, digest: str) -> tuple[Any, int]:
+        """Load a stored JSON value by digest, along with its size on disk in bytes."""
+        path = self._find_blob_path(digest)
+        if path is None:
+            raise FileNotFoundError(f"Blob {digest} not found in {self.root_dir}")
+        with open(path, 'rb') as f:
+            payload = f.read()
+        return loads_any(payload), len(payload)
+
+    def get(self, digest: str) -> Any:
+        """Load a stored JSON value by digest."""
+        return self.load(digest)[0]
+
+    def exists(self, digest: str) -> bool:
+        return self._find_blob_path(digest) is not None
+
+    def migrate(self) -> int:
+        """
+        Rewrite every blob stored in another format using the current backend.
+
+        Returns:
+            int: Number of blobs converted
+        """
+        converted = 0
+        for dirpath, _, filenames in os.walk(self.root_dir):
+            for filename in filenames:
+                if filename.endswith(self.backend.extension) or filename.endswith('.tmp'):
+                    continue
+                old_path = os.path.join(dirpath, filename)
+                with open(old_path, 'rb') as f:
+                    value = loads_any(f.read())
+                digest = strip_analysis_extension(filename)
+                write_atomic(self._blob_path(digest), self.backend.dumps(value, compact=True))
+                os.remove(old_path)
+                converted += 1
+        return converted
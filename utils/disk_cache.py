@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Cache entry kinds: a stored value, or a remembered "does not exist" answer
+HIT = 'hit'
+NOT_FOUND = 'not_found'
+
+
+class DiskTTLCache:
+    """
+    Persistent key/value cache in SQLite with per-entry expiry.
+
+    Values are stored as JSON. Besides values it can remember negative answers
+    (e.g. a 404 from an API) for their own, usually shorter, TTL. When the stored
+    values exceed max_bytes the oldest entries are evicted first.
+
+    Each thread keeps its own connection, so lookups cost one indexed read.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 7 * 24 * 3600,
+                 not_found_ttl_seconds: float = 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.not_found_ttl_seconds = not_found_ttl_seconds
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._evict_lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    value TEXT,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_stored_at ON cache_entries (stored_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            # WAL lets readers in other threads/processes proceed while a scrape is being stored
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Tuple[Optional[str], Any]:
+        """
+        Look up a key.
+
+        Returns (HIT, value), (NOT_FOUND, None) for a cached negative answer,
+        or (None, None) when the key is missing or expired.
+        """
+        row = self._connection().execute(
+            "SELECT kind, value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[2] <= time.time():
+            return None, None
+        kind, value, _ = row
+        if kind == NOT_FOUND:
+            return NOT_FOUND, None
+        return HIT, json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value for ttl_seconds (the cache default if not given)."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        self._store(key, HIT, encoded, len(encoded.encode('utf-8')),
+                    self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+    def set_not_found(self, key: str, ttl_seconds: Optional[float] = None):
+        """Remember that key has no value, so repeated lookups can skip the upstream call."""
+        self._store(key, NOT_FOUND, None, 0,
+                    self.not_found_ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+    def _store(self, key: str, kind: str, value: Optional[str], size: int, ttl_seconds: float):
+        if ttl_seconds <= 0 or size > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, kind, value, size, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, value, size, now, now + ttl_seconds)
+            )
+        self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        with self._evict_lock, conn:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            # Walk entries oldest first until enough has been freed
+            excess = total - self.max_bytes
+            doomed = []
+            for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY stored_at"):
+                doomed.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", doomed)
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; returns whether it was cached."""
+        conn = self._connection()
+        with conn:
+            return conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount > 0
+
+    def purge_expired(self) -> int:
+        """Remove expired entries now rather than on the next store; returns how many."""
+        conn = self._connection()
+        with conn:
+            return conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def entries(self, include_expired: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Cached entries, newest first, for inspection."""
+        query = "SELECT key, kind, value, stored_at, expires_at FROM cache_entries"
+        params = []
+        if not include_expired:
+            query += " WHERE expires_at > ?"
+            params.append(time.time())
+        query += " ORDER BY stored_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        now = time.time()
+        return [
+            {
+                'key': key,
+                'kind': kind,
+                'value': json.loads(value) if value is not None else None,
+                'stored_at': stored_at,
+                'expires_at': expires_at,
+                'expired': expires_at <= now,
+            }
+            for key, kind, value, stored_at, expires_at in self._connection().execute(query, params)
+        ]
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and stored bytes, split into live and expired entries."""
+        now = time.time()
+        row = self._connection().execute("""
+            SELECT
+                COALESCE(SUM(kind = 'hit' AND expires_at > ?), 0),
+                COALESCE(SUM(kind = 'not_found' AND expires_at > ?), 0),
+                COALESCE(SUM(expires_at <= ?), 0),
+                COALESCE(SUM(size), 0)
+            FROM cache_entries
+        """, (now, now, now)).fetchone()
+        return {
+            'entries': row[0],
+            'not_found_entries': row[1],
+            'expired_entries': row[2],
+            'bytes': row[3],
+            'max_bytes': self.max_bytes,
+        }
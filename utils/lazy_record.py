@@ -0,0 +1,72 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Dict
+
+
+class LazySection(Mapping):
+    """
+    Read-only view of a section of a saved analysis.
+
+    Values stored as blob references are only loaded from the blob store the first
+    time they are accessed; nested sections are wrapped the same way.
+
+    Being a Mapping rather than a dict, it isn't JSON-serializable by itself: call
+    to_dict(), or pass json_default as the default= hook of json.dumps.
+    """
+
+    def __init__(self, section: Dict[str, Any], is_reference: Callable[[Any], bool], resolve: Callable[[Any], Any]):
+        self._section = section
+        self._is_reference = is_reference
+        self._resolve = resolve
+        self._loaded = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._loaded:
+            return self._loaded[key]
+
+        value = self._section[key]
+        if self._is_reference(value):
+            value = self._resolve(value)
+        elif isinstance(value, dict):
+            value = LazySection(value, self._is_reference, self._resolve)
+        self._loaded[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._section)
+
+    def __len__(self) -> int:
+        return len(self._section)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._section)})"
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether the value under key has been accessed (and, for blobs, loaded) yet."""
+        return key in self._loaded
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Load every section and return a plain dict, as load_person_data does."""
+        result = {}
+        for key in self._section:
+            value = self[key]
+            result[key] = value.to_dict() if isinstance(value, LazySection) else value
+        return result
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps(default=...) hook that serializes lazy sections as plain dicts."""
+    if isinstance(value, LazySection):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class LazyAnalysisRecord(LazySection):
+    """Saved analysis whose heavy sections (profile data, original conversation) load on access."""
+
+    def __init__(self, filename: str, document: Dict[str, Any],
+                 is_reference: Callable[[Any], bool], resolve: Callable[[Any], Any]):
+        super().__init__(document, is_reference, resolve)
+        self.filename = filename
+
+    def __repr__(self) -> str:
+        return f"LazyAnalysisRecord({self.filename!r})"
@@ -0,0 +1,59 @@
+import hashlib
+import os
+import re
+from datetime import datetime
+from typing import Iterator, Optional
+
+from utils.storage_backends import strip_analysis_extension
+
+# flat:      output/Name_20250618_171245.json
+# date:      output/2025/06/18/Name_20250618_171245.json
+# hash:      output/3f/Name_20250618_171245.json
+# date_hash: output/2025/06/3f/Name_20250618_171245.json
+LAYOUTS = ('flat', 'date', 'hash', 'date_hash')
+
+# Saved analysis filenames end with _YYYYMMDD_HHMMSS before the storage extension
+FILENAME_TIMESTAMP_PATTERN = re.compile(r'_(\d{8})_(\d{6})(?:\.[A-Za-z0-9.]+)?$')
+
+
+def filename_timestamp(filename: str) -> Optional[datetime]:
+    """Parse the save timestamp embedded in a saved analysis filename."""
+    match = FILENAME_TIMESTAMP_PATTERN.search(os.path.basename(filename))
+    if not match:
+        return None
+    day, clock = match.group(1), match.group(2)
+    try:
+        return datetime(int(day[:4]), int(day[4:6]), int(day[6:]), int(clock[:2]), int(clock[2:4]), int(clock[4:]))
+    except ValueError:
+        return None
+
+
+def _hash_bucket(filename: str) -> str:
+    # Hash the name without its storage extension so converting the format keeps the bucket
+    return hashlib.md5(strip_analysis_extension(filename).encode('utf-8')).hexdigest()[:2]
+
+
+def relative_path_for(filename: str, layout: str) -> str:
+    """Where a saved analysis lives, relative to the output directory, under a layout."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown output layout '{layout}'. Available: {', '.join(LAYOUTS)}")
+
+    timestamp = filename_timestamp(filename)
+    if layout == 'flat' or (timestamp is None and layout != 'hash'):
+        # Files without a timestamp in their name cannot be date-bucketed
+        return filename
+    if layout == 'date':
+        return os.path.join(timestamp.strftime('%Y'), timestamp.strftime('%m'), timestamp.strftime('%d'), filename)
+    if layout == 'hash':
+        return os.path.join(_hash_bucket(filename), filename)
+    return os.path.join(timestamp.strftime('%Y'), timestamp.strftime('%m'), _hash_bucket(filename), filename)
+
+
+def candidate_paths(output_dir: str, filename: str, layout: str) -> Iterator[str]:
+    """Every path a saved analysis could be at, the current layout first (computed lazily)."""
+    seen = set()
+    for candidate_layout in (layout, *LAYOUTS):
+        path = os.path.join(output_dir, relative_path_for(filename, candidate_layout))
+        if path not in seen:
+            seen.add(path)
+            yield path
@@ -1,15 +1,105 @@
 import os
+import base64
 import json
-from datetime import datetime
-from typing import Dict, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time
+from typing import Dict, Any, Iterator, Optional, Union
 import re
 
+from third_parties.profile_model import Profile
+from utils.analysis_index import AnalysisIndex, index_path_for
+from utils.lazy_record import LazyAnalysisRecord
+from utils.record_cache import RecordCache, copy_record, estimate_size
+from utils.output_layout import LAYOUTS, candidate_paths, relative_path_for
+from utils.output_settings import SETTINGS_FILENAME, load_settings, save_settings
+from utils.blob_store import BlobStore, BLOBS_DIRNAME, canonical_json_bytes
+from utils.storage_backends import (
+    ANALYSIS_EXTENSIONS, get_backend, loads_any, strip_analysis_extension, write_atomic, write_atomic_batch
+)
+from utils.write_behind import WriteBehindWriter
+
+# Marker key for a section stored in the blob store instead of inline
+BLOB_REF_KEY = '$blob'
+
+# Quota counters change on every scrape; keeping them inline lets repeat profiles share one blob
+VOLATILE_PROFILE_KEYS = ('credits_left', 'rate_limit_left')
+
+# Sections smaller than this stay inline - a separate blob file would cost more than it saves
+BLOB_MIN_BYTES = 512
+
 class ConversationOutputManager:
     """Manages saving conversation analysis and LinkedIn profile data to organized files."""
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", dedup_blobs: bool = True, storage_format: Optional[str] = None,
+                 layout: Optional[str] = None, write_behind: bool = False, write_queue_size: int = 256,
+                 cache_max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            output_dir: Directory where analyses are saved
+            dedup_blobs: Store profile data and conversation text as shared, content-addressed blobs
+            storage_format: Format for new files - 'json', 'gzip', 'zstd' or 'msgpack'. Defaults to
+                            the format last chosen by migrate_storage for this directory, else 'json'.
+                            Files in any format are always readable.
+            layout: Directory layout for new files - 'flat', 'date' (YYYY/MM/DD), 'hash' (2-char
+                    hash prefix) or 'date_hash' (YYYY/MM/<hash>). Defaults to the layout last chosen
+                    by migrate_layout for this directory, else 'flat'. Files in any layout are found.
+            write_behind: Return from save_conversation_analysis immediately and write files
+                          on a background thread (call flush() to wait for pending writes)
+            write_queue_size: Maximum number of saves waiting to be written before saving blocks
+            cache_max_bytes: Memory budget of the loaded-record cache, measured as the estimated
+                             in-memory size of the decoded records (0 disables caching)
+        """
+        settings = load_settings(output_dir)
+        layout = layout or settings.get('layout', 'flat')
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown output layout '{layout}'. Available: {', '.join(LAYOUTS)}")
+        
         self.output_dir = output_dir
+        self.dedup_blobs = dedup_blobs
+        self.backend = get_backend(storage_format or settings.get('storage_format', 'json'))
+        self.layout = layout
         os.makedirs(output_dir, exist_ok=True)
+        
+        # The index and blob store are opened on first use (see the properties below)
+        self._index = None
+        self._blob_store = None
+        self._open_lock = threading.Lock()
+        
+        # Parsed person files (keyed by path, validated by mtime/size) and blobs (immutable, keyed by digest)
+        self._cache = RecordCache(max_bytes=cache_max_bytes)
+        
+        # Saves not yet on disk, so loads see them straight away in write-behind mode
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._write_queue_size = write_queue_size
+        self._writer = None
+        if write_behind:
+            self.enable_write_behind()
+    
+    @property
+    def index(self) -> AnalysisIndex:
+        """The SQLite manifest of saved analyses, created on first use."""
+        if self._index is None:
+            with self._open_lock:
+                if self._index is None:
+                    self._index = AnalysisIndex(index_path_for(self.output_dir))
+        return self._index
+    
+    @property
+    def blob_store(self) -> BlobStore:
+        """The shared blob store, created on first use."""
+        if self._blob_store is None:
+            with self._open_lock:
+                if self._blob_store is None:
+                    self._blob_store = BlobStore(os.path.join(self.output_dir, BLOBS_DIRNAME), self.backend)
+        return self._blob_store
+    
+    def enable_write_behind(self):
+        """Write later saves on a background thread, as if created with write_behind=True."""
+        with self._open_lock:
+            if self._writer is None:
+                self._writer = WriteBehindWriter(self._write_batch, max_queue_size=self._write_queue_size)
     
     def _sanitize_filename(self, name: str) -> str:
         """Convert a person's name into a safe filename."""
@@ -50,36 +140,26 @@ class ConversationOutputManager:
         
         return username.replace('-', ' ').title()
     
-    def _get_actual_name_from_profile_data(self, profile_data: Dict[str, Any]) -> str:
-        """Extract the actual name from LinkedIn profile data."""
+    def _get_actual_name_from_profile_data(self, profile_data: Union[Profile, Dict[str, Any]],
+                                           profile: Optional[Profile] = None) -> str:
+        """
+        Extract the actual name from LinkedIn profile data (a raw response or a parsed Profile).
+        
+        profile, if given, is profile_data already parsed, so it isn't parsed again.
+        """
         if not profile_data:
             print("❌ No profile data provided")
             return None
         
-        # Debug: Print what data we have
-        print(f"🔍 DEBUG: Profile data keys: {list(profile_data.keys()) if isinstance(profile_data, dict) else 'Not a dict'}")
-        
-        # Check if we have the Scrapin API response format
-        if 'person' in profile_data and isinstance(profile_data['person'], dict):
-            person_data = profile_data['person']
-            print(f"🔍 DEBUG: Person data keys: {list(person_data.keys())}")
-            
-            # Extract firstName and lastName from person object
-            first_name = person_data.get('firstName', '').strip()
-            last_name = person_data.get('lastName', '').strip()
-            
-            print(f"🔍 DEBUG: Found firstName: '{first_name}', lastName: '{last_name}'")
-            
-            if first_name and last_name:
-                full_name = f"{first_name} {last_name}"
-                print(f"✅ Extracted full name from profile data: {full_name}")
-                return full_name
-            elif first_name:
-                print(f"✅ Found firstName only: {first_name}")
-                return first_name
-            elif last_name:
-                print(f"✅ Found lastName only: {last_name}")
-                return last_name
+        if profile is None:
+            profile = Profile.coerce(profile_data)
+        print(f"🔍 DEBUG: Found firstName: '{profile.first_name or ''}', lastName: '{profile.last_name or ''}'")
+        if profile.full_name:
+            print(f"✅ Extracted full name from profile data: {profile.full_name}")
+            return profile.full_name
+        if not isinstance(profile_data, dict):
+            print("❌ No name found in profile data")
+            return None
         
         # Try alternative field structures for different API formats
         alternative_fields = [
@@ -157,20 +237,28 @@ class ConversationOutputManager:
         conversation_analysis: Dict[str, Any] = None,
         original_conversation: str = None,
         conversation_date: str = None,
-        user_identity: Dict[str, Any] = None
+        user_identity: Dict[str, Any] = None,
+        profile: Optional[Profile] = None
     ) -> str:
         """
         Save all conversation and profile data for a person.
         
+        profile_data is the raw provider response, which is what gets saved. Pass the
+        Profile already parsed from it as profile (scrape_linkedin_profiles returns one)
+        to save parsing it again; otherwise it is parsed here, once.
+        
         Returns:
             str: The filename where the data was saved
         """
+        if profile is None:
+            profile = Profile.from_response(profile_data)
+        
         # Determine the actual person's name
         actual_name = None
         
         # Try to get name from profile data first (most accurate)
         if profile_data:
-            actual_name = self._get_actual_name_from_profile_data(profile_data)
+            actual_name = self._get_actual_name_from_profile_data(profile_data, profile)
         
         # Fallback to extracting from LinkedIn URL
         if not actual_name and linkedin_url:
@@ -185,8 +273,9 @@ class ConversationOutputManager:
         # Create safe filename
         safe_filename = self._sanitize_filename(actual_name)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{safe_filename}_{timestamp}.json"
-        filepath = os.path.join(self.output_dir, filename)
+        filename = f"{safe_filename}_{timestamp}{self.backend.extension}"
+        filepath = self._analysis_path(filename)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         # Extract info from EXISTING conversation analysis (no duplication!)
         analysis_extracted_info = self._extract_info_from_conversation_analysis(conversation_analysis)
@@ -221,151 +310,485 @@ class ConversationOutputManager:
             'summary': summary  # This now uses extracted info from existing analysis
         }
         
+        # Build the search document before large sections are swapped for blob references
+        search_document = self._build_search_document(output_data, profile)
+        
+        if self._writer is not None:
+            # Serialization, blob writes and indexing all happen on the writer thread
+            with self._pending_lock:
+                self._pending[filename] = output_data
+            self._writer.submit((filename, filepath, output_data, search_document))
+            print(f"💾 Queued analysis for {actual_name} to: {filename}")
+            return filename
+        
         # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        write_atomic(filepath, self.backend.dumps(self._externalize_blobs(output_data)))
+        
+        # Keep the manifest in sync so listing and searching never have to reopen this file
+        self.index.upsert(filename, summary, output_data['metadata']['analysis_timestamp'], search_document)
         
         print(f"💾 Saved analysis for {actual_name} to: {filename}")
         return filename
     
-    def load_person_data(self, filename: str) -> Dict[str, Any]:
-        """Load previously saved data for a person."""
-        filepath = os.path.join(self.output_dir, filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+    def _write_batch(self, items: list[tuple]):
+        """Write a batch of queued saves: atomic file writes with batched fsyncs, then one index transaction."""
+        try:
+            files = []
+            index_entries = []
+            for filename, filepath, output_data, search_document in items:
+                files.append((filepath, self.backend.dumps(self._externalize_blobs(output_data))))
+                index_entries.append((
+                    filename,
+                    output_data['summary'],
+                    output_data['metadata']['analysis_timestamp'],
+                    search_document
+                ))
+            
+            write_atomic_batch(files)
+            self.index.upsert_many(index_entries)
+        finally:
+            with self._pending_lock:
+                for filename, _, output_data, _ in items:
+                    if self._pending.get(filename) is output_data:
+                        del self._pending[filename]
     
-    def list_saved_analyses(self) -> list[Dict[str, Any]]:
-        """List all saved conversation analyses with summaries."""
-        analyses = []
+    def flush(self):
+        """
+        Wait until every queued save has been written to disk and indexed.
         
-        if not os.path.exists(self.output_dir):
-            return analyses
+        Raises WriteBehindError if queued saves failed; its failed_items are the
+        (filename, filepath, output_data, search_document) tuples that were not written.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+    
+    def close(self):
+        """Flush queued saves and stop the background writer (raises WriteBehindError like flush)."""
+        if self._writer is not None:
+            self._writer.close()
+    
+    def _to_blob_ref(self, value: Any, inline_keys: tuple = ()) -> Any:
+        """Move a large section into the blob store, keeping inline_keys next to the reference."""
+        if not value:
+            return value
+        
+        inline = {}
+        if isinstance(value, dict) and inline_keys:
+            inline = {key: value[key] for key in inline_keys if key in value}
+            value = {key: item for key, item in value.items() if key not in inline}
+        
+        if len(canonical_json_bytes(value)) < BLOB_MIN_BYTES:
+            return {**value, **inline} if isinstance(value, dict) else value
+        
+        return {BLOB_REF_KEY: self.blob_store.put(value), **inline}
+    
+    @staticmethod
+    def _is_blob_ref(value: Any) -> bool:
+        return isinstance(value, dict) and BLOB_REF_KEY in value
+    
+    def _from_blob_ref(self, value: Any) -> Any:
+        """Resolve a blob reference written by _to_blob_ref back into the original section."""
+        if not self._is_blob_ref(value):
+            return value
+        
+        inline = {key: item for key, item in value.items() if key != BLOB_REF_KEY}
+        resolved = self._load_blob(value[BLOB_REF_KEY])
+        if inline and isinstance(resolved, dict):
+            return {**inline, **resolved}
+        return resolved
+    
+    def _externalize_blobs(self, output_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of output_data with the profile and conversation text stored as shared blobs."""
+        if not self.dedup_blobs:
+            return output_data
+        
+        stored = dict(output_data)
+        stored['linkedin_profile'] = dict(output_data['linkedin_profile'])
+        stored['linkedin_profile']['profile_data'] = self._to_blob_ref(
+            output_data['linkedin_profile'].get('profile_data'), VOLATILE_PROFILE_KEYS
+        )
+        stored['conversation'] = dict(output_data['conversation'])
+        stored['conversation']['original_text'] = self._to_blob_ref(
+            output_data['conversation'].get('original_text')
+        )
+        return stored
+    
+    def _load_blob(self, digest: str) -> Any:
+        """Load a blob through the record cache; blobs never change, so no validation is needed."""
+        key = ('blob', digest)
+        value = self._cache.get(key)
+        if value is None:
+            value, _ = self.blob_store.load(digest)
+            self._cache.put(key, value, estimate_size(value))
+        return value
+    
+    def _resolve_blobs(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the document with any blob references inlined (data itself is left untouched)."""
+        data = dict(data)
+        linkedin_profile = data.get('linkedin_profile')
+        if isinstance(linkedin_profile, dict):
+            data['linkedin_profile'] = {
+                **linkedin_profile,
+                'profile_data': self._from_blob_ref(linkedin_profile.get('profile_data'))
+            }
+        conversation = data.get('conversation')
+        if isinstance(conversation, dict):
+            data['conversation'] = {
+                **conversation,
+                'original_text': self._from_blob_ref(conversation.get('original_text'))
+            }
+        return data
+    
+    def load_person_data(self, filename: str, lazy: bool = False) -> Dict[str, Any]:
+        """
+        Load previously saved data for a person.
+        
+        Parsed files are served from an LRU cache while their mtime and size are unchanged.
+        The returned dict is the caller's own copy; a lazy record is a read-only view over
+        the cached data and must not be mutated.
+        
+        Args:
+            filename: Saved analysis filename
+            lazy: Return a LazyAnalysisRecord that only loads the LinkedIn profile data and
+                  original conversation text when they are accessed
+        
+        Limits of lazy loading: the person file itself is still read and parsed in full;
+        only sections stored as blob references are deferred. Files saved inline (with
+        dedup_blobs=False, or before blobs existed) and saves still queued for write-behind
+        have nothing to defer, so lazy=True then only wraps the same fully loaded data.
+        The record is a read-only Mapping, not a dict - use to_dict() (or
+        utils.lazy_record.json_default) to serialize it.
+        """
+        with self._pending_lock:
+            pending = self._pending.get(filename)
+        if pending is not None:
+            if lazy:
+                return LazyAnalysisRecord(filename, pending, self._is_blob_ref, self._from_blob_ref)
+            # The writer thread is still serializing this dict
+            return copy_record(pending)
+        
+        document = self._read_analysis_document(filename)
+        if document is None:
+            return None
         
-        for filename in os.listdir(self.output_dir):
-            if filename.endswith('.json'):
+        if lazy:
+            return LazyAnalysisRecord(filename, document, self._is_blob_ref, self._from_blob_ref)
+        # Copy so callers can't change what the cache hands out next time
+        return copy_record(self._resolve_blobs(document))
+    
+    def _analysis_path(self, filename: str) -> str:
+        """Where a saved analysis belongs under the current layout."""
+        return os.path.join(self.output_dir, relative_path_for(filename, self.layout))
+    
+    def _find_analysis_path(self, filename: str) -> Optional[str]:
+        """Find a saved analysis under any layout, preferring the current one."""
+        for path in candidate_paths(self.output_dir, filename, self.layout):
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def _read_analysis_document(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Parse a saved analysis (with blob references unresolved) from wherever it currently lives."""
+        # A layout migration may move the file between our stat and open,
+        # so go around the candidate paths twice before giving up
+        for _ in range(2):
+            for path in candidate_paths(self.output_dir, filename, self.layout):
                 try:
-                    data = self.load_person_data(filename)
-                    if data and 'summary' in data:
-                        summary = data['summary'].copy()
-                        summary['filename'] = filename
-                        summary['file_date'] = data['metadata'].get('analysis_timestamp', '')
-                        analyses.append(summary)
-                except Exception as e:
-                    print(f"⚠️ Error loading {filename}: {e}")
-        
-        # Sort by analysis date (newest first)
-        analyses.sort(key=lambda x: x.get('file_date', ''), reverse=True)
-        return analyses
-    
-    def search_saved_analyses(self, search_term: str) -> list[Dict[str, Any]]:
-        """Search saved analyses by person name, company, or job title."""
-        all_analyses = self.list_saved_analyses()
-        search_term = search_term.lower()
-        
-        matching = []
-        for analysis in all_analyses:
-            # Search in name, company, job title
-            searchable_text = ' '.join([
-                analysis.get('person_name', ''),
-                analysis.get('company', ''),
-                analysis.get('job_title', ''),
-                analysis.get('search_used', '')
-            ]).lower()
-            
-            if search_term in searchable_text:
-                matching.append(analysis)
-        
-        return matching
-    
-    def _extract_image_urls(self, profile_data: Dict[str, Any]) -> Dict[str, str]:
-        """Extract available image URLs from LinkedIn profile data."""
-        image_data = {
-            'profile_picture_url': None,
-            'banner_url': None,
-            'company_logo_url': None,
-            'company_banner_url': None,
-            'school_logo_url': None,
-            'all_company_logos': [],
-            'primary_company_logo': None
+                    stat = os.stat(path)
+                    validator = (stat.st_mtime_ns, stat.st_size)
+                    document = self._cache.get(path, validator)
+                    if document is not None:
+                        return document
+                    
+                    with open(path, 'rb') as f:
+                        payload = f.read()
+                except FileNotFoundError:
+                    continue
+                
+                document = loads_any(payload)
+                # Charge what the decoded record holds in memory; compressed files can be far smaller on disk
+                self._cache.put(path, document, estimate_size(document), validator)
+                return document
+        return None
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and memory use of the loaded-record cache."""
+        return self._cache.stats()
+    
+    def _iter_analysis_paths(self):
+        """Yield (filename, path) for every saved analysis, in any layout."""
+        if not os.path.exists(self.output_dir):
+            return
+        for dirpath, dirnames, filenames in os.walk(self.output_dir):
+            if dirpath == self.output_dir and BLOBS_DIRNAME in dirnames:
+                dirnames.remove(BLOBS_DIRNAME)
+            for filename in filenames:
+                if filename.endswith(ANALYSIS_EXTENSIONS) and filename != SETTINGS_FILENAME:
+                    yield filename, os.path.join(dirpath, filename)
+    
+    def _list_analysis_files(self) -> list[str]:
+        """List the saved analysis files in the output directory."""
+        return [filename for filename, _ in self._iter_analysis_paths()]
+    
+    def _build_search_document(self, data: Dict[str, Any], profile: Optional[Profile] = None) -> Dict[str, str]:
+        """Collect the full-text searchable fields of a saved analysis (profile: its parsed profile data, if at hand)."""
+        summary = data.get('summary') or {}
+        analysis = (data.get('conversation') or {}).get('analysis') or {}
+        if profile is None:
+            profile = Profile.from_response((data.get('linkedin_profile') or {}).get('profile_data'))
+        
+        return {
+            'person_name': summary.get('person_name') or '',
+            'company': summary.get('company') or '',
+            'job_title': summary.get('job_title') or '',
+            'search_used': summary.get('search_used') or '',
+            'analysis': analysis.get('analysis', '') if isinstance(analysis, dict) else '',
+            'headline': profile.headline or '',
+            'positions': ' '.join(
+                f"{position.title or ''} {position.company or ''}" for position in profile.positions
+            ),
+            'schools': ' '.join(
+                f"{school.name or ''} {school.degree or ''} {school.field_of_study or ''}" for school in profile.schools
+            ),
+            'skills': ' '.join(profile.skills),
         }
+    
+    def _read_index_entry(self, filename: str) -> Optional[tuple]:
+        """Load a saved analysis and return its (filename, summary, file_date, search_document) index entry."""
+        try:
+            data = self.load_person_data(filename)
+            if data and 'summary' in data:
+                return (
+                    filename,
+                    data['summary'],
+                    data['metadata'].get('analysis_timestamp', ''),
+                    self._build_search_document(data)
+                )
+        except Exception as e:
+            print(f"⚠️ Error loading {filename}: {e}")
+        return None
+    
+    def rebuild_index(self, max_workers: int = None) -> int:
+        """
+        Rebuild the analysis index from the saved files, parsing them in parallel.
         
-        if not profile_data:
-            return image_data
+        Returns:
+            int: Number of analyses indexed
+        """
+        self.flush()
+        filenames = self._list_analysis_files()
+        print(f"🗂️ Rebuilding analysis index from {len(filenames)} files...")
+        
+        if max_workers == 1 or len(filenames) < 64:
+            entries = [self._read_index_entry(filename) for filename in filenames]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_index_worker,
+                initargs=(self.output_dir,)
+            ) as executor:
+                entries = list(executor.map(_read_index_entry_in_worker, filenames, chunksize=64))
+        
+        entries = [entry for entry in entries if entry]
+        self.index.replace_all(entries)
+        print(f"✅ Indexed {len(entries)} analyses")
+        return len(entries)
+    
+    def migrate_storage(self) -> int:
+        """
+        Rewrite saved analyses and blobs stored in other formats using this manager's storage format.
         
-        print(f"🔍 Extracting image URLs from profile data...")
+        Each file is converted atomically and the index is updated as it goes, so the
+        output directory stays readable throughout. Converted files are written where this
+        manager's layout puts them. Once done, the format is saved as the
+        directory's default for managers created without an explicit storage_format.
         
-        # Extract from person data - try the Scrapin field names
-        person_data = profile_data.get('person', {})
-        if isinstance(person_data, dict):
-            print(f"👤 Person data keys: {list(person_data.keys())}")
-            
-            # Try the confirmed Scrapin field names
-            profile_picture = person_data.get('photoUrl')
-            banner_image = person_data.get('backgroundUrl')
-            
-            if profile_picture:
-                image_data['profile_picture_url'] = profile_picture
-                print(f"✅ Profile picture found: {profile_picture}")
-            else:
-                print(f"❌ No photoUrl field found in person data")
-                
-            if banner_image:
-                image_data['banner_url'] = banner_image
-                print(f"✅ Banner image found: {banner_image}")
-            else:
-                print(f"❌ No backgroundUrl field found in person data")
-            
-            # Get current company logo (first position)
-            positions = person_data.get('positions', {})
-            if isinstance(positions, dict):
-                position_history = positions.get('positionHistory', [])
-                if position_history and len(position_history) > 0:
-                    current_position = position_history[0]
-                    company_logo = current_position.get('companyLogo')
-                    if company_logo:
-                        image_data['primary_company_logo'] = company_logo
-                        image_data['company_logo_url'] = company_logo
-                        print(f"✅ Current company logo: {company_logo}")
-                    
-                    # Collect all company logos
-                    all_logos = []
-                    for position in position_history:
-                        logo = position.get('companyLogo')
-                        if logo and logo not in all_logos:
-                            all_logos.append(logo)
-                    image_data['all_company_logos'] = all_logos
-                    print(f"✅ Found {len(all_logos)} company logos total")
-            
-            # Get school logo
-            schools = person_data.get('schools', {})
-            if isinstance(schools, dict):
-                education_history = schools.get('educationHistory', [])
-                if education_history and len(education_history) > 0:
-                    school_logo = education_history[0].get('schoolLogo')
-                    if school_logo:
-                        image_data['school_logo_url'] = school_logo
-                        print(f"✅ School logo: {school_logo}")
-        
-        # Extract from company data as fallback
-        company_data = profile_data.get('company', {})
-        if isinstance(company_data, dict):
-            company_banner = company_data.get('backgroundUrl')
-            company_logo = company_data.get('logo')
+        Returns:
+            int: Number of analysis files converted
+        """
+        self.flush()
+        self._ensure_index()
+        converted = 0
+        
+        for filename in self._list_analysis_files():
+            if filename.endswith(self.backend.extension) and self.backend.extension != '.json':
+                continue
+            old_path = self._find_analysis_path(filename)
+            with open(old_path, 'rb') as f:
+                payload = f.read()
             
-            if company_banner:
-                image_data['company_banner_url'] = company_banner
-                print(f"✅ Company banner: {company_banner}")
-                
-                # Use company banner as fallback if no personal banner
-                if not image_data['banner_url']:
-                    image_data['banner_url'] = company_banner
-                    print(f"🔄 Using company banner as profile banner fallback")
+            # '.json' is shared by the pretty-printed default, so check the actual content
+            data = loads_any(payload)
+            new_payload = self.backend.dumps(self._externalize_blobs(self._resolve_blobs(data)))
+            if new_payload == payload:
+                continue
             
-            if company_logo and not image_data['company_logo_url']:
-                image_data['company_logo_url'] = company_logo
-                print(f"✅ Company logo from company data: {company_logo}")
+            new_filename = f"{strip_analysis_extension(filename)}{self.backend.extension}"
+            new_path = self._analysis_path(new_filename)
+            os.makedirs(os.path.dirname(new_path), exist_ok=True)
+            write_atomic(new_path, new_payload)
+            if new_filename != filename:
+                self.index.rename(filename, new_filename)
+            if os.path.abspath(new_path) != os.path.abspath(old_path):
+                os.remove(old_path)
+            converted += 1
+        
+        blobs_converted = self.blob_store.migrate()
+        save_settings(self.output_dir, storage_format=self.backend.name)
+        print(f"✅ Migrated {converted} analyses and {blobs_converted} blobs to {self.backend.name} format")
+        return converted
+    
+    def migrate_layout(self) -> int:
+        """
+        Move saved analyses into this manager's directory layout.
+        
+        Files are moved one at a time with atomic renames and readers look in every
+        layout, so the output directory stays fully usable while this runs. Once done, the
+        layout is saved as the directory's default for managers created without one.
+        
+        Returns:
+            int: Number of analysis files moved
+        """
+        self.flush()
+        moved = 0
+        for filename, path in list(self._iter_analysis_paths()):
+            target = self._analysis_path(filename)
+            if os.path.abspath(path) == os.path.abspath(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+            moved += 1
+        
+        # Clean up bucket directories left empty by the move
+        for dirpath, _, _ in sorted(os.walk(self.output_dir), key=lambda entry: len(entry[0]), reverse=True):
+            if dirpath != self.output_dir and not dirpath.startswith(self.blob_store.root_dir):
+                try:
+                    os.rmdir(dirpath)
+                except OSError:
+                    pass
+        
+        save_settings(self.output_dir, layout=self.layout)
+        print(f"✅ Moved {moved} analyses to the '{self.layout}' layout")
+        return moved
+    
+    def _ensure_index(self):
+        """Backfill the index the first time it is used on an existing output directory."""
+        self.flush()
+        if not self.index.is_built():
+            self.rebuild_index()
+    
+    def list_saved_analyses(self) -> list[Dict[str, Any]]:
+        """List all saved conversation analyses with summaries (newest first)."""
+        self._ensure_index()
+        return self.index.list_summaries()
+    
+    @staticmethod
+    def _encode_cursor(summary: Dict[str, Any]) -> str:
+        raw = json.dumps([summary.get('file_date', ''), summary['filename']]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            file_date, filename = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return file_date, filename
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+    
+    @staticmethod
+    def _date_bound(value: Union[str, date, datetime, None], end_of_day: bool) -> Optional[str]:
+        """Convert a date filter to the YYYYMMDDHHMMSS form used for filename timestamps."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value) if 'T' in value or ' ' in value else date.fromisoformat(value)
+        if not isinstance(value, datetime):
+            value = datetime.combine(value, time.max if end_of_day else time.min)
+        return value.strftime('%Y%m%d%H%M%S')
+    
+    def list_saved_analyses_page(
+        self,
+        page_size: int = 20,
+        cursor: str = None,
+        start_date: Union[str, date, datetime] = None,
+        end_date: Union[str, date, datetime] = None,
+        company: str = None,
+        job_title: str = None,
+        linkedin_found: bool = None
+    ) -> tuple[list[Dict[str, Any]], Optional[str]]:
+        """
+        Return one page of saved analyses (newest first) and the cursor for the next page.
+        
+        Args:
+            page_size: Maximum number of analyses on the page
+            cursor: Cursor returned with the previous page, or None for the first page
+            start_date / end_date: Inclusive range on the save timestamp in the filename
+                                   ('YYYY-MM-DD', ISO datetime, date or datetime)
+            company / job_title: Case-insensitive substring filters
+            linkedin_found: Only analyses with (True) or without (False) a LinkedIn profile
+        
+        Returns:
+            (analyses, next_cursor) - next_cursor is None on the last page
+        """
+        self._ensure_index()
+        page = self.index.query_page(
+            after=self._decode_cursor(cursor) if cursor else None,
+            limit=page_size,
+            start_stamp=self._date_bound(start_date, end_of_day=False),
+            end_stamp=self._date_bound(end_date, end_of_day=True),
+            company=company,
+            job_title=job_title,
+            linkedin_found=linkedin_found
+        )
+        next_cursor = self._encode_cursor(page[-1]) if len(page) == page_size else None
+        return page, next_cursor
+    
+    def iter_saved_analyses(self, limit: int = None, page_size: int = 200, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate saved analyses (newest first), fetching them from the index a page at a time.
+        
+        Accepts the same cursor and filters as list_saved_analyses_page, plus an overall limit.
+        """
+        cursor = filters.pop('cursor', None)
+        yielded = 0
+        while limit is None or yielded < limit:
+            size = page_size if limit is None else min(page_size, limit - yielded)
+            page, cursor = self.list_saved_analyses_page(page_size=size, cursor=cursor, **filters)
+            for summary in page:
+                yield summary
+            yielded += len(page)
+            if cursor is None:
+                return
+    
+    def search_saved_analyses(self, search_term: str, limit: int = None) -> list[Dict[str, Any]]:
+        """
+        Search saved analyses by person name, company, job title, search query,
+        conversation analysis and LinkedIn profile (headline, positions, schools, skills).
+        
+        Each word is matched as a prefix and results are ranked best match first.
+        """
+        self._ensure_index()
+        return self.index.search(search_term, limit=limit)
+    
+    def _extract_image_urls(self, profile_data: Union[Profile, Dict[str, Any]]) -> Dict[str, str]:
+        """Extract available image URLs from LinkedIn profile data (a raw response or a parsed Profile)."""
+        image_data = Profile().image_urls()
+        
+        if not profile_data:
+            return image_data
+        
+        print(f"🔍 Extracting image URLs from profile data...")
+        image_data = Profile.coerce(profile_data).image_urls()
+        
+        if image_data['profile_picture_url']:
+            print(f"✅ Profile picture found: {image_data['profile_picture_url']}")
+        if image_data['banner_url']:
+            print(f"✅ Banner image found: {image_data['banner_url']}")
+        if image_data['company_logo_url']:
+            print(f"✅ Current company logo: {image_data['company_logo_url']}")
+        print(f"✅ Found {len(image_data['all_company_logos'])} company logos total")
+        if image_data['school_logo_url']:
+            print(f"✅ School logo: {image_data['school_logo_url']}")
         
         # Summary
         print(f"🖼️ Final image extraction results:")
@@ -376,5 +799,15 @@ class ConversationOutputManager:
         
         return image_data
 
-# Global instance
+# Parallel index rebuild workers each get their own manager for the same directory
+_worker_manager = None
+
+def _init_index_worker(output_dir: str):
+    global _worker_manager
+    _worker_manager = ConversationOutputManager(output_dir=output_dir)
+
+def _read_index_entry_in_worker(filename: str) -> Optional[tuple]:
+    return _worker_manager._read_index_entry(filename)
+
+# Global instance - synchronous; the analysis pipeline switches it to write-behind for its saves
 output_manager = ConversationOutputManager()
\ No newline at end of file
@@ -0,0 +1,29 @@
+import json
+import os
+from typing import Any, Dict
+
+from utils.storage_backends import write_atomic
+
+# Per-output-directory settings chosen by a migration, read back by every new manager
+SETTINGS_FILENAME = ".output_settings.json"
+
+
+def settings_path_for(output_dir: str) -> str:
+    return os.path.join(output_dir, SETTINGS_FILENAME)
+
+
+def load_settings(output_dir: str) -> Dict[str, Any]:
+    """Settings saved for output_dir, or {} if none have been saved (or the file is unreadable)."""
+    try:
+        with open(settings_path_for(output_dir), 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return settings if isinstance(settings, dict) else {}
+
+
+def save_settings(output_dir: str, **updates: Any):
+    """Merge updates into the saved settings for output_dir."""
+    settings = load_settings(output_dir)
+    settings.update(updates)
+    write_atomic(settings_path_for(output_dir), json.dumps(settings, indent=2, sort_keys=True).encode('utf-8'))
@@ -1,10 +1,19 @@
 import json
 import os
+from third_parties.profile_model import Profile
 from utils.output_manager import output_manager
 
-def view_person_details(filename: str):
-    """View detailed information for a specific person."""
-    data = output_manager.load_person_data(filename)
+# Number of analyses listed per page in the interactive viewer
+PAGE_SIZE = 20
+
+def view_person_details(filename: str, show_profile: bool = True, show_original: bool = True):
+    """
+    View detailed information for a specific person.
+    
+    The LinkedIn profile data and original conversation are only loaded from disk
+    when show_profile / show_original ask for them.
+    """
+    data = output_manager.load_person_data(filename, lazy=True)
     
     if not data:
         print(f"❌ Could not load data from {filename}")
@@ -29,13 +38,14 @@ def view_person_details(filename: str):
     # LinkedIn section
     print("\n🔗 LINKEDIN PROFILE:")
     print(f"   URL: {linkedin.get('url', 'Not found')}")
-    if linkedin.get('profile_data'):
-        profile = linkedin['profile_data']
-        person_data = profile.get('person', {})
-        print(f"   Full Name: {person_data.get('firstName', '')} {person_data.get('lastName', '')}")
-        print(f"   Headline: {person_data.get('headline', 'N/A')}")
-        print(f"   Location: {person_data.get('location', {}).get('city', 'N/A')}")
-        print(f"   Connections: {person_data.get('connectionsCount', 'N/A')}")
+    if show_profile and linkedin.get('profile_data'):
+        profile = Profile.from_response(linkedin['profile_data'])
+        print(f"   Full Name: {profile.full_name or 'N/A'}")
+        print(f"   Headline: {profile.headline or 'N/A'}")
+        print(f"   Location: {profile.location or 'N/A'}")
+        print(f"   Followers: {profile.follower_count if profile.follower_count is not None else 'N/A'}")
+        if profile.current_position:
+            print(f"   Current Role: {profile.current_position.title or 'N/A'} at {profile.current_position.company or 'N/A'}")
     
     # Conversation analysis
     print("\n💬 CONVERSATION ANALYSIS:")
@@ -50,7 +60,7 @@ def view_person_details(filename: str):
             print(f"   {i}. {item}")
     
     # Original conversation
-    original = conversation.get('original_text', '')
+    original = conversation.get('original_text', '') if show_original else ''
     if original:
         print("\n📝 ORIGINAL CONVERSATION:")
         print(f"   {original[:300]}..." if len(original) > 300 else original)
@@ -69,13 +79,21 @@ def interactive_viewer():
         choice = input("\nEnter your choice (1-4): ").strip()
         
         if choice == '1':
-            analyses = output_manager.list_saved_analyses()
-            if analyses:
-                print(f"\n📋 Found {len(analyses)} saved analyses:")
-                for i, analysis in enumerate(analyses, 1):
+            # Page through the index instead of loading every analysis at once
+            cursor = None
+            shown = 0
+            while True:
+                analyses, cursor = output_manager.list_saved_analyses_page(page_size=PAGE_SIZE, cursor=cursor)
+                if not analyses and shown == 0:
+                    print("No saved analyses found.")
+                    break
+                if shown == 0:
+                    print(f"\n📋 Saved analyses (newest first):")
+                for i, analysis in enumerate(analyses, shown + 1):
                     print(f"{i:2}. {analysis.get('person_name', 'Unknown')} - {analysis.get('company', 'No company')} ({analysis.get('filename', '')})")
-            else:
-                print("No saved analyses found.")
+                shown += len(analyses)
+                if cursor is None or input("\nShow more? (y/N): ").strip().lower() != 'y':
+                    break
         
         elif choice == '2':
             search_term = input("Enter search term: ").strip()
@@ -91,7 +109,8 @@ def interactive_viewer():
         elif choice == '3':
             filename = input("Enter filename (e.g., Matthew_Young_20241225_143022.json): ").strip()
             if filename:
-                view_person_details(filename)
+                show_full = input("Include LinkedIn profile and original conversation? (Y/n): ").strip().lower() != 'n'
+                view_person_details(filename, show_profile=show_full, show_original=show_full)
         
         elif choice == '4':
             print("👋 Goodbye!")
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one upstream call.
+
+    The first caller for a key runs the function; callers arriving while it is still
+    running wait for it and get the same result (or the same exception raised).
+    Nothing is remembered once the call finishes - that is the caches' job.
+
+    copy_shared, if given, is applied to the result handed to waiting callers so
+    they don't share one mutable object with the caller that ran the function.
+    """
+
+    def __init__(self, copy_shared: Optional[Callable[[Any], Any]] = None):
+        self._copy_shared = copy_shared
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+
+    def do(self, key: Hashable, function: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.upstream_calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced_calls += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._copy_shared(call.result) if self._copy_shared else call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+
+        # Once waiters exist, the original stays untouched and everyone gets a copy
+        if shared and self._copy_shared:
+            return self._copy_shared(call.result)
+        return call.result
+
+    def stats(self) -> Dict[str, Any]:
+        """Upstream calls made vs. calls answered by joining one already in flight."""
+        with self._lock:
+            total = self.upstream_calls + self.coalesced_calls
+            return {
+                'upstream_calls': self.upstream_calls,
+                'coalesced_calls': self.coalesced_calls,
+                'saved_ratio': self.coalesced_calls / total if total else 0.0,
+                'in_flight': len(self._calls),
+            }
+
+
+class _AsyncCall:
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines; calls are coalesced per event loop.
+
+    The first caller for a key starts the coroutine function as a task; callers
+    arriving while it is still running await the same result. A waiter being
+    cancelled (or timing out) leaves the shared call running for the others, but
+    once the last waiter has gone the call is cancelled too.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _AsyncCall] = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+
+    def _forget(self, key: Hashable, call: _AsyncCall):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, function: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        # Calls are only shared within one event loop
+        key = (id(asyncio.get_running_loop()), key)
+        call = self._calls.get(key)
+        if call is None:
+            self.upstream_calls += 1
+            call = self._calls[key] = _AsyncCall(asyncio.ensure_future(function(*args, **kwargs)))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced_calls += 1
+
+        call.waiters += 1
+        try:
+            # shield() so one waiter's cancellation doesn't cancel the call for the rest
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is waiting for the result any more; stop paying for it
+                self._forget(key, call)
+                call.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.upstream_calls + self.coalesced_calls
+        return {
+            'upstream_calls': self.upstream_calls,
+            'coalesced_calls': self.coalesced_calls,
+            'saved_ratio': self.coalesced_calls / total if total else 0.0,
+            'in_flight': len(self._calls),
+        }
@@ -0,0 +1,237 @@
+import gzip
+import json
+import os
+import tempfile
+from typing import Any
+
+from utils.lazy_record import json_default
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+
+class StorageBackend:
+    """Serializes saved analyses and blobs to bytes on disk."""
+
+    name = None
+    extension = None
+
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, payload: bytes) -> Any:
+        raise NotImplementedError
+
+    @staticmethod
+    def matches(payload: bytes) -> bool:
+        """Whether the payload looks like it was written by this backend."""
+        raise NotImplementedError
+
+
+class JsonBackend(StorageBackend):
+    """Plain UTF-8 JSON, pretty-printed unless compact output is requested (the original format)."""
+
+    name = 'json'
+    extension = '.json'
+
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        if compact:
+            return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=json_default).encode('utf-8')
+        return json.dumps(data, indent=2, ensure_ascii=False, default=json_default).encode('utf-8')
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload.decode('utf-8'))
+
+    @staticmethod
+    def matches(payload: bytes) -> bool:
+        return payload.lstrip()[:1] in (b'{', b'[', b'"')
+
+
+class GzipJsonBackend(StorageBackend):
+    """Compact JSON compressed with gzip (standard library only)."""
+
+    name = 'gzip'
+    extension = '.json.gz'
+
+    def __init__(self, compresslevel: int = 6):
+        self.compresslevel = compresslevel
+
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=json_default).encode('utf-8')
+        # mtime=0 keeps output deterministic for identical data
+        return gzip.compress(raw, compresslevel=self.compresslevel, mtime=0)
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(gzip.decompress(payload).decode('utf-8'))
+
+    @staticmethod
+    def matches(payload: bytes) -> bool:
+        return payload[:2] == b'\x1f\x8b'
+
+
+class ZstdJsonBackend(StorageBackend):
+    """Compact JSON compressed with zstd. Requires `pip install zstandard`."""
+
+    name = 'zstd'
+    extension = '.json.zst'
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise ImportError("The 'zstd' storage format requires the zstandard package: pip install zstandard")
+        self.level = level
+
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=json_default).encode('utf-8')
+        return zstandard.ZstdCompressor(level=self.level).compress(raw)
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(zstandard.ZstdDecompressor().decompress(payload).decode('utf-8'))
+
+    @staticmethod
+    def matches(payload: bytes) -> bool:
+        return payload[:4] == b'\x28\xb5\x2f\xfd'
+
+
+class MsgpackBackend(StorageBackend):
+    """Binary MessagePack encoding. Requires `pip install msgpack`."""
+
+    name = 'msgpack'
+    extension = '.msgpack'
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The 'msgpack' storage format requires the msgpack package: pip install msgpack")
+
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        return msgpack.packb(data, use_bin_type=True, default=json_default)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+    @staticmethod
+    def matches(payload: bytes) -> bool:
+        # Saved documents are maps - fixmap (0x80-0x8f), map16/32 (0xde/0xdf) - and text
+        # blobs are strings - fixstr (0xa0-0xbf), str8/16/32 (0xd9-0xdb)
+        return bool(payload) and (
+            0x80 <= payload[0] <= 0x8f or 0xa0 <= payload[0] <= 0xbf or payload[0] in (0xd9, 0xda, 0xdb, 0xde, 0xdf)
+        )
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (JsonBackend, GzipJsonBackend, ZstdJsonBackend, MsgpackBackend)
+}
+
+# Every extension a saved analysis may have, longest first so '.json.gz' wins over '.json'
+ANALYSIS_EXTENSIONS = tuple(sorted((backend.extension for backend in BACKENDS.values()), key=len, reverse=True))
+
+
+def get_backend(storage_format: str) -> StorageBackend:
+    """Create the backend for a storage format name ('json', 'gzip', 'zstd' or 'msgpack')."""
+    if storage_format not in BACKENDS:
+        raise ValueError(f"Unknown storage format '{storage_format}'. Available: {', '.join(BACKENDS)}")
+    return BACKENDS[storage_format]()
+
+
+def detect_backend(payload: bytes) -> StorageBackend:
+    """Work out which backend wrote a payload from its leading bytes."""
+    for backend in (GzipJsonBackend, ZstdJsonBackend, JsonBackend, MsgpackBackend):
+        if backend.matches(payload):
+            return backend()
+    raise ValueError("Unrecognized storage format")
+
+
+def loads_any(payload: bytes) -> Any:
+    """Decode a payload written by any backend."""
+    return detect_backend(payload).loads(payload)
+
+
+def strip_analysis_extension(filename: str) -> str:
+    """Remove the storage extension from a saved analysis filename."""
+    for extension in ANALYSIS_EXTENSIONS:
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# What open(path, 'w') would give a new file; read once, as changing the umask isn't thread-safe
+_NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def _make_temp_file(path: str) -> tuple[int, str]:
+    """Temp file next to path, with a normal file's permissions (mkstemp's are owner-only)."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        os.chmod(temp_path, _NEW_FILE_MODE)
+    except Exception:
+        os.close(fd)
+        os.remove(temp_path)
+        raise
+    return fd, temp_path
+
+
+def write_atomic(path: str, payload: bytes):
+    """Write bytes via a temp file and rename so readers never see a partial file."""
+    fd, temp_path = _make_temp_file(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _fsync_path(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic_batch(files: list[tuple[str, bytes]]):
+    """
+    Durably write several files at once.
+
+    Everything is written to temp files first and fsynced back to back, then renamed
+    into place, and each parent directory is fsynced once for the whole batch.
+    """
+    temp_paths = []
+    try:
+        for path, payload in files:
+            fd, temp_path = _make_temp_file(path)
+            temp_paths.append(temp_path)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+
+        for temp_path in temp_paths:
+            _fsync_path(temp_path)
+
+        for (path, _), temp_path in zip(files, temp_paths):
+            os.replace(temp_path, path)
+
+        for directory in {os.path.dirname(path) or '.' for path, _ in files}:
+            try:
+                _fsync_path(directory)
+            except OSError:
+                pass  # Directories cannot be fsynced on some platforms (e.g. Windows)
+    except Exception:
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
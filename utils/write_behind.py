@@ -0,0 +1,112 @@
+import atexit
+import queue
+import threading
+from typing import Any, Callable, List, Tuple
+
+# Queued after the last item to tell the writer thread to exit
+_STOP = object()
+
+
+class WriteBehindError(Exception):
+    """Raised by flush()/close() when background writes failed since the last check."""
+
+    def __init__(self, failures: List[Tuple[List[Any], Exception]]):
+        self.failures = failures
+        count = sum(len(items) for items, _ in failures)
+        super().__init__(f"{count} queued items failed to write: {failures[-1][1]}")
+        self.__cause__ = failures[-1][1]
+
+    @property
+    def failed_items(self) -> List[Any]:
+        return [item for items, _ in self.failures for item in items]
+
+
+class WriteBehindWriter:
+    """
+    Bounded queue drained by a background thread that persists items in batches.
+
+    submit() only blocks when the queue is full, which keeps a slow disk from
+    letting memory grow without bound. Pending items are flushed at interpreter exit.
+    A failed batch is not retried; the failure is raised from the next flush() or
+    close() as a WriteBehindError listing the items that were lost.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Any]], None], max_queue_size: int = 256,
+                 max_batch_size: int = 32, name: str = "write-behind"):
+        self._write_batch = write_batch
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._max_batch_size = max_batch_size
+        self._name = name
+        self._thread = None
+        self._lock = threading.Lock()
+        self._failures = []
+        self._exit_hook_registered = False
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+                # The thread can be restarted after close(); one exit hook covers every run
+                if not self._exit_hook_registered:
+                    atexit.register(self._close_at_exit)
+                    self._exit_hook_registered = True
+
+    def submit(self, item: Any):
+        """Queue an item for writing, blocking only while the queue is full."""
+        self._ensure_started()
+        self._queue.put(item)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Grab whatever else is already waiting so it shares one round of fsyncs
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            items = [item for item in batch if item is not _STOP]
+            try:
+                if items:
+                    self._write_batch(items)
+            except Exception as e:
+                with self._lock:
+                    self._failures.append((items, e))
+                print(f"⚠️ Background write of {len(items)} items failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _raise_failures(self):
+        with self._lock:
+            failures, self._failures = self._failures, []
+        if failures:
+            raise WriteBehindError(failures)
+
+    def flush(self):
+        """Block until everything submitted so far has been processed; raise WriteBehindError if any of it failed."""
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_failures()
+
+    def close(self):
+        """Flush pending writes and stop the background thread; raise WriteBehindError if any of them failed."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+        self._raise_failures()
+
+    def _close_at_exit(self):
+        # Nobody is left to handle the error at exit; the failures were already printed
+        try:
+            self.close()
+        except WriteBehindError:
+            pass